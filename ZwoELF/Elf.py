@@ -8,27 +8,233 @@
 # Licensed under the GNU Public License, version 2.
 
 
-class Section(object):
+# this function gets a function that creates records of the given class
+# from a tuple of values for the given fields without calling __init__
+# and __setattr__ (used by the parser => the values of the parsed data
+# are not counted as modification)
+# return values: (function) creates a record from a tuple of values
+def parsedRecordFactory(recordClass, fieldNames):
+	setters = tuple(getattr(recordClass, fieldName).__set__
+		for fieldName in fieldNames)
+
+	# the record does not belong to a parser yet
+	# (has to be set before the fields, setters of properties count
+	# their changes)
+	counterAttribute = getattr(recordClass, "_counter", None)
+	setCounter = None
+	if counterAttribute is not None:
+		setCounter = counterAttribute.__set__
+
+	def createRecord(values):
+		record = object.__new__(recordClass)
+		if setCounter is not None:
+			setCounter(record, None)
+		for setter, value in zip(setters, values):
+			setter(record, value)
+		return record
+
+	return createRecord
+
+
+class ModificationCounter(object):
+	'''
+	Counts the changes of the records of one parsed file (every parser
+	has its own counter, so changes of the records of one file do not
+	mark the tables of other files as modified).
+
+	A record counts its changes in the counter it belongs to. The parser
+	assigns the records of its tables to its counter when they are parsed
+	and when they are marked as unmodified (records that are created by
+	the user belong to no counter until then, adding them to a table is
+	detected by comparing the table with its unmodified copy).
+	'''
+
+	__slots__ = ("sections", "sectionNames", "segments",
+		"dynamicSegmentEntries", "dynamicSymbolEntries", "symbolNames",
+		"relocationEntries", "relocationSymbols")
 
 	def __init__(self):
-		self.sectionName = ""
-		self.elfN_shdr = ElfN_Shdr()
+		# changes of the section header fields and of the section names
+		self.sections = 0
+		self.sectionNames = 0
+
+		# changes of the program header fields
+		self.segments = 0
+
+		# changes of the dynamic segment entry fields
+		self.dynamicSegmentEntries = 0
+
+		# changes of the symbol table entry fields and of the symbol names
+		self.dynamicSymbolEntries = 0
+		self.symbolNames = 0
+
+		# changes of the relocation entry fields and symbol assignments
+		self.relocationEntries = 0
+		self.relocationSymbols = 0
+
+
+# all record classes use __slots__ => no per instance __dict__
+# (a parsed file can hold hundreds of thousands of records)
+class Section(object):
+
+	__slots__ = ("_sectionName", "_elfN_shdr", "_counter")
+
+	def __init__(self, elfN_shdr=None):
+		self._sectionName = ""
+		self._elfN_shdr = elfN_shdr
+
+		# modification counter of the parser the section belongs to
+		# (lets name indexes detect renamed sections)
+		self._counter = None
+
+	@property
+	def sectionName(self):
+		return self._sectionName
+
+	@sectionName.setter
+	def sectionName(self, value):
+		self._sectionName = value
+		if self._counter is not None:
+			self._counter.sectionNames += 1
+
+	# section header is created on first access
+	# (the parser sets its own section header anyway)
+	@property
+	def elfN_shdr(self):
+		if self._elfN_shdr is None:
+			self._elfN_shdr = ElfN_Shdr()
+			self._elfN_shdr._setCounter(self._counter)
+		return self._elfN_shdr
+
+	@elfN_shdr.setter
+	def elfN_shdr(self, value):
+		self._elfN_shdr = value
+		if self._counter is not None:
+			self._counter.sections += 1
+			if value is not None:
+				value._setCounter(self._counter)
+
+	# this function assigns the section to the modification counter of
+	# a parser
+	# return values: None
+	def _setCounter(self, counter):
+		self._counter = counter
+		if self._elfN_shdr is not None:
+			self._elfN_shdr._setCounter(counter)
 
 
 class Segment(object):
 
-	def __init__(self):
+	__slots__ = ("_elfN_Phdr", "_sectionsWithin", "_segmentsWithin",
+		"_computeWithin", "_counter")
+
+	def __init__(self, elfN_Phdr=None):
+		# modification counter of the parser the segment belongs to
+		# (lets the parser detect replaced program headers)
+		self._counter = None
+
 		# for 32 bit systems only
-		self.elfN_Phdr = Elf32_Phdr() # change here to load Elf64_Phdr
-		self.sectionsWithin = list()
-		self.segmentsWithin = list()
+		if elfN_Phdr is None:
+			elfN_Phdr = Elf32_Phdr() # change here to load Elf64_Phdr
+		self._elfN_Phdr = elfN_Phdr
+		self._sectionsWithin = list()
+		self._segmentsWithin = list()
+
+		# function that computes the lists of sections and segments within
+		# this segment on first access (set by the parser, the lists
+		# are None until then)
+		self._computeWithin = None
+
+	@property
+	def elfN_Phdr(self):
+		return self._elfN_Phdr
+
+	@elfN_Phdr.setter
+	def elfN_Phdr(self, value):
+		self._elfN_Phdr = value
+		if self._counter is not None:
+			self._counter.segments += 1
+			value._setCounter(self._counter)
+
+	# sections lying within this segment (in memory)
+	@property
+	def sectionsWithin(self):
+		if self._sectionsWithin is None:
+			self._computeWithin(self)
+		return self._sectionsWithin
+
+	@sectionsWithin.setter
+	def sectionsWithin(self, value):
+		self._sectionsWithin = value
+
+	# segments lying within this segment (in the file)
+	@property
+	def segmentsWithin(self):
+		if self._segmentsWithin is None:
+			self._computeWithin(self)
+		return self._segmentsWithin
+
+	@segmentsWithin.setter
+	def segmentsWithin(self, value):
+		self._segmentsWithin = value
+
+	# this function assigns the segment to the modification counter of
+	# a parser
+	# return values: None
+	def _setCounter(self, counter):
+		self._counter = counter
+		self._elfN_Phdr._setCounter(counter)
 
 
 class DynamicSymbol(object):
 
-	def __init__(self):
-		self.ElfN_Sym = ElfN_Sym()
-		self.symbolName = ""
+	__slots__ = ("_elfN_Sym", "_symbolName", "_stringTable", "_counter")
+
+	# when a string table is given, symbolName is the offset of the name
+	# in it and the name is decoded when it is read for the first time
+	def __init__(self, symbolName="", elfN_Sym=None, stringTable=None):
+		# modification counter of the parser the symbol belongs to
+		# (lets name indexes detect renamed symbols)
+		self._counter = None
+
+		if elfN_Sym is None:
+			elfN_Sym = ElfN_Sym()
+		self._elfN_Sym = elfN_Sym
+		self._symbolName = symbolName
+		self._stringTable = stringTable
+
+	@property
+	def ElfN_Sym(self):
+		return self._elfN_Sym
+
+	@ElfN_Sym.setter
+	def ElfN_Sym(self, value):
+		self._elfN_Sym = value
+		if self._counter is not None:
+			self._counter.dynamicSymbolEntries += 1
+			value._setCounter(self._counter)
+
+	@property
+	def symbolName(self):
+		# name not decoded yet => _symbolName holds its offset
+		if self._stringTable is not None:
+			self._symbolName = self._stringTable.getName(self._symbolName)
+			self._stringTable = None
+		return self._symbolName
+
+	@symbolName.setter
+	def symbolName(self, value):
+		self._symbolName = value
+		self._stringTable = None
+		if self._counter is not None:
+			self._counter.symbolNames += 1
+
+	# this function assigns the symbol to the modification counter of
+	# a parser
+	# return values: None
+	def _setCounter(self, counter):
+		self._counter = counter
+		self._elfN_Sym._setCounter(counter)
 
 
 class ElfN_Ehdr(object):
@@ -196,6 +402,10 @@ class ElfN_Ehdr(object):
 		uint16_t	e_shstrndx;
 	} ElfN_Ehdr;
 	'''
+	__slots__ = ("e_ident", "e_type", "e_machine", "e_version", "e_entry",
+		"e_phoff", "e_shoff", "e_flags", "e_ehsize", "e_phentsize", "e_phnum",
+		"e_shentsize", "e_shnum", "e_shstrndx")
+
 	def __init__(self):
 		self.e_ident = bytearray(16)
 		self.e_type = None
@@ -268,10 +478,19 @@ class ElfN_Shdr(object):
 		uintN_t		sh_entsize;   (N = 32/64)
 	} ElfN_Shdr;
 	'''
+	__slots__ = ("sh_name", "sh_type", "sh_flags", "sh_addr", "sh_offset",
+		"sh_size", "sh_link", "sh_info", "sh_addralign", "sh_entsize",
+		"_counter")
+
 	def __init__(self):
+		# modification counter of the parser the section header belongs
+		# to (lets generateElf() detect modified tables)
+		self._counter = None
+
 		self.sh_name = None
 		self.sh_type = None
 		self.sh_flags = None
+		self.sh_addr = None
 		self.sh_offset = None
 		self.sh_size = None
 		self.sh_link = None
@@ -279,6 +498,17 @@ class ElfN_Shdr(object):
 		self.sh_addralign = None
 		self.sh_entsize = None
 
+	def __setattr__(self, name, value):
+		object.__setattr__(self, name, value)
+		if self._counter is not None:
+			self._counter.sections += 1
+
+	# this function assigns the section header to the modification
+	# counter of a parser
+	# return values: None
+	def _setCounter(self, counter):
+		object.__setattr__(self, "_counter", counter)
+
 
 # section headers sh_flags values
 class SH_flags(object):
@@ -415,7 +645,14 @@ class Elf32_Phdr(object):
 		uint32_t   p_align;
 	} Elf32_Phdr;
 	'''
+	__slots__ = ("p_type", "p_offset", "p_vaddr", "p_paddr", "p_filesz",
+		"p_memsz", "p_flags", "p_align", "_counter")
+
 	def __init__(self):
+		# modification counter of the parser the program header belongs
+		# to (lets cached data derived from the segments detect changes)
+		self._counter = None
+
 		self.p_type = None
 		self.p_offset = None
 		self.p_vaddr = None
@@ -425,6 +662,17 @@ class Elf32_Phdr(object):
 		self.p_flags = None
 		self.p_align = None
 
+	def __setattr__(self, name, value):
+		object.__setattr__(self, name, value)
+		if self._counter is not None:
+			self._counter.segments += 1
+
+	# this function assigns the program header to the modification
+	# counter of a parser
+	# return values: None
+	def _setCounter(self, counter):
+		object.__setattr__(self, "_counter", counter)
+
 
 # program headers p_type values
 class P_type(object):
@@ -633,12 +881,68 @@ class ElfN_Dyn(object):
 		} d_un;
 	} Elf64_Dyn;
 	'''
+	__slots__ = ("d_tag", "d_un", "_counter")
+
 	def __init__(self):
+		# modification counter of the parser the entry belongs to
+		# (lets generateElf() detect modified tables)
+		self._counter = None
+
 		self.d_tag = None
 		self.d_un = None
 
-
-class ElfN_Rel(object):
+	def __setattr__(self, name, value):
+		object.__setattr__(self, name, value)
+		if self._counter is not None:
+			self._counter.dynamicSegmentEntries += 1
+
+	# this function assigns the entry to the modification counter of
+	# a parser
+	# return values: None
+	def _setCounter(self, counter):
+		object.__setattr__(self, "_counter", counter)
+
+
+# base class for relocation entries that creates the default symbol
+# only on first access (the parser assigns the symbol of the
+# symbol table anyway)
+class _RelocationEntry(object):
+
+	# _counter: modification counter of the parser the entry belongs to
+	# (counts the changes of the fields, which lets generateElf() detect
+	# modified tables, and the symbol assignments, which lets name
+	# indexes detect relocations with a new symbol)
+	__slots__ = ("_symbol", "_counter")
+
+	def __setattr__(self, name, value):
+		object.__setattr__(self, name, value)
+		if self._counter is not None:
+			self._counter.relocationEntries += 1
+
+	@property
+	def symbol(self):
+		if self._symbol is None:
+			self._symbol = DynamicSymbol()
+		return self._symbol
+
+	@symbol.setter
+	def symbol(self, value):
+		self._symbol = value
+		if self._counter is not None:
+			self._counter.relocationSymbols += 1
+			if value is not None:
+				value._setCounter(self._counter)
+
+	# this function assigns the entry and its symbol to the modification
+	# counter of a parser
+	# return values: None
+	def _setCounter(self, counter):
+		object.__setattr__(self, "_counter", counter)
+		if self._symbol is not None:
+			self._symbol._setCounter(counter)
+
+
+class ElfN_Rel(_RelocationEntry):
 	'''
 	typedef struct elf32_rel {
 		Elf32_Addr    r_offset;
@@ -660,7 +964,11 @@ class ElfN_Rel(object):
 	#define ELF64_R_TYPE(i)		((i)&0xffffffff)
 	#define ELF64_R_INFO(s,t)	(((s)<<32)+(t))
 	'''
+	__slots__ = ("r_offset", "r_info", "r_type", "r_sym")
+
 	def __init__(self):
+		self._counter = None
+
 		# in executable and share object files => r_offset holds a virtual address
 		self.r_offset = None
 
@@ -674,11 +982,11 @@ class ElfN_Rel(object):
 		# for 32 bit systems calculated: "r_info >> 8"
 		self.r_sym = None
 
-		# for 32 bit systems
-		self.symbol = DynamicSymbol()
+		# symbol the relocation references (created on first access)
+		self._symbol = None
 
 
-class ElfN_Rela(object):
+class ElfN_Rela(_RelocationEntry):
 	'''
 	typedef struct
 	{
@@ -696,7 +1004,11 @@ class ElfN_Rela(object):
 
 	Macros for 32/64 bit systems: see description for ElfN_Rel
 	'''
+	__slots__ = ("r_offset", "r_info", "r_type", "r_sym", "r_addend")
+
 	def __init__(self):
+		self._counter = None
+
 		# in executable and share object files => r_offset holds a virtual address
 		self.r_offset = None
 
@@ -706,7 +1018,8 @@ class ElfN_Rela(object):
 
 		self.r_addend = None
 
-		self.symbol = DynamicSymbol()
+		# symbol the relocation references (created on first access)
+		self._symbol = None
 
 
 class ElfN_Sym(object):
@@ -729,13 +1042,31 @@ class ElfN_Sym(object):
 		Elf64_Xword 	st_size;	/* Associated symbol size */
 	} Elf64_Sym;
 	'''
+	__slots__ = ("st_name", "st_value", "st_size", "st_info", "st_other",
+		"st_shndx", "_counter")
+
 	def __init__(self):
-		st_name = None
-		st_value = None
-		st_size = None
-		st_info = None
-		st_other = None
-		st_shndx = None
+		# modification counter of the parser the entry belongs to
+		# (lets generateElf() detect modified tables)
+		self._counter = None
+
+		self.st_name = None
+		self.st_value = None
+		self.st_size = None
+		self.st_info = None
+		self.st_other = None
+		self.st_shndx = None
+
+	def __setattr__(self, name, value):
+		object.__setattr__(self, name, value)
+		if self._counter is not None:
+			self._counter.dynamicSymbolEntries += 1
+
+	# this function assigns the entry to the modification counter of
+	# a parser
+	# return values: None
+	def _setCounter(self, counter):
+		object.__setattr__(self, "_counter", counter)
 
 
 class R_type(object):
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import array
+import struct
+from FileData import FileData
+
+
+class ElfLayout(object):
+	'''
+	Precompiled struct layouts (little-endian) of the ELF structures for
+	one ELF class. The field order is the order of the C structures:
+
+	ehdr	ElfN_Ehdr without e_ident (starts at offset 16)
+	shdr	ElfN_Shdr
+	phdr	ElfN_Phdr (p_flags is the second field in Elf64_Phdr)
+	dyn		ElfN_Dyn
+	sym		ElfN_Sym (st_value and st_size are the last fields in Elf64_Sym)
+	rel		ElfN_Rel
+	rela	ElfN_Rela
+	addr	ElfN_Addr (for example a got entry)
+	'''
+	def __init__(self, bits):
+		self.bits = bits
+
+		if bits == 32:
+			self.ehdr = struct.Struct('< 2H I 3I I 6H')
+			self.shdr = struct.Struct('< 2I 4I 2I 2I')
+			self.phdr = struct.Struct('< I 5I I I')
+			self.dyn = struct.Struct('<II')
+			self.sym = struct.Struct('<I II BBH')
+			self.rel = struct.Struct('<II')
+			self.rela = struct.Struct('<IIi')
+			self.addr = struct.Struct('<I')
+		elif bits == 64:
+			self.ehdr = struct.Struct('< 2H I 3Q I 6H')
+			self.shdr = struct.Struct('< 2I 4Q 2I 2Q')
+			self.phdr = struct.Struct('< I I 5Q Q')
+			self.dyn = struct.Struct('<QQ')
+			self.sym = struct.Struct('<I BBH QQ')
+			self.rel = struct.Struct('<QQ')
+			self.rela = struct.Struct('<QQq')
+			self.addr = struct.Struct('<Q')
+		else:
+			raise ValueError("No layout for ELF class with %d bits." % bits)
+
+		# array.array typecode for columns of ElfN_Addr/ElfN_Off values
+		self.addrTypecode = typecodeForSize(self.addr.size)
+
+
+# this function gets an array.array typecode for unsigned integers of
+# the given size
+# return values: (str) typecode
+def typecodeForSize(size):
+	for typecode in "BHILQ":
+		try:
+			if array.array(typecode).itemsize == size:
+				return typecode
+		except ValueError:
+			# typecode "Q" does not exist in Python 2
+			continue
+	raise ValueError("No array typecode for %d byte integers." % size)
+
+
+# this function searches for the given data in the given range of the
+# file data (buffer objects have no find() => the range is searched in
+# growing chunks, so short strings do not copy the whole range)
+# return values: (int) position of the data (-1 if not found)
+def findData(data, sub, start, end):
+	if hasattr(data, "find"):
+		return data.find(sub, start, end)
+
+	end = min(end, len(data))
+	chunkSize = 256
+	position = start
+	while position < end:
+		chunkEnd = min(end, position + chunkSize)
+		found = data[position:chunkEnd].find(sub)
+		if found != -1:
+			return position + found
+		if chunkEnd == end:
+			break
+		# overlap the chunks => matches that span two chunks are found
+		position = chunkEnd - (len(sub) - 1)
+		chunkSize *= 2
+	return -1
+
+
+# layouts are immutable => one instance per ELF class is enough
+layouts = {
+	32: ElfLayout(32),
+	64: ElfLayout(64),
+}
+
+
+# this function generates the entries of a table at the given offset
+# without copying the table (data that is read on demand is read once)
+# (uses struct.iter_unpack() over a memoryview when it is available and
+# the entries lie directly behind each other)
+# return values: (iterator) tuples of the unpacked entries
+def iterUnpackFrom(structLayout, buffer, offset, count, entrySize=None):
+	if entrySize is None:
+		entrySize = structLayout.size
+
+	if count <= 0:
+		return iter(())
+
+	# data that is read on demand => read the table at once
+	if isinstance(buffer, FileData):
+		buffer = buffer[offset:offset+(count*entrySize)]
+		offset = 0
+
+	if (entrySize == structLayout.size
+		and hasattr(structLayout, "iter_unpack")):
+		try:
+			tableView = memoryview(buffer)
+		except TypeError:
+			pass
+		else:
+			return structLayout.iter_unpack(
+				tableView[offset:offset+(count*entrySize)])
+
+	return _unpackEach(structLayout.unpack_from, buffer, offset,
+		count, entrySize)
+
+
+# this function unpacks the entries of a table one after another
+# return values: (generator) tuples of the unpacked entries
+def _unpackEach(unpackFrom, buffer, offset, count, entrySize):
+	tableEnd = offset + (count*entrySize)
+	while offset < tableEnd:
+		yield unpackFrom(buffer, offset)
+		offset += entrySize
@@ -7,21 +7,225 @@
 #
 # Licensed under the GNU Public License, version 2.
 
+import array
 import binascii
-import struct
+import bisect
+import heapq
 import sys
 import hashlib
+import marshal
+import mmap
+import os
+import stat
+import struct
+import tempfile
+from operator import attrgetter
+from ElfLayout import layouts, iterUnpackFrom, findData
+from SymbolTable import SymbolTable
+from StringTable import StringTable
+from SegmentIndex import SegmentIndex, rangesWithin
+from NameIndex import NameIndex
+from SymbolIndex import SymbolIndex
+from PieceTable import PieceTable
+from IntervalSet import IntervalSet
+from FileData import FileData
+from HashTable import GnuHashTable, SysvHashTable, buildGnuHashTable, \
+	buildSysvHashTable
 from Elf import ElfN_Ehdr, Shstrndx, ElfN_Shdr, SH_flags, SH_type, \
 	Elf32_Phdr, P_type, P_flags, D_tag, ElfN_Dyn, \
 	ElfN_Rel, ElfN_Rela, ElfN_Sym, R_type, \
-	Section, Segment, DynamicSymbol
+	Section, Segment, DynamicSymbol, ModificationCounter, parsedRecordFactory
+
+
+# functions that create the records of the parsed tables
+# (fields in the order of the unpacked entries)
+_createShdr = parsedRecordFactory(ElfN_Shdr, ("sh_name", "sh_type",
+	"sh_flags", "sh_addr", "sh_offset", "sh_size", "sh_link", "sh_info",
+	"sh_addralign", "sh_entsize"))
+_createPhdr = parsedRecordFactory(Elf32_Phdr, ("p_type", "p_offset",
+	"p_vaddr", "p_paddr", "p_filesz", "p_memsz", "p_flags", "p_align"))
+_createDyn = parsedRecordFactory(ElfN_Dyn, ("d_tag", "d_un"))
+_createSym32 = parsedRecordFactory(ElfN_Sym, ("st_name", "st_value",
+	"st_size", "st_info", "st_other", "st_shndx"))
+_createSym64 = parsedRecordFactory(ElfN_Sym, ("st_name", "st_info",
+	"st_other", "st_shndx", "st_value", "st_size"))
+_createRel = parsedRecordFactory(ElfN_Rel, ("r_offset", "r_info",
+	"r_sym", "r_type", "_symbol"))
+_createRela = parsedRecordFactory(ElfN_Rela, ("r_offset", "r_info",
+	"r_addend", "r_sym", "r_type", "_symbol"))
+
+# these functions get the field values of a record in the order of the
+# record factories above (_createSym32 order for both ELF classes)
+def _shdrValues(shdr):
+	return (shdr.sh_name, shdr.sh_type, shdr.sh_flags, shdr.sh_addr,
+		shdr.sh_offset, shdr.sh_size, shdr.sh_link, shdr.sh_info,
+		shdr.sh_addralign, shdr.sh_entsize)
+
+def _phdrValues(phdr):
+	return (phdr.p_type, phdr.p_offset, phdr.p_vaddr, phdr.p_paddr,
+		phdr.p_filesz, phdr.p_memsz, phdr.p_flags, phdr.p_align)
+
+def _symValues(sym):
+	return (sym.st_name, sym.st_value, sym.st_size, sym.st_info,
+		sym.st_other, sym.st_shndx)
+
+# names of the parsed tables
+_tableNames = ("sections", "segments", "dynamicSegmentEntries",
+	"dynamicSymbolEntries", "jumpRelocationEntries", "relocationEntries")
+
+# names of the regions written back by generateElf()
+_regionNames = ("section header table", "section names", "header",
+	"program header table", "dynamic segment", "dynamic symbols",
+	"hash tables", "relocations")
+
+
+# this function writes all given data at the given offset of the file
+# (os.pwrite() is not available in every python version => seek and write)
+# return values: None
+def _writeAt(fd, data, offset):
+	view = memoryview(data)
+	written = 0
+	while written < len(view):
+		if hasattr(os, "pwrite"):
+			written += os.pwrite(fd, view[written:], offset + written)
+		else:
+			os.lseek(fd, offset + written, os.SEEK_SET)
+			written += os.write(fd, view[written:])
+
+
+# this function gets the given range of the data without copying it (data
+# that is read on demand is read)
+# return values: (buffer or str) data of the range
+def _viewData(data, start, end):
+	if isinstance(data, FileData):
+		return data[start:end]
+	return buffer(data, start, end - start)
+
+
+class VerificationMode(object):
+	'''
+	OFF		The parsed file is not checked.
+
+	CHEAP	Only the regions that are written back by generateElf() (header,
+		program header table, section header table, section names, dynamic
+		segment, dynamic symbols and relocations) are re-generated and
+		compared byte by byte with the parsed data. The check stops at the
+		first region that differs.
+
+	FULL	The complete file is re-generated from all regions and its md5
+		hash is compared with the md5 hash of the parsed data. This is the
+		default of ElfParser() and verifyElf() (batch jobs like the batch
+		module ask for CHEAP).
+	'''
+	OFF = "off"
+	CHEAP = "cheap"
+	FULL = "full"
+
+
+class VerificationStats(object):
+
+	def __init__(self, mode):
+		self.mode = mode
+		# names of the checked regions (in the order they were checked)
+		self.regionsChecked = list()
+		self.bytesChecked = 0
+		# name and offset of the first region that differs (None if equal)
+		self.mismatchedRegion = None
+		self.mismatchedOffset = None
 
 
 class ElfParser(object):
 
 	def __init__(self, filename, force=False, startOffset=0,
-			forceDynSymParsing=0, onlyParseHeader=False):
+			forceDynSymParsing=0, onlyParseHeader=False, useMmap=False,
+			verificationMode=None, parseCache=None):
+		self._setUp(filename, startOffset, forceDynSymParsing)
+
+		# read file and convert data to list
+		# (or map it read-only into memory when requested, modifications
+		# are stored in a piece table on top of the unchanged mapping)
+		f = open(filename, "rb")
+		# (mmap offsets have to be aligned and empty mappings are invalid)
+		if (useMmap is True
+			and self.startOffset % mmap.ALLOCATIONGRANULARITY == 0
+			and os.fstat(f.fileno()).st_size > self.startOffset):
+			self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ,
+				offset=self.startOffset)
+		else:
+			f.seek(self.startOffset, 0)
+			# only the header is parsed => read only the largest header
+			if onlyParseHeader is True:
+				self.data = bytearray(f.read(16 + layouts[64].ehdr.size))
+			else:
+				self.data = bytearray(f.read())
+		f.close()
+
+		self._parseData(force, onlyParseHeader, verificationMode, parseCache)
+
+
+	# this function creates a parser for ELF data in memory (str,
+	# bytearray, mmap or any other object with the buffer interface)
+	# without copying the data (the data must not be changed while it
+	# is used by the parser, a memoryview is copied because it can not
+	# be referenced by a buffer in Python 2)
+	# return values: (ElfParser) parser of the data
+	@classmethod
+	def fromBuffer(cls, data, startOffset=0, force=False,
+		forceDynSymParsing=0, onlyParseHeader=False, verificationMode=None,
+		parseCache=None):
+
+		elfParser = cls.__new__(cls)
+		elfParser._setUp(None, startOffset, forceDynSymParsing)
+
+		if isinstance(data, memoryview):
+			data = data.tobytes()
+		elfParser.data = buffer(data, startOffset)
+
+		elfParser._parseData(force, onlyParseHeader, verificationMode,
+			parseCache)
+		return elfParser
+
+
+	# this function creates a parser for the ELF data of a seekable file
+	# object (a file on disk is mapped read-only into memory, the data of
+	# other file objects is read on demand in ranges)
+	# return values: (ElfParser) parser of the data
+	@classmethod
+	def fromFile(cls, fileObject, startOffset=0, force=False,
+		forceDynSymParsing=0, onlyParseHeader=False, verificationMode=None,
+		parseCache=None):
+
+		elfParser = cls.__new__(cls)
+		elfParser._setUp(None, startOffset, forceDynSymParsing)
+
+		try:
+			fileStat = os.fstat(fileObject.fileno())
+		except (AttributeError, IOError, OSError, ValueError):
+			fileStat = None
+
+		# (mmap offsets have to be aligned and empty mappings are invalid)
+		if (fileStat is not None
+			and stat.S_ISREG(fileStat.st_mode)
+			and startOffset % mmap.ALLOCATIONGRANULARITY == 0
+			and fileStat.st_size > startOffset):
+			elfParser.data = mmap.mmap(fileObject.fileno(), 0,
+				access=mmap.ACCESS_READ, offset=startOffset)
+		else:
+			elfParser.data = FileData(fileObject, startOffset)
+
+		elfParser._parseData(force, onlyParseHeader, verificationMode,
+			parseCache)
+		return elfParser
+
+
+	# this function initializes the attributes of the parser before the
+	# data is read
+	# return values: None
+	def _setUp(self, filename, startOffset, forceDynSymParsing):
 		self.forceDynSymParsing = forceDynSymParsing
+		self.verificationStats = None
+		# statistics of the hash tables rebuilt by the last generateElf()
+		self.hashTableStats = list()
 		self.header = None
 		self.segments = list()
 		self.sections = list()
@@ -30,37 +234,101 @@ class ElfParser(object):
 		self.dynamicSegmentEntries = list()
 		self.jumpRelocationEntries = list()
 		self.relocationEntries = list()
+		# None if the data was not read from a named file
+		self.filename = filename
 		self.startOffset = startOffset
 		self.data = bytearray()
 		self.bits = 0
-
-		# read file and convert data to list
-		f = open(filename, "rb")
-		f.seek(self.startOffset, 0)
-		self.data = bytearray(f.read())
-		f.close()
+		self.layout = None
+		self._segmentIndex = None
+		self._sectionIndex = None
+		self._dynamicSymbolIndex = None
+		self._jumpRelocationIndex = None
+		self._symbolIndex = None
+		self._staticSymbolIndex = None
+		self._dynamicStringTable = None
+		self._dynamicStringTableKey = None
+		# counts the changes of the records of this file
+		self._modificationCounter = ModificationCounter()
+		# marshaled values of the tables of a cached parse result that
+		# were not created yet
+		self._parseResultTables = dict()
+
+
+	# this function parses and verifies the read data (or uses the parse
+	# result of the given cache)
+	# return values: None
+	def _parseData(self, force, onlyParseHeader, verificationMode,
+		parseCache):
+
+		# use the parse result stored in the cache (parsing and
+		# verification are skipped)
+		# (a result is only used if it was verified at least as
+		# thoroughly as requested)
+		if verificationMode is None:
+			verificationMode = VerificationMode.FULL
+		if force is True:
+			requiredMode = VerificationMode.OFF
+		else:
+			requiredMode = verificationMode
+		if (parseCache is not None and onlyParseHeader is False
+			and parseCache.load(self, requiredMode)):
+			self._makeDataWritable()
+			return
 
 		# parse ELF file
 		self.parseElf(self.data, onlyParseHeader=onlyParseHeader)
 
 		# check if parsed ELF file and new generated one are the same
+		# ("force=True" is the same as VerificationMode.OFF)
 		if self.fileParsed is True and force is False:
-			# generate md5 hash of file that was parsed
-			tempHash = hashlib.md5()
-			tempHash.update(self.data)
-			oldFileHash = tempHash.digest()
-
-			# generate md5 hash of file that was newly generated
-			tempHash = hashlib.md5()
-			tempHash.update(self.generateElf())
-			newFileHash = tempHash.digest()
+			stats = self.verifyElf(verificationMode)
 
-			if oldFileHash != newFileHash:
+			if stats.mismatchedRegion is not None:
 				raise NotImplementedError('Not able to parse and ' \
 					+ 're-generate ELF file correctly. This can happen '\
 					+ 'when the ELF file is parsed out of an other file '\
 					+ 'like a core dump. Use "force=True" to ignore this '\
-					+ 'check.')
+					+ 'check (region "%s" differs).' % stats.mismatchedRegion)
+
+		if parseCache is not None and self.fileParsed is True:
+			parseCache.store(self, requiredMode)
+
+		# all modifications of the data are done on the piece table
+		# (also direct writes to self.data by the user)
+		self._makeDataWritable()
+
+
+	# this function replaces the data with a piece table over it, so that
+	# modifications do not copy the file and every modification of
+	# self.data is tracked (called after the data was parsed, the original
+	# data is never changed)
+	# return values: None
+	def _makeDataWritable(self):
+		if not isinstance(self.data, PieceTable):
+			self.data = PieceTable(self.data)
+
+
+	# this function gets the data as one contiguous buffer (the pieces of
+	# a modified file are combined once, needed for struct and find())
+	# return values: (bytearray or mmap) data (must not be modified)
+	def _getFlatData(self):
+		if isinstance(self.data, PieceTable):
+			return self.data.flatten()
+		return self.data
+
+
+	# this function gets the data as one contiguous buffer that supports
+	# the buffer interface (data of a file object that is read on demand
+	# is read completely)
+	# return values: (bytearray, mmap, buffer or str) data (must not be
+	# modified)
+	def _getBufferData(self):
+		data = self._getFlatData()
+		if isinstance(data, FileData):
+			return data[:]
+		return data
+
 
 	# this function interprets the r_info field from ElfN_Rel(a) structs
 	# depending on self.bits
@@ -77,12 +345,7 @@ class ElfParser(object):
 	# this function converts a section header entry to a list of data
 	# return values: (bytearray) converted section header entry
 	def sectionHeaderEntryToBytearray(self, sectionHeaderEntryToWrite):
-		if self.bits == 32:
-			structFormat = '< 2I 4I 2I 2I'
-		elif self.bits == 64:
-			structFormat = '< 2I 4Q 2I 2Q'
-
-		sectionHeaderEntryRaw = bytearray(struct.pack(structFormat,
+		sectionHeaderEntryRaw = bytearray(self.layout.shdr.pack(
 			# uint32_t   sh_name;
 			sectionHeaderEntryToWrite.sh_name,
 			# uint32_t   sh_type;
@@ -114,6 +377,8 @@ class ElfParser(object):
 		sh_addr, sh_offset, sh_size, sh_link, sh_info, sh_addralign,
 		sh_entsize):
 		newsection = Section()
+		# renaming the section later is counted
+		newsection._setCounter(self._modificationCounter)
 
 		newsection.sectionName = sectionName
 
@@ -172,16 +437,27 @@ class ElfParser(object):
 
 	# this function parses a dynamic symbol at the given offset
 	# return values: (DynamicSymbol) the parsed dynamic symbol
-	def _parseDynamicSymbol(self, offset, stringTableOffset, stringTableSize):
+	def _parseDynamicSymbol(self, offset, stringTable):
 
 		# check if the file was completely parsed before
 		if self.fileParsed is False:
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
-		tempSymbol = DynamicSymbol()
-
 		# get values from the symbol table
+		symbolEntry = next(iterUnpackFrom(self.layout.sym,
+			self._getFlatData(), offset, 1))
+
+		# return dynamic symbol
+		return self._dynamicSymbolFromEntry(symbolEntry, stringTable)
+
+
+	# this function creates a dynamic symbol from an unpacked symbol
+	# table entry (the name is decoded from the string table when it is
+	# read for the first time)
+	# return values: (DynamicSymbol) the created dynamic symbol
+	def _dynamicSymbolFromEntry(self, symbolEntry, stringTable):
+
 		"""
 		typedef struct {
 			uint32_t      st_name;
@@ -204,49 +480,18 @@ class ElfParser(object):
 		Difference: order (*)
 		"""
 		if self.bits == 32:
-			fmt = '<I II BBH'
-			fmtSize = struct.calcsize(fmt)
-			(
-				tempSymbol.ElfN_Sym.st_name,
-				tempSymbol.ElfN_Sym.st_value,   # *
-				tempSymbol.ElfN_Sym.st_size,    # *
-				tempSymbol.ElfN_Sym.st_info,
-				tempSymbol.ElfN_Sym.st_other,
-				tempSymbol.ElfN_Sym.st_shndx,
-			) = struct.unpack(fmt, self.data[offset:offset+fmtSize])
+			elfSymbol = _createSym32(symbolEntry)
 		elif self.bits == 64:
-			fmt = '<I BBH QQ'
-			fmtSize = struct.calcsize(fmt)
-			(
-				tempSymbol.ElfN_Sym.st_name,
-				tempSymbol.ElfN_Sym.st_info,
-				tempSymbol.ElfN_Sym.st_other,
-				tempSymbol.ElfN_Sym.st_shndx,
-				tempSymbol.ElfN_Sym.st_value,   # *
-				tempSymbol.ElfN_Sym.st_size,    # *
-			) = struct.unpack(fmt, self.data[offset:offset+fmtSize])
-
-		# extract name from the string table
-		nStart = stringTableOffset + tempSymbol.ElfN_Sym.st_name
-		nMaxEnd = stringTableOffset + stringTableSize
-		nEnd = self.data.find('\x00', nStart, nMaxEnd)
-		# use empty string if string is not terminated (nEnd == -1)
-		nEnd = max(nStart, nEnd)
-		tempSymbol.symbolName = bytes(self.data[nStart:nEnd])
+			elfSymbol = _createSym64(symbolEntry)
 
-		# return dynamic symbol
-		return tempSymbol
+		return DynamicSymbol(elfSymbol.st_name, elfSymbol, stringTable)
 
 
 	# this function writes a dynamic symbol to a given offset
 	# return values: None
 	def _writeDynamicSymbol(self, data, offset, elfSymbol):
 		if self.bits == 32:
-			fmt = '< I II BBH'
-			fmtSize = struct.calcsize(fmt)
-			assert fmtSize == 16
-
-			data[offset:offset+fmtSize] = struct.pack(fmt,
+			self.layout.sym.pack_into(data, offset,
 				elfSymbol.st_name,
 				elfSymbol.st_value, # *
 				elfSymbol.st_size,  # *
@@ -255,11 +500,7 @@ class ElfParser(object):
 				elfSymbol.st_shndx,
 			)
 		elif self.bits == 64:
-			fmt = '<I BBH QQ'
-			fmtSize = struct.calcsize(fmt)
-			assert fmtSize == 24
-
-			data[offset:offset+fmtSize] = struct.pack(fmt,
+			self.layout.sym.pack_into(data, offset,
 				elfSymbol.st_name,
 				elfSymbol.st_info,
 				elfSymbol.st_other,
@@ -316,7 +557,7 @@ class ElfParser(object):
 		The fifth byte identifies the architecture for this binary
 		'''
 
-		self.header.e_ident = buffer_list[0:16]
+		self.header.e_ident = bytearray(buffer_list[0:16])
 
 		if self.header.e_ident[0:4] != b'\x7fELF':
 			raise NotImplementedError("First 4 bytes do not have magic value")
@@ -331,8 +572,10 @@ class ElfParser(object):
 		else:
 			raise NotImplementedError("Invalid ELFCLASS (e_ident[4]).")
 
-		if (self.bits == 32 and len(buffer_list) < 52) \
-		or (self.bits == 64 and len(buffer_list) < 64):
+		# precompiled struct layouts for this ELF class
+		self.layout = layouts[self.bits]
+
+		if len(buffer_list) < 16 + self.layout.ehdr.size:
 			raise ValueError("Buffer is too small to contain an ELF header.")
 
 
@@ -451,10 +694,8 @@ class ElfParser(object):
 		the value zero.
 		'''
 
-		if self.bits == 32:
-			unpackedHeader = struct.unpack('< 2H I 3I I 6H', buffer_list[16:52])
-		elif self.bits == 64:
-			unpackedHeader = struct.unpack('< 2H I 3Q I 6H', buffer_list[16:64])
+		unpackedHeader = next(iterUnpackFrom(self.layout.ehdr, buffer_list,
+			16, 1))
 
 		(
 				self.header.e_type,
@@ -554,6 +795,419 @@ class ElfParser(object):
 		# but without this flag internal functions will not work)
 		self.fileParsed = True
 
+		# the tables of the ELF file are parsed on their first access
+		# (see the properties "sections", "segments", ...)
+		self._sections = None
+		self._segments = None
+		self._dynamicSegmentEntries = None
+		self._dynamicSymbolEntries = None
+		self._jumpRelocationEntries = None
+		self._relocationEntries = None
+		self._parseResultTables = dict()
+
+		# the records of the tables parsed from now on describe the data
+		self._markUnmodified()
+
+
+	# this function gets the modification counters of the records of
+	# each table (and of the data)
+	# return values: (dict) modification counter for each table name
+	def _getModificationCounts(self):
+		dataModificationCount = 0
+		if isinstance(self.data, PieceTable):
+			dataModificationCount = self.data.modificationCount
+
+		counter = self._modificationCounter
+		return {
+			"data": dataModificationCount,
+			"sections": counter.sections,
+			"sectionNames": counter.sectionNames,
+			"segments": counter.segments,
+			"dynamicSegmentEntries": counter.dynamicSegmentEntries,
+			"dynamicSymbolEntries": counter.dynamicSymbolEntries,
+			"symbolNames": counter.symbolNames,
+			"jumpRelocationEntries": counter.relocationEntries,
+			"relocationEntries": counter.relocationEntries,
+		}
+
+
+	# this function remembers the current records as unmodified, that
+	# means they describe the data (generateElf() only re-generates the
+	# regions whose records were changed afterwards)
+	# return values: None
+	def _markUnmodified(self):
+		self._unmodifiedCounts = self._getModificationCounts()
+		self._unmodifiedPositions = (self.header.e_phoff,
+			self.header.e_shoff, self.header.e_shstrndx)
+		self._unmodifiedDataLength = len(self.data)
+		if isinstance(self.data, PieceTable):
+			self.data.dirtyIntervals = IntervalSet()
+
+		# copies of the parsed tables (to detect added, removed or
+		# replaced records)
+		self._unmodifiedTables = dict()
+		for tableName in _tableNames:
+			table = getattr(self, "_" + tableName)
+			if table is not None:
+				self._setUnmodifiedTable(tableName, table)
+
+
+	# this function remembers the records of the given table as
+	# unmodified and assigns them to the modification counter of this
+	# file (records added by the user are counted from now on)
+	# return values: None
+	def _setUnmodifiedTable(self, tableName, table):
+		counter = self._modificationCounter
+		for record in table:
+			record._setCounter(counter)
+		self._unmodifiedTables[tableName] = list(table)
+
+
+	# this function gets the header and the values of the records of all
+	# tables (used by the parse cache, every table is marshaled on its own
+	# so it can be created on first access, tables that can not be parsed
+	# are None and raise their error again when they are accessed)
+	# return values: (tuple) ELF class, values of the header, (dict)
+	# marshaled values of each table
+	def _getParseResult(self):
+
+		tables = dict()
+		for tableName in _tableNames:
+			try:
+				tables[tableName] = getattr(self, tableName)
+			except Exception:
+				tables[tableName] = None
+
+		header = self.header
+		headerValues = (bytes(header.e_ident), header.e_type,
+			header.e_machine, header.e_version, header.e_entry,
+			header.e_phoff, header.e_shoff, header.e_flags, header.e_ehsize,
+			header.e_phentsize, header.e_phnum, header.e_shentsize,
+			header.e_shnum, header.e_shstrndx)
+
+		tableValues = dict.fromkeys(_tableNames)
+
+		if tables["sections"] is not None:
+			tableValues["sections"] = [(_shdrValues(section.elfN_shdr),
+				section.sectionName) for section in tables["sections"]]
+
+		if tables["segments"] is not None:
+			tableValues["segments"] = [_phdrValues(segment.elfN_Phdr)
+				for segment in tables["segments"]]
+
+		if tables["dynamicSegmentEntries"] is not None:
+			tableValues["dynamicSegmentEntries"] = [(entry.d_tag, entry.d_un)
+				for entry in tables["dynamicSegmentEntries"]]
+
+		dynamicSymbolEntries = tables["dynamicSymbolEntries"]
+		if dynamicSymbolEntries is not None:
+			tableValues["dynamicSymbolEntries"] = [
+				(_symValues(symbol.ElfN_Sym), symbol.symbolName)
+				for symbol in dynamicSymbolEntries]
+
+		# relocations reference a dynamic symbol by its index (None) or
+		# hold a symbol outside of the parsed dynamic symbols
+		for tableName in ("jumpRelocationEntries", "relocationEntries"):
+			if tables[tableName] is None:
+				continue
+
+			entries = list()
+			for entry in tables[tableName]:
+				symbol = entry._symbol
+				if (entry.r_sym < len(dynamicSymbolEntries)
+					and dynamicSymbolEntries[entry.r_sym] is symbol):
+					symbolValues = None
+				else:
+					symbolValues = (_symValues(symbol.ElfN_Sym),
+						symbol.symbolName)
+
+				if isinstance(entry, ElfN_Rela):
+					entries.append((entry.r_offset, entry.r_info,
+						entry.r_addend, entry.r_sym, entry.r_type,
+						symbolValues))
+				else:
+					entries.append((entry.r_offset, entry.r_info,
+						entry.r_sym, entry.r_type, symbolValues))
+			tableValues[tableName] = entries
+
+		for tableName, values in tableValues.items():
+			if values is not None:
+				tableValues[tableName] = marshal.dumps(values)
+
+		return (self.bits, headerValues, tableValues)
+
+
+	# this function uses a parse result of _getParseResult() instead of
+	# parsing the data (the records of a table are created on its first
+	# access like a parsed table)
+	# return values: None
+	def _setParseResult(self, parseResult):
+
+		(bits, headerValues, tableValues) = parseResult
+
+		self.bits = bits
+		self.layout = layouts[bits]
+
+		self.header = ElfN_Ehdr()
+		self.header.e_ident = bytearray(headerValues[0])
+		(self.header.e_type, self.header.e_machine, self.header.e_version,
+			self.header.e_entry, self.header.e_phoff, self.header.e_shoff,
+			self.header.e_flags, self.header.e_ehsize,
+			self.header.e_phentsize, self.header.e_phnum,
+			self.header.e_shentsize, self.header.e_shnum,
+			self.header.e_shstrndx) = headerValues[1:]
+
+		self.fileParsed = True
+
+		self._sections = None
+		self._segments = None
+		self._dynamicSegmentEntries = None
+		self._dynamicSymbolEntries = None
+		self._jumpRelocationEntries = None
+		self._relocationEntries = None
+		self._parseResultTables = dict((tableName, values)
+			for tableName, values in tableValues.items()
+			if values is not None)
+
+		self._markUnmodified()
+
+
+	# this function creates the records of the given table from the
+	# parse result (called by the parse functions before the data is
+	# parsed, the records are created like by the parser => not counted
+	# as modification)
+	# return values: (bool) True if the table was created
+	def _createTableFromParseResult(self, tableName):
+		tableValues = self._parseResultTables.pop(tableName, None)
+		if tableValues is None:
+			return False
+		tableValues = marshal.loads(tableValues)
+
+		if tableName == "sections":
+			table = list()
+			for shdrValues, sectionName in tableValues:
+				section = Section(_createShdr(shdrValues))
+				section._sectionName = sectionName
+				table.append(section)
+
+		elif tableName == "segments":
+			table = list()
+			for phdrValues in tableValues:
+				segment = Segment(_createPhdr(phdrValues))
+				segment.sectionsWithin = None
+				segment.segmentsWithin = None
+				segment._computeWithin = self._computeWithinSegments
+				table.append(segment)
+
+		elif tableName == "dynamicSegmentEntries":
+			table = [_createDyn(dynValues) for dynValues in tableValues]
+
+		elif tableName == "dynamicSymbolEntries":
+			table = [DynamicSymbol(symbolName, _createSym32(symValues))
+				for symValues, symbolName in tableValues]
+
+		else:
+			dynamicSymbolEntries = self.dynamicSymbolEntries
+			otherSymbols = dict()
+			table = list()
+			for values in tableValues:
+				# fields: r_offset, r_info, (r_addend,) r_sym, r_type,
+				# symbol
+				symbolValues = values[-1]
+				rSym = values[-3]
+				if symbolValues is None:
+					symbol = dynamicSymbolEntries[rSym]
+				else:
+					symbol = otherSymbols.get(rSym)
+					if symbol is None:
+						symbol = DynamicSymbol(symbolValues[1],
+							_createSym32(symbolValues[0]))
+						otherSymbols[rSym] = symbol
+
+				if len(values) == 6:
+					table.append(_createRela(values[:-1] + (symbol,)))
+				else:
+					table.append(_createRel(values[:-1] + (symbol,)))
+
+		setattr(self, "_" + tableName, table)
+		self._setUnmodifiedTable(tableName, table)
+		return True
+
+
+	# this function checks if the records of the given table were changed
+	# since they were marked as unmodified (a table that was not parsed
+	# yet is unmodified)
+	# return values: (bool) True if the table was modified
+	def _isTableModified(self, tableName, counts):
+		if counts[tableName] != self._unmodifiedCounts[tableName]:
+			return True
+
+		table = getattr(self, "_" + tableName)
+		if table is None:
+			return False
+
+		# records were added, removed or replaced
+		# (or the table was set by the user)
+		unmodifiedTable = self._unmodifiedTables.get(tableName)
+		return unmodifiedTable is None or unmodifiedTable != table
+
+
+	# this function gets the regions written by generateElf() that have
+	# to be re-generated because their records were changed
+	# return values: (set) names of the regions
+	def _getModifiedRegions(self):
+		counts = self._getModificationCounts()
+
+		# data was changed => re-generate all regions
+		# (the regions are generated over changed data)
+		if counts["data"] != self._unmodifiedCounts["data"]:
+			return set(_regionNames)
+
+		sectionsModified = self._isTableModified("sections", counts)
+		segmentsModified = self._isTableModified("segments", counts)
+
+		# the position of the dynamic segment and the locations of the
+		# tables it references depend on the segments
+		dynamicModified = segmentsModified \
+			or self._isTableModified("dynamicSegmentEntries", counts)
+		symbolsModified = dynamicModified \
+			or self._isTableModified("dynamicSymbolEntries", counts)
+
+		# relocations also write symbols that are not part of
+		# the dynamic symbols
+		relocationsModified = symbolsModified \
+			or self._isTableModified("jumpRelocationEntries", counts) \
+			or self._isTableModified("relocationEntries", counts)
+
+		(e_phoff, e_shoff, e_shstrndx) = self._unmodifiedPositions
+
+		# the header is always written back (e_ident can be changed
+		# in place)
+		modifiedRegions = set(["header"])
+		if sectionsModified or self.header.e_shoff != e_shoff:
+			modifiedRegions.add("section header table")
+		if (sectionsModified
+			or counts["sectionNames"] != self._unmodifiedCounts["sectionNames"]
+			or self.header.e_shstrndx != e_shstrndx):
+			modifiedRegions.add("section names")
+		if segmentsModified or self.header.e_phoff != e_phoff:
+			modifiedRegions.add("program header table")
+		if dynamicModified:
+			modifiedRegions.add("dynamic segment")
+		if symbolsModified:
+			modifiedRegions.add("dynamic symbols")
+
+		# the hash tables are checked against the names in the string
+		# table (renamed symbols usually go together with an in place
+		# change of the string table, a change of the data already
+		# re-generates all regions), a table is only rebuilt if it does
+		# not describe the names anymore
+		if (symbolsModified
+			or counts["symbolNames"] != self._unmodifiedCounts["symbolNames"]):
+			modifiedRegions.add("hash tables")
+		if relocationsModified:
+			modifiedRegions.add("relocations")
+		return modifiedRegions
+
+
+	# list of all sections (parsed on first access)
+	@property
+	def sections(self):
+		if self._sections is None:
+			self._parseSectionHeaderTable()
+		return self._sections
+
+	@sections.setter
+	def sections(self, value):
+		self._sections = value
+
+
+	# list of all segments (parsed on first access)
+	@property
+	def segments(self):
+		if self._segments is None:
+			self._parseProgramHeaderTable()
+		return self._segments
+
+	@segments.setter
+	def segments(self, value):
+		self._segments = value
+
+
+	# list of all dynamic segment entries (parsed on first access)
+	@property
+	def dynamicSegmentEntries(self):
+		if self._dynamicSegmentEntries is None:
+			self._parseDynamicSegment()
+		return self._dynamicSegmentEntries
+
+	@dynamicSegmentEntries.setter
+	def dynamicSegmentEntries(self, value):
+		self._dynamicSegmentEntries = value
+
+
+	# list of all dynamic symbols (parsed on first access)
+	@property
+	def dynamicSymbolEntries(self):
+		if self._dynamicSymbolEntries is None:
+			self._parseDynamicSymbolTable()
+		return self._dynamicSymbolEntries
+
+	@dynamicSymbolEntries.setter
+	def dynamicSymbolEntries(self, value):
+		self._dynamicSymbolEntries = value
+
+
+	# list of all jump relocation entries (parsed on first access)
+	@property
+	def jumpRelocationEntries(self):
+		if self._jumpRelocationEntries is None:
+			self._parseRelocationTables()
+		return self._jumpRelocationEntries
+
+	@jumpRelocationEntries.setter
+	def jumpRelocationEntries(self, value):
+		self._jumpRelocationEntries = value
+
+
+	# list of all relocation entries (parsed on first access)
+	@property
+	def relocationEntries(self):
+		if self._relocationEntries is None:
+			self._parseRelocationTables()
+		return self._relocationEntries
+
+	@relocationEntries.setter
+	def relocationEntries(self, value):
+		self._relocationEntries = value
+
+
+	# this function parses all tables that were not accessed yet
+	# (has to be done before the data or the layout of the file is modified,
+	# because the tables are parsed from the data)
+	# return values: None
+	def _parseAllTables(self):
+		if self._sections is None:
+			self._parseSectionHeaderTable()
+		if self._segments is None:
+			self._parseProgramHeaderTable()
+		if self._dynamicSegmentEntries is None:
+			self._parseDynamicSegment()
+		if self._dynamicSymbolEntries is None:
+			self._parseDynamicSymbolTable()
+		if (self._jumpRelocationEntries is None
+			or self._relocationEntries is None):
+			self._parseRelocationTables()
+
+
+	# this function parses the section header table and the
+	# section string table
+	# return values: None
+	def _parseSectionHeaderTable(self):
+
+		# table of a cached parse result => nothing to parse
+		if self._createTableFromParseResult("sections"):
+			return
 
 		###############################################
 		# parse section header table
@@ -576,9 +1230,14 @@ class ElfParser(object):
 		'''
 
 		# create a list of the section_header_table
-		self.sections = list()
+		sections = list()
 
-		for i in range(self.header.e_shnum):
+		# every entry has the size of the section header layout
+		assert self.header.e_shnum == 0 \
+			or self.layout.shdr.size == self.header.e_shentsize
+
+		for unpackedSection in iterUnpackFrom(self.layout.shdr,
+			self._getFlatData(), self.header.e_shoff, self.header.e_shnum):
 			'''
 			uint32_t   sh_name;
 
@@ -654,36 +1313,14 @@ class ElfParser(object):
 			the section does not hold a table of fixed-size entries.
 			'''
 
-			tempSectionEntry = ElfN_Shdr()
-			tempOffset = self.header.e_shoff + i*self.header.e_shentsize
-
-			if self.bits == 32:
-				fmt = '< 2I 4I 2I 2I'
-			elif self.bits == 64:
-				fmt = '< 2I 4Q 2I 2Q'
-
-			fmtSize = struct.calcsize(fmt)
-			assert fmtSize == self.header.e_shentsize
-
-			(
-					tempSectionEntry.sh_name,
-					tempSectionEntry.sh_type,
-					tempSectionEntry.sh_flags,      # 32/64 bit!
-					tempSectionEntry.sh_addr,       # 32/64 bit!
-					tempSectionEntry.sh_offset,     # 32/64 bit!
-					tempSectionEntry.sh_size,       # 32/64 bit!
-					tempSectionEntry.sh_link,
-					tempSectionEntry.sh_info,
-					tempSectionEntry.sh_addralign,  # 32/64 bit!
-					tempSectionEntry.sh_entsize,    # 32/64 bit!
-			) = struct.unpack(fmt, buffer_list[tempOffset:tempOffset+fmtSize])
-			del tempOffset
-			del fmtSize
+			# fields: sh_name, sh_type, sh_flags, sh_addr, sh_offset,
+			# sh_size, sh_link, sh_info, sh_addralign, sh_entsize
+			# (sh_flags, sh_addr, sh_offset, sh_size, sh_addralign
+			# and sh_entsize are 32/64 bit!)
+			tempSectionEntry = _createShdr(unpackedSection)
 
 			# create new section and add to sections list
-			section = Section()
-			section.elfN_shdr = tempSectionEntry
-			self.sections.append(section)
+			sections.append(Section(tempSectionEntry))
 
 
 		###############################################
@@ -695,25 +1332,32 @@ class ElfParser(object):
 		# empty section string table => sh_size of string table section = 0
 		# => Non-zero indexes to string table are invalid
 
-		# list of sections not empty => read whole string table
-		if self.sections:
-			nStart = self.sections[self.header.e_shstrndx].elfN_shdr.sh_offset
-			nEnd = nStart + self.sections[self.header.e_shstrndx].elfN_shdr.sh_size
-			stringtable_str = buffer_list[nStart:nEnd]
+		# list of sections not empty => search names directly in the
+		# string table (without copying the whole string table)
+		if sections:
+			stringTableEntry = sections[self.header.e_shstrndx].elfN_shdr
+			stringTable = StringTable(self._getFlatData(),
+				stringTableEntry.sh_offset, stringTableEntry.sh_size)
 
 			# get name from string table for each section
-			for i in range(len(self.sections)):
+			# (only if the string table exists)
+			if len(stringTable) > 0:
+				for section in sections:
+					# parsed name => not counted as modification
+					section._sectionName = \
+						stringTable.getName(section.elfN_shdr.sh_name)
 
-				# check if string table exists => abort reading
-				if len(stringtable_str) == 0:
-					break
+		self._sections = sections
+		self._setUnmodifiedTable("sections", sections)
 
-				nStart = self.sections[i].elfN_shdr.sh_name
-				nEnd = stringtable_str.find('\x00', nStart)
-				# use empty string if string is not terminated (nEnd == -1)
-				nEnd = max(nStart, nEnd)
-				self.sections[i].sectionName = bytes(stringtable_str[nStart:nEnd])
 
+	# this function parses the program header table
+	# return values: None
+	def _parseProgramHeaderTable(self):
+
+		# table of a cached parse result => nothing to parse
+		if self._createTableFromParseResult("segments"):
+			return
 
 		###############################################
 		# parse program header table
@@ -745,9 +1389,11 @@ class ElfParser(object):
 		'''
 
 		# create a list of the program_header_table
-		self.segments = list()
+		segments = list()
 
-		for i in range(self.header.e_phnum):
+		for unpackedSegment in iterUnpackFrom(self.layout.phdr,
+			self._getFlatData(), self.header.e_phoff, self.header.e_phnum,
+			self.header.e_phentsize):
 			'''
 			uint32_t   p_type;
 
@@ -812,70 +1458,138 @@ class ElfParser(object):
 			p_align.
 			'''
 
-			tempSegment = Segment()
-			tempOffset = self.header.e_phoff + i*self.header.e_phentsize
-
-			if self.bits == 32:
-				unpackedSegment = struct.unpack('< I 5I I I', \
-						buffer_list[tempOffset:tempOffset+32])
-			elif self.bits == 64:
-				unpackedSegment = struct.unpack('< I I 5Q Q', \
-						buffer_list[tempOffset:tempOffset+56])
+			if self.bits == 64:
 				# order elements as in Elf32_Phdr
 				unpackedSegment = unpackedSegment[0:1] + unpackedSegment[2:7] \
 						+ unpackedSegment[1:2] + unpackedSegment[7:8]
 
-			del tempOffset
-
-			(
-					tempSegment.elfN_Phdr.p_type,
-					tempSegment.elfN_Phdr.p_offset, # 32/64 bit!
-					tempSegment.elfN_Phdr.p_vaddr,  # 32/64 bit!
-					tempSegment.elfN_Phdr.p_paddr,  # 32/64 bit!
-					tempSegment.elfN_Phdr.p_filesz, # 32/64 bit!
-					tempSegment.elfN_Phdr.p_memsz,  # 32/64 bit!
-					tempSegment.elfN_Phdr.p_flags,  # position as in Elf32_Phdr
-					tempSegment.elfN_Phdr.p_align,  # 32/64 bit!
-			) = unpackedSegment
-
-			# check which sections are in the current segment
-			# (in memory) and add them
-			for section in self.sections:
-				segStart = tempSegment.elfN_Phdr.p_vaddr
-				segEnd = segStart + tempSegment.elfN_Phdr.p_memsz
-				sectionStart = section.elfN_shdr.sh_addr
-				sectionEnd = sectionStart + section.elfN_shdr.sh_size
+			# fields: p_type, p_offset, p_vaddr, p_paddr, p_filesz,
+			# p_memsz, p_flags (position as in Elf32_Phdr), p_align
+			# (p_offset, p_vaddr, p_paddr, p_filesz, p_memsz and p_align
+			# are 32/64 bit!)
+			tempSegment = Segment(_createPhdr(unpackedSegment))
 
-				if segStart <= sectionStart and sectionEnd <= segEnd:
-					tempSegment.sectionsWithin.append(section)
+			# sections and segments within this segment are computed
+			# on first access
+			tempSegment.sectionsWithin = None
+			tempSegment.segmentsWithin = None
+			tempSegment._computeWithin = self._computeWithinSegments
 
-			self.segments.append(tempSegment)
+			segments.append(tempSegment)
 
+		self._segments = segments
+		self._setUnmodifiedTable("segments", segments)
 
-		# get all segments within a segment
-		for outerSegment in self.segments:
-			# PT_GNU_STACK only holds access rights
-			if outerSegment.elfN_Phdr.p_type == P_type.PT_GNU_STACK:
-				continue
 
-			for segmentWithin in self.segments:
+	# this function computes the sections (in memory) and the segments
+	# (in the file) within the segments (for all segments whose lists
+	# were not computed yet)
+	# return values: None
+	def _computeWithinSegments(self, segmentToCompute):
+
+		segments = self.segments
+		outerSegments = [segment for segment in segments
+			if segment._sectionsWithin is None
+			or segment._segmentsWithin is None]
+		if segmentToCompute not in outerSegments:
+			outerSegments.append(segmentToCompute)
+
+		# check which sections are in the segments (in memory)
+		sectionRanges = list()
+		for section in self.sections:
+			sectionStart = section.elfN_shdr.sh_addr
+			sectionEnd = sectionStart + section.elfN_shdr.sh_size
+			sectionRanges.append((sectionStart, sectionEnd))
+
+		segmentRanges = list()
+		for segment in outerSegments:
+			segStart = segment.elfN_Phdr.p_vaddr
+			segEnd = segStart + segment.elfN_Phdr.p_memsz
+			segmentRanges.append((segStart, segEnd))
+
+		sectionsWithinSegments = rangesWithin(segmentRanges, sectionRanges)
+
+		# check which segments are in the segments (in the file)
+		# PT_GNU_STACK only holds access rights => ignore it
+		innerSegments = [segment for segment in segments
+			if segment.elfN_Phdr.p_type != P_type.PT_GNU_STACK]
+		innerRanges = list()
+		for segment in innerSegments:
+			innerStart = segment.elfN_Phdr.p_offset
+			innerEnd = innerStart + segment.elfN_Phdr.p_filesz
+			innerRanges.append((innerStart, innerEnd))
+
+		outerRanges = list()
+		for segment in outerSegments:
+			outerStart = segment.elfN_Phdr.p_offset
+			outerEnd = outerStart + segment.elfN_Phdr.p_filesz
+			outerRanges.append((outerStart, outerEnd))
+
+		segmentsWithinSegments = rangesWithin(outerRanges, innerRanges)
+
+		for i in range(len(outerSegments)):
+			outerSegment = outerSegments[i]
+
+			if outerSegment._sectionsWithin is None:
+				outerSegment._sectionsWithin = [self.sections[j]
+					for j in sectionsWithinSegments[i]]
+
+			if outerSegment._segmentsWithin is None:
 				# PT_GNU_STACK only holds access rights
-				if segmentWithin.elfN_Phdr.p_type == P_type.PT_GNU_STACK:
+				if outerSegment.elfN_Phdr.p_type == P_type.PT_GNU_STACK:
+					outerSegment._segmentsWithin = list()
 					continue
 
 				# skip if segments are the same
-				if segmentWithin == outerSegment:
-					continue
+				outerSegment._segmentsWithin = [innerSegments[j]
+					for j in segmentsWithinSegments[i]
+					if innerSegments[j] is not outerSegment]
+
+
+	# this function updates the already computed lists of sections within
+	# the segments for an added, removed or changed section
+	# return values: None
+	def _updateSectionWithinSegments(self, changedSection):
+
+		sectionStart = changedSection.elfN_shdr.sh_addr
+		sectionEnd = sectionStart + changedSection.elfN_shdr.sh_size
 
-				# check if segmentWithin lies within the outerSegment
-				innerStart = segmentWithin.elfN_Phdr.p_offset
-				innerEnd = innerStart + segmentWithin.elfN_Phdr.p_filesz
-				outerStart = outerSegment.elfN_Phdr.p_offset
-				outerEnd = outerStart + outerSegment.elfN_Phdr.p_filesz
+		sectionPositions = None
+		for segment in self.segments:
+			sectionsWithin = segment._sectionsWithin
+			if sectionsWithin is None:
+				continue
+
+			if changedSection in sectionsWithin:
+				sectionsWithin.remove(changedSection)
+
+			segStart = segment.elfN_Phdr.p_vaddr
+			segEnd = segStart + segment.elfN_Phdr.p_memsz
+			if not (segStart <= sectionStart and sectionEnd <= segEnd):
+				continue
+
+			if sectionPositions is None:
+				sectionPositions = dict((id(section), i)
+					for i, section in enumerate(self.sections))
 
-				if outerStart <= innerStart and innerEnd <= outerEnd:
-					outerSegment.segmentsWithin.append(segmentWithin)
+			# removed section => do not add it again
+			if id(changedSection) not in sectionPositions:
+				continue
+
+			# keep the order of the sections
+			positionsWithin = [sectionPositions[id(section)]
+				for section in sectionsWithin]
+			sectionsWithin.insert(bisect.bisect_left(positionsWithin,
+				sectionPositions[id(changedSection)]), changedSection)
+
+
+	# this function parses the entries of the dynamic segment
+	# return values: None
+	def _parseDynamicSegment(self):
 
+		# table of a cached parse result => nothing to parse
+		if self._createTableFromParseResult("dynamicSegmentEntries"):
+			return
 
 		###############################################
 		# parse dynamic segment entries
@@ -908,32 +1622,22 @@ class ElfParser(object):
 			raise ValueError("Segment of type PT_DYNAMIC was not found.")
 
 		# create a list for all dynamic segment entries
-		self.dynamicSegmentEntries = list()
-
-		if self.bits == 32:
-			structFmt = '<II'
-		elif self.bits == 64:
-			structFmt = '<QQ'
+		dynamicSegmentEntries = list()
 
-		dynSegEntrySize = struct.calcsize(structFmt)
+		dynSegEntrySize = self.layout.dyn.size
 
+		# entries are unpacked on demand => entries behind
+		# DT_NULL are never unpacked
 		endReached = False
-		for i in range((dynamicSegment.elfN_Phdr.p_filesz / dynSegEntrySize)):
-
-			# parse dynamic segment entry
-			dynSegmentEntry = ElfN_Dyn()
-
-			tempOffset = dynamicSegment.elfN_Phdr.p_offset + i*dynSegEntrySize
-			(
-					dynSegmentEntry.d_tag,
-					dynSegmentEntry.d_un,
-			) = struct.unpack(structFmt,
-					self.data[tempOffset:tempOffset+dynSegEntrySize])
+		for unpackedEntry in iterUnpackFrom(self.layout.dyn,
+			self._getFlatData(), dynamicSegment.elfN_Phdr.p_offset,
+			dynamicSegment.elfN_Phdr.p_filesz / dynSegEntrySize):
 
-			del tempOffset
+			# parse dynamic segment entry (fields: d_tag, d_un)
+			dynSegmentEntry = _createDyn(unpackedEntry)
 
 			# add dynamic segment entry to list
-			self.dynamicSegmentEntries.append(dynSegmentEntry)
+			dynamicSegmentEntries.append(dynSegmentEntry)
 
 			# check if the end of the dynamic segment array is reached
 			if dynSegmentEntry.d_tag == D_tag.DT_NULL:
@@ -945,63 +1649,23 @@ class ElfParser(object):
 			raise ValueError("PT_NULL was not found in segment of type" \
 			+ "PT_DYNAMIC (malformed ELF executable/shared object).")
 
+		self._dynamicSegmentEntries = dynamicSegmentEntries
+		self._setUnmodifiedTable("dynamicSegmentEntries",
+			dynamicSegmentEntries)
 
-		###############################################
-		# parse relocation entries
 
+	# this function gets the location of the dynamic symbol table and
+	# the dynamic string table from the dynamic segment entries
+	# return values: (int) offset of symbol table, (int) size of
+	# a symbol table entry, (int) offset of string table,
+	# (int) size of string table
+	def _getDynamicSymbolTableLocation(self):
 
-		# search for relocation entries in dynamic segment entries
-		jmpRelOffset = None
-		pltRelSize = None
-		pltRelType = None
-		relEntrySize = None
-		relOffset = None
-		relSize = None
-		relaEntrySize = None
-		relaOffset = None
-		relaSize = None
 		symbolEntrySize = None
 		symbolTableOffset = None
 		stringTableOffset = None
 		stringTableSize = None
 		for dynEntry in self.dynamicSegmentEntries:
-			if dynEntry.d_tag == D_tag.DT_JMPREL:
-				if jmpRelOffset is not None:
-					raise ValueError("Can't handle multiple DT_JMPREL")
-				jmpRelOffset = self.virtualMemoryAddrToFileOffset(dynEntry.d_un)
-				continue
-			if dynEntry.d_tag == D_tag.DT_PLTRELSZ:
-				pltRelSize = dynEntry.d_un
-				continue
-			if dynEntry.d_tag == D_tag.DT_PLTREL:
-				pltRelType = dynEntry.d_un
-				continue
-			if dynEntry.d_tag == D_tag.DT_RELENT:
-				if relEntrySize is not None:
-					raise ValueError("Can't handle multiple DT_RELENT")
-				relEntrySize = dynEntry.d_un
-				continue
-			if dynEntry.d_tag == D_tag.DT_RELAENT:
-				if relaEntrySize is not None:
-					raise ValueError("Can't handle multiple DT_RELAENT")
-				relaEntrySize = dynEntry.d_un
-				continue
-			if dynEntry.d_tag == D_tag.DT_REL:
-				if relOffset is not None:
-					raise ValueError("Can't handle multiple DT_REL")
-				relOffset = self.virtualMemoryAddrToFileOffset(dynEntry.d_un)
-				continue
-			if dynEntry.d_tag == D_tag.DT_RELA:
-				if relaOffset is not None:
-					raise ValueError("Can't handle multiple DT_RELA")
-				relaOffset = self.virtualMemoryAddrToFileOffset(dynEntry.d_un)
-				continue
-			if dynEntry.d_tag == D_tag.DT_RELSZ:
-				relSize = dynEntry.d_un
-				continue
-			if dynEntry.d_tag == D_tag.DT_RELASZ:
-				relaSize = dynEntry.d_un
-				continue
 			if dynEntry.d_tag == D_tag.DT_SYMENT:
 				symbolEntrySize = dynEntry.d_un
 				continue
@@ -1018,7 +1682,6 @@ class ElfParser(object):
 			if dynEntry.d_tag == D_tag.DT_STRSZ:
 				stringTableSize = dynEntry.d_un
 
-
 		# check if ELF got needed entries
 		if (stringTableOffset is None
 			or stringTableSize is None
@@ -1028,6 +1691,48 @@ class ElfParser(object):
 				" DT_STRSZ, DT_SYMTAB and/or DT_SYMENT found (malformed ELF" \
 				" executable/shared object).")
 
+		return (symbolTableOffset, symbolEntrySize, stringTableOffset,
+			stringTableSize)
+
+
+	# this function gets the string table of the dynamic symbols
+	# (DT_STRTAB, created again when the data was changed, so decoded
+	# names are shared by the symbols and the relocations)
+	# return values: (StringTable) dynamic string table
+	def _getDynamicStringTable(self):
+		(_, _, stringTableOffset, stringTableSize) = \
+			self._getDynamicSymbolTableLocation()
+
+		stringTableKey = (stringTableOffset, stringTableSize,
+			self._getModificationCounts()["data"])
+		if (self._dynamicStringTable is None
+			or self._dynamicStringTableKey != stringTableKey):
+			self._dynamicStringTable = StringTable(self._getFlatData(),
+				stringTableOffset, stringTableSize)
+			self._dynamicStringTableKey = stringTableKey
+		return self._dynamicStringTable
+
+
+	# this function determines the number of entries of the dynamic
+	# symbol table (from the hash table, the ".dynsym" section or from an
+	# estimation)
+	# return values: (int) number of dynamic symbols
+	def _getDynamicSymbolCount(self, symbolTableOffset, symbolEntrySize,
+		stringTableOffset):
+
+		# the hash table gives the exact number of symbols (only used if
+		# the section or the estimation is not forced)
+		if self.forceDynSymParsing == 0:
+			hashTable = self.getDynamicSymbolHashTable()
+			if hashTable is not None:
+				try:
+					symbolCount = hashTable.getSymbolCount()
+				except struct.error:
+					symbolCount = None
+				if (symbolCount is not None
+					and symbolTableOffset + (symbolCount*symbolEntrySize)
+					<= len(self.data)):
+					return symbolCount
 
 		# estimate symbol table size in order to not rely on sections
 		# when ELF is compiled with gcc, the .dynstr section (string table)
@@ -1110,175 +1815,376 @@ class ElfParser(object):
 				raise TypeError('"forceDynSymParsing" uses an invalid value.')
 
 		# use ".dynsym" section information (when considered correct)
+		symbolCount = 0
 		if dynSymSectionIgnore is False:
-
-			# parse the complete symbol table based on the
-			# ".dynsym" section
-			for i in range(dynSymSection.elfN_shdr.sh_size \
-				/ symbolEntrySize):
-
-				tempOffset = symbolTableOffset + (i*symbolEntrySize)
-				tempSymbol = self._parseDynamicSymbol(tempOffset,
-					stringTableOffset, stringTableSize)
-
-				# add entry to dynamic symbol entries list
-				self.dynamicSymbolEntries.append(tempSymbol)
+			symbolCount = dynSymSection.elfN_shdr.sh_size / symbolEntrySize
 
 		# use estimation to parse dynamic symbols
 		elif (dynSymSectionIgnore is True
 			and dynSymEstimationIgnore is False):
+			symbolCount = estimatedSymbolTableSize / symbolEntrySize
 
-			# parse the complete symbol table based on the
-			# estimation
-			for i in range(estimatedSymbolTableSize \
-				/ symbolEntrySize):
+		# symbol table can not lie behind the string table
+		return max(0, symbolCount)
 
-				tempOffset = symbolTableOffset + (i*symbolEntrySize)
-				tempSymbol = self._parseDynamicSymbol(tempOffset,
-					stringTableOffset, stringTableSize)
 
-				# add entry to dynamic symbol entries list
-				self.dynamicSymbolEntries.append(tempSymbol)
+	# this function parses the dynamic symbol table
+	# return values: None
+	def _parseDynamicSymbolTable(self):
 
-		# holds tuples: (type, offset, size, targetlist)
-		relocTODO = []
+		# table of a cached parse result => nothing to parse
+		if self._createTableFromParseResult("dynamicSymbolEntries"):
+			return
 
-		# DT_JMPREL
-		if jmpRelOffset is not None:
-			if pltRelType is None:
-				raise ValueError('DT_JMPREL present but DT_PLTREL not.')
-			if pltRelSize is None:
-				raise ValueError('DT_JMPREL present but DT_PLTRELSZ not.')
+		###############################################
+		# parse dynamic symbol table
 
-			if pltRelType == D_tag.DT_REL:
-				if relEntrySize is None:
-					raise ValueError('DT_JMPREL present with ' \
-							+ ' DT_PLTREL == DT_REL, but DT_RELSZ not present')
-			elif pltRelType == D_tag.DT_RELA:
-				if relaEntrySize is None:
-					raise ValueError('DT_JMPREL present with ' \
-							+ ' DT_PLTREL == DT_RELA, but DT_RELASZ not present')
-			else:
-				raise ValueError('Invalid/unexpected DT_PLTREL (pltRelType).')
+		(symbolTableOffset, symbolEntrySize, stringTableOffset,
+			stringTableSize) = self._getDynamicSymbolTableLocation()
 
-			self.jumpRelocationEntries = list()
-			relocTODO.append((pltRelType, jmpRelOffset, pltRelSize,
-				self.jumpRelocationEntries))
+		symbolCount = self._getDynamicSymbolCount(symbolTableOffset,
+			symbolEntrySize, stringTableOffset)
 
-		# DT_REL (only mandatory hwn DT_RELA is not present)
-		if relOffset is not None:
-			if relSize is None:
-				raise ValueError('DT_REL present but DT_RELSZ not.')
+		stringTable = self._getDynamicStringTable()
 
-			if relEntrySize is None:
-				raise ValueError('DT_REL present but DT_RELENT not.')
+		# create a list for all dynamic symbols
+		dynamicSymbolEntries = list()
 
-			self.relocationEntries = list()
-			relocTODO.append((D_tag.DT_REL, relOffset, relSize,
-				self.relocationEntries))
+		# parse the complete symbol table in one pass
+		for symbolEntry in iterUnpackFrom(self.layout.sym,
+			self._getFlatData(), symbolTableOffset, symbolCount,
+			symbolEntrySize):
 
-		# DT_RELA
-		if relaOffset is not None:
-			if relaSize is None:
-				raise ValueError('DT_RELA present but DT_RELASZ not.')
+			tempSymbol = self._dynamicSymbolFromEntry(symbolEntry,
+				stringTable)
 
-			if relaEntrySize is None:
-				raise ValueError('DT_RELA present but DT_RELAENT not.')
+			# add entry to dynamic symbol entries list
+			dynamicSymbolEntries.append(tempSymbol)
 
-			self.relocationEntries = list()
-			relocTODO.append((D_tag.DT_RELA, relaOffset, relaSize,
-				self.relocationEntries))
+		self._dynamicSymbolEntries = dynamicSymbolEntries
+		self._setUnmodifiedTable("dynamicSymbolEntries",
+			dynamicSymbolEntries)
 
-		if relOffset is not None and relaOffset is not None:
-			raise RuntimeError('INTERNAL ERROR: TODO REL READ 1')
 
-		if len(relocTODO) < 1:
-			raise RuntimeError('INTERNAL ERROR: TODO REL READ 2')
+	# this function builds a columnar view of the dynamic symbol table
+	# directly from the data at DT_SYMTAB (without creating an object
+	# per symbol)
+	# return values: (SymbolTable) dynamic symbol table
+	def getDynamicSymbolTable(self, useNumpy=False):
 
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
 
-		for relocType, relocOffset, relocSize, relocList in relocTODO:
-			if relocType == D_tag.DT_REL:
-				relocEntrySize = relEntrySize
-			elif relocType == D_tag.DT_RELA:
-				relocEntrySize = relaEntrySize
+		(symbolTableOffset, symbolEntrySize, stringTableOffset,
+			stringTableSize) = self._getDynamicSymbolTableLocation()
 
-			if relocType == D_tag.DT_REL:
-				if self.bits == 32:
-					structFmt = '<II'
-				elif self.bits == 64:
-					structFmt = '<QQ'
+		symbolCount = self._getDynamicSymbolCount(symbolTableOffset,
+			symbolEntrySize, stringTableOffset)
+
+		symbolData = self._getFlatData()
+		# data read on demand => read only the symbol table
+		if isinstance(symbolData, FileData):
+			symbolData = symbolData[symbolTableOffset:symbolTableOffset
+				+ (symbolCount*symbolEntrySize)]
+			symbolTableOffset = 0
+
+		return SymbolTable(symbolData, symbolTableOffset, symbolCount,
+			symbolEntrySize, self.bits, self._getDynamicStringTable(),
+			useNumpy)
+
+
+	# this function builds a columnar view of the static symbol table
+	# (first SHT_SYMTAB section) without creating an object per symbol,
+	# the names are decoded on request from a view of the string table
+	# section given by sh_link (not copied, the table keeps the current
+	# file data alive)
+	# return values: (SymbolTable) static symbol table (None if the file
+	# has no SHT_SYMTAB section, for example a stripped file)
+	def getStaticSymbolTable(self, useNumpy=False):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		return self._getStaticSymbolTable(useNumpy)
+
+
+	# this function builds a columnar view of the static symbol table
+	# return values: (SymbolTable) static symbol table (None if the file
+	# has no SHT_SYMTAB section)
+	def _getStaticSymbolTable(self, useNumpy):
+
+		symbolSection = None
+		for section in self.sections:
+			if section.elfN_shdr.sh_type == SH_type.SHT_SYMTAB:
+				symbolSection = section
+				break
+		if symbolSection is None:
+			return None
+
+		symbolShdr = symbolSection.elfN_shdr
+		if (symbolShdr.sh_link >= len(self.sections)
+			or self.sections[symbolShdr.sh_link].elfN_shdr.sh_type
+			!= SH_type.SHT_STRTAB):
+			raise ValueError("String table of the static symbol table " \
+				+ "(sh_link %d) is not valid." % symbolShdr.sh_link)
+		stringShdr = self.sections[symbolShdr.sh_link].elfN_shdr
+
+		symbolEntrySize = symbolShdr.sh_entsize
+		if symbolEntrySize == 0:
+			symbolEntrySize = self.layout.sym.size
+		if symbolEntrySize < self.layout.sym.size:
+			raise ValueError("Static symbol table entries are too small.")
+
+		data = self._getFlatData()
+		symbolTableOffset = symbolShdr.sh_offset
+		symbolCount = symbolShdr.sh_size // symbolEntrySize
+		if symbolTableOffset + (symbolCount*symbolEntrySize) > len(data):
+			print 'WARNING: Static symbol table exceeds the file data. ' \
+				+ 'Ignoring entries behind the end of the data.'
+			symbolCount = max(0, len(data) - symbolTableOffset) \
+				// symbolEntrySize
+
+		stringTable = StringTable(data, stringShdr.sh_offset,
+			stringShdr.sh_size)
+
+		# data read on demand => read only the symbol table
+		if isinstance(data, FileData):
+			data = data[symbolTableOffset:symbolTableOffset
+				+ (symbolCount*symbolEntrySize)]
+			symbolTableOffset = 0
+
+		return SymbolTable(data, symbolTableOffset, symbolCount,
+			symbolEntrySize, self.bits, stringTable, useNumpy)
+
+
+	# this function gets the names of the libraries needed by the file
+	# (DT_NEEDED entries of the dynamic segment)
+	# return values: (list) names of the needed libraries
+	def getNeededLibraries(self):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		neededEntries = [entry for entry in self.dynamicSegmentEntries
+			if entry.d_tag == D_tag.DT_NEEDED]
+		if not neededEntries:
+			return list()
+
+		(_, _, stringTableOffset, stringTableSize) = \
+			self._getDynamicSymbolTableLocation()
+
+		neededLibraries = list()
+		nMaxEnd = stringTableOffset + stringTableSize
+		for entry in neededEntries:
+			nStart = stringTableOffset + entry.d_un
+			nEnd = findData(self.data, '\x00', nStart, nMaxEnd)
+			if nEnd == -1:
+				nEnd = nMaxEnd
+			neededLibraries.append(bytes(self.data[nStart:nEnd]))
+
+		return neededLibraries
+
+
+	# this function parses the jump relocation entries and
+	# the relocation entries
+	# return values: None
+	def _parseRelocationTables(self):
+
+		# tables of a cached parse result => nothing to parse
+		if ("jumpRelocationEntries" in self._parseResultTables
+			or "relocationEntries" in self._parseResultTables):
+			if self._jumpRelocationEntries is None:
+				self._createTableFromParseResult("jumpRelocationEntries")
+			if self._relocationEntries is None:
+				self._createTableFromParseResult("relocationEntries")
+			return
+
+		###############################################
+		# parse relocation entries
+
+		# search for relocation entries in dynamic segment entries
+		jmpRelOffset = None
+		pltRelSize = None
+		pltRelType = None
+		relEntrySize = None
+		relOffset = None
+		relSize = None
+		relaEntrySize = None
+		relaOffset = None
+		relaSize = None
+		for dynEntry in self.dynamicSegmentEntries:
+			if dynEntry.d_tag == D_tag.DT_JMPREL:
+				if jmpRelOffset is not None:
+					raise ValueError("Can't handle multiple DT_JMPREL")
+				jmpRelOffset = self.virtualMemoryAddrToFileOffset(dynEntry.d_un)
+				continue
+			if dynEntry.d_tag == D_tag.DT_PLTRELSZ:
+				pltRelSize = dynEntry.d_un
+				continue
+			if dynEntry.d_tag == D_tag.DT_PLTREL:
+				pltRelType = dynEntry.d_un
+				continue
+			if dynEntry.d_tag == D_tag.DT_RELENT:
+				if relEntrySize is not None:
+					raise ValueError("Can't handle multiple DT_RELENT")
+				relEntrySize = dynEntry.d_un
+				continue
+			if dynEntry.d_tag == D_tag.DT_RELAENT:
+				if relaEntrySize is not None:
+					raise ValueError("Can't handle multiple DT_RELAENT")
+				relaEntrySize = dynEntry.d_un
+				continue
+			if dynEntry.d_tag == D_tag.DT_REL:
+				if relOffset is not None:
+					raise ValueError("Can't handle multiple DT_REL")
+				relOffset = self.virtualMemoryAddrToFileOffset(dynEntry.d_un)
+				continue
+			if dynEntry.d_tag == D_tag.DT_RELA:
+				if relaOffset is not None:
+					raise ValueError("Can't handle multiple DT_RELA")
+				relaOffset = self.virtualMemoryAddrToFileOffset(dynEntry.d_un)
+				continue
+			if dynEntry.d_tag == D_tag.DT_RELSZ:
+				relSize = dynEntry.d_un
+				continue
+			if dynEntry.d_tag == D_tag.DT_RELASZ:
+				relaSize = dynEntry.d_un
+				continue
+
+		(symbolTableOffset, symbolEntrySize, _, _) = \
+			self._getDynamicSymbolTableLocation()
+		stringTable = self._getDynamicStringTable()
+
+		# create lists for the jump relocation entries and
+		# the relocation entries
+		jumpRelocationEntries = list()
+		relocationEntries = list()
+
+		# relocations reference their symbol by its index in the
+		# dynamic symbol table
+		# => symbols that were not parsed as dynamic symbols are
+		# cached by their index
+		dynamicSymbolEntries = self.dynamicSymbolEntries
+		otherSymbols = dict()
+
+		# holds tuples: (type, offset, size, targetlist)
+		relocTODO = []
+
+		# DT_JMPREL
+		if jmpRelOffset is not None:
+			if pltRelType is None:
+				raise ValueError('DT_JMPREL present but DT_PLTREL not.')
+			if pltRelSize is None:
+				raise ValueError('DT_JMPREL present but DT_PLTRELSZ not.')
+
+			if pltRelType == D_tag.DT_REL:
+				if relEntrySize is None:
+					raise ValueError('DT_JMPREL present with ' \
+							+ ' DT_PLTREL == DT_REL, but DT_RELSZ not present')
+			elif pltRelType == D_tag.DT_RELA:
+				if relaEntrySize is None:
+					raise ValueError('DT_JMPREL present with ' \
+							+ ' DT_PLTREL == DT_RELA, but DT_RELASZ not present')
+			else:
+				raise ValueError('Invalid/unexpected DT_PLTREL (pltRelType).')
+
+			relocTODO.append((pltRelType, jmpRelOffset, pltRelSize,
+				jumpRelocationEntries))
+
+		# DT_REL (only mandatory hwn DT_RELA is not present)
+		if relOffset is not None:
+			if relSize is None:
+				raise ValueError('DT_REL present but DT_RELSZ not.')
+
+			if relEntrySize is None:
+				raise ValueError('DT_REL present but DT_RELENT not.')
+
+			relocTODO.append((D_tag.DT_REL, relOffset, relSize,
+				relocationEntries))
+
+		# DT_RELA
+		if relaOffset is not None:
+			if relaSize is None:
+				raise ValueError('DT_RELA present but DT_RELASZ not.')
+
+			if relaEntrySize is None:
+				raise ValueError('DT_RELA present but DT_RELAENT not.')
+
+			relocTODO.append((D_tag.DT_RELA, relaOffset, relaSize,
+				relocationEntries))
+
+		if relOffset is not None and relaOffset is not None:
+			raise RuntimeError('INTERNAL ERROR: TODO REL READ 1')
+
+		if len(relocTODO) < 1:
+			raise RuntimeError('INTERNAL ERROR: TODO REL READ 2')
+
+
+		for relocType, relocOffset, relocSize, relocList in relocTODO:
+			if relocType == D_tag.DT_REL:
+				relocEntrySize = relEntrySize
 			elif relocType == D_tag.DT_RELA:
-				if self.bits == 32:
-					structFmt = '<IIi'
-				elif self.bits == 64:
-					structFmt = '<QQq'
+				relocEntrySize = relaEntrySize
 
-			assert struct.calcsize(structFmt) == relocEntrySize
+			# fields of ElfN_Rel:
+			# ElfN_Addr     r_offset;    (N = 32/64)
+			# in executable and share object files
+			# => r_offset holds a virtual address
+			# ElfN_Word     r_info;      (N = 32/64)
+			# (ElfN_Rela additionally: r_addend)
+			if relocType == D_tag.DT_REL:
+				relocLayout = self.layout.rel
+				createRelocEntry = _createRel
+			elif relocType == D_tag.DT_RELA:
+				relocLayout = self.layout.rela
+				createRelocEntry = _createRela
 
-			for i in range(relocSize / relocEntrySize):
-				tempOffset = relocOffset + i*relocEntrySize
+			assert relocLayout.size == relocEntrySize
 
-				if relocType == D_tag.DT_REL:
-					relocEntry = ElfN_Rel()
-					(
-						# ElfN_Addr     r_offset;    (N = 32/64)
-						# in executable and share object files
-						# => r_offset holds a virtual address
-						relocEntry.r_offset,
-
-						# ElfN_Word     r_info;      (N = 32/64)
-						relocEntry.r_info,
-					) = struct.unpack(structFmt, self.data[tempOffset:tempOffset+relocEntrySize])
-				elif relocType == D_tag.DT_RELA:
-					relocEntry = ElfN_Rela()
-					(
-						# ElfN_Addr     r_offset;    (N = 32/64)
-						# in executable and share object files
-						# => r_offset holds a virtual address
-						relocEntry.r_offset,
-
-						# ElfN_Word     r_info;      (N = 32/64)
-						relocEntry.r_info,
-
-						relocEntry.r_addend,
-					) = struct.unpack(structFmt, self.data[tempOffset:tempOffset+relocEntrySize])
-
-				del tempOffset
-
-				(relocEntry.r_sym, relocEntry.r_type) = \
-						self.relocationSymIdxAndTypeFromInfo(relocEntry.r_info)
-
-				# get values from the symbol table
-				tempOffset = symbolTableOffset \
-					+ (relocEntry.r_sym*symbolEntrySize)
-				tempSymbol = self._parseDynamicSymbol(tempOffset,
-					stringTableOffset, stringTableSize)
-
-				# check if parsed dynamic symbol already exists
-				# if it does => use already existed dynamic symbol
-				# else => use newly parsed dynamic symbol
-				dynamicSymbolFound = False
-				for dynamicSymbol in self.dynamicSymbolEntries:
-					if (tempSymbol.ElfN_Sym.st_name
-						== dynamicSymbol.ElfN_Sym.st_name
-						and tempSymbol.ElfN_Sym.st_value
-						== dynamicSymbol.ElfN_Sym.st_value
-						and tempSymbol.ElfN_Sym.st_size
-						== dynamicSymbol.ElfN_Sym.st_size
-						and tempSymbol.ElfN_Sym.st_info
-						== dynamicSymbol.ElfN_Sym.st_info
-						and tempSymbol.ElfN_Sym.st_other
-						== dynamicSymbol.ElfN_Sym.st_other
-						and tempSymbol.ElfN_Sym.st_shndx
-						== dynamicSymbol.ElfN_Sym.st_shndx):
-						relocEntry.symbol = dynamicSymbol
-						dynamicSymbolFound = True
-						break
-				if dynamicSymbolFound is False:
-					relocEntry.symbol = tempSymbol
+			for unpackedReloc in iterUnpackFrom(relocLayout,
+				self._getFlatData(), relocOffset, relocSize / relocEntrySize):
+
+				(rSym, rType) = \
+						self.relocationSymIdxAndTypeFromInfo(unpackedReloc[1])
+
+				# symbol index lies within the parsed dynamic symbols
+				# => use already existing dynamic symbol
+				if rSym < len(dynamicSymbolEntries):
+					tempSymbol = dynamicSymbolEntries[rSym]
+
+				# symbol index lies outside of the parsed dynamic symbols
+				# => parse symbol from the symbol table (only once per index)
+				else:
+					tempSymbol = otherSymbols.get(rSym)
+					if tempSymbol is None:
+						tempOffset = symbolTableOffset \
+							+ (rSym*symbolEntrySize)
+						tempSymbol = self._parseDynamicSymbol(tempOffset,
+							stringTable)
+						otherSymbols[rSym] = tempSymbol
+
+				relocEntry = createRelocEntry(unpackedReloc
+					+ (rSym, rType, tempSymbol))
 
 				relocList.append(relocEntry)
 
+		# do not overwrite a list that was set in the meantime
+		if self._jumpRelocationEntries is None:
+			self._jumpRelocationEntries = jumpRelocationEntries
+			self._setUnmodifiedTable("jumpRelocationEntries",
+				jumpRelocationEntries)
+		if self._relocationEntries is None:
+			self._relocationEntries = relocationEntries
+			self._setUnmodifiedTable("relocationEntries",
+				relocationEntries)
+
+
 
 	# this function dumps a list of relocations (used in printElf())
 	# return values: None
@@ -1542,7 +2448,7 @@ class ElfParser(object):
 			if entry.d_tag == D_tag.DT_NEEDED:
 				nStart = stringTableOffset + entry.d_un
 				nMaxEnd = stringTableOffset + stringTableSize
-				nEnd = self.data.find('\x00', nStart, nMaxEnd)
+				nEnd = findData(self.data, '\x00', nStart, nMaxEnd)
 				nEnd = max(nStart, nEnd)
 				temp = bytes(self.data[nStart:nEnd])
 				print "Name/Value: 0x%x (%d) (%s)" \
@@ -1585,57 +2491,54 @@ class ElfParser(object):
 			counter += 1
 
 
-	# this function generates a new ELF file from the attributes of the object
-	# return values: (list) generated ELF file data
-	def generateElf(self):
+	# this function re-generates all regions of the ELF file that are
+	# written back from the attributes of the object
+	# (every region is yielded as soon as it is generated in order to
+	# allow the caller to stop early, "onlyModified=True" skips the
+	# regions whose records were not changed)
+	# return values: (generator) tuples (str) name of region,
+	# (int) offset in file, (bytearray) data of region
+	def _generateRegions(self, onlyModified=False):
 
-		# check if the file was completely parsed before
-		if self.fileParsed is False:
-			raise ValueError("Operation not possible. " \
-				+ "File was not completely parsed before.")
-
-		# copy binary data to new list
-		newfile = self.data[:]
+		if onlyModified is True:
+			regions = self._getModifiedRegions()
+		else:
+			# hash tables are only rebuilt when they do not describe the
+			# dynamic symbols anymore (a rebuilt table does not have to
+			# match the table of the linker)
+			regions = set(_regionNames)
+			regions.discard("hash tables")
 
 		# ------
 
-		# get position of section header table
-		writePosition = self.header.e_shoff
-
-		# fill list with null until writePosition is reached
-		if len(newfile) < writePosition:
-			newfile.extend(bytearray(writePosition - len(newfile)))
-
 		# write section header table back
-		for section in self.sections:
-			temp = self.sectionHeaderEntryToBytearray(section.elfN_shdr)
-			newfile[writePosition:writePosition+len(temp)] = temp
-			writePosition += len(temp)
+		if "section header table" in regions:
+			regionData = bytearray()
+			for section in self.sections:
+				regionData += self.sectionHeaderEntryToBytearray(
+					section.elfN_shdr)
+			if regionData:
+				yield ("section header table", self.header.e_shoff,
+					regionData)
 
 		# ------
 
 		# when defined => write string table back
-		if self.header.e_shstrndx != Shstrndx.SHN_UNDEF:
+		if (self.header.e_shstrndx != Shstrndx.SHN_UNDEF
+			and "section names" in regions):
 			for section in self.sections:
 				# calculate the position on which the name should be written
 				writePosition = \
 					self.sections[self.header.e_shstrndx].elfN_shdr.sh_offset \
 					+ section.elfN_shdr.sh_name
 
-				# fill list with null until writePosition is reached
-				if len(newfile) < writePosition:
-					newfile.extend(bytearray(writePosition - len(newfile)))
-
 				# write name of all sections into string table
-				data = bytearray(section.sectionName) + b'\x00'
-				newfile[writePosition:writePosition+len(data)] = data
-				writePosition += len(data)
+				yield ("section names", writePosition,
+					bytearray(section.sectionName) + b'\x00')
 
 		# ------
 
 		# write ELF header back
-		newfile[0:len(self.header.e_ident)] = self.header.e_ident
-
 		headerFields = (
 			# uint16_t      e_type;
 			self.header.e_type,
@@ -1665,78 +2568,69 @@ class ElfParser(object):
 			self.header.e_shstrndx
 		)
 
-		if self.bits == 32:
-			newfile[16:52] = struct.pack('< 2H I 3I I 6H', *headerFields)
-		elif self.bits == 64:
-			newfile[16:64] = struct.pack('< 2H I 3Q I 6H', *headerFields)
+		regionData = bytearray(self.header.e_ident)
+		regionData += self.layout.ehdr.pack(*headerFields)
+		yield ("header", 0, regionData)
 
 		# ------
 
 		# write programm header table back
-		for i in range(len(self.segments)):
-
-			# add placeholder bytes to new file when the bytes do not already
-			# exist in the new file until size of header entry fits
-			requiredSize = self.header.e_phoff + ((i+1) * self.header.e_phentsize)
-			if len(newfile) < requiredSize:
-				newfile.extend(bytearray(requiredSize - len(newfile)))
+		'''
+		typedef struct {
+			uint32_t   p_type;
+			Elf32_Off  p_offset;
+			Elf32_Addr p_vaddr;
+			Elf32_Addr p_paddr;
+			uint32_t   p_filesz;
+			uint32_t   p_memsz;
+			uint32_t   p_flags;   // *
+			uint32_t   p_align;
+		} Elf32_Phdr;
 
-			tempOffset = self.header.e_phoff + i*self.header.e_phentsize
-			'''
-			typedef struct {
-				uint32_t   p_type;
-				Elf32_Off  p_offset;
-				Elf32_Addr p_vaddr;
-				Elf32_Addr p_paddr;
-				uint32_t   p_filesz;
-				uint32_t   p_memsz;
-				uint32_t   p_flags;   // *
-				uint32_t   p_align;
-			} Elf32_Phdr;
-
-			typedef struct {
-				uint32_t   p_type;
-				uint32_t   p_flags;   // *
-				Elf64_Off  p_offset;
-				Elf64_Addr p_vaddr;
-				Elf64_Addr p_paddr;
-				uint64_t   p_filesz;
-				uint64_t   p_memsz;
-				uint64_t   p_align;
-			} Elf64_Phdr;
-
-			The main difference lies in the location of p_flags within the struct.
-			'''
-			if self.bits == 32:
-				fmt = '< I 5I I I'
-				fmtSize = struct.calcsize(fmt)
-				assert self.header.e_phentsize == fmtSize
-				newfile[tempOffset:tempOffset+fmtSize] = struct.pack(fmt,
-					self.segments[i].elfN_Phdr.p_type,
-					self.segments[i].elfN_Phdr.p_offset,
-					self.segments[i].elfN_Phdr.p_vaddr,
-					self.segments[i].elfN_Phdr.p_paddr,
-					self.segments[i].elfN_Phdr.p_filesz,
-					self.segments[i].elfN_Phdr.p_memsz,
-					self.segments[i].elfN_Phdr.p_flags,     # <- p_flags
-					self.segments[i].elfN_Phdr.p_align,
-				)
-			elif self.bits == 64:
-				fmt = '< I I 5Q Q'
-				fmtSize = struct.calcsize(fmt)
-				assert self.header.e_phentsize == fmtSize
-				newfile[tempOffset:tempOffset+fmtSize] = struct.pack(fmt,
-					self.segments[i].elfN_Phdr.p_type,
-					self.segments[i].elfN_Phdr.p_flags,     # <- p_flags
-					self.segments[i].elfN_Phdr.p_offset,
-					self.segments[i].elfN_Phdr.p_vaddr,
-					self.segments[i].elfN_Phdr.p_paddr,
-					self.segments[i].elfN_Phdr.p_filesz,
-					self.segments[i].elfN_Phdr.p_memsz,
-					self.segments[i].elfN_Phdr.p_align,
-				)
-			del tempOffset
+		typedef struct {
+			uint32_t   p_type;
+			uint32_t   p_flags;   // *
+			Elf64_Off  p_offset;
+			Elf64_Addr p_vaddr;
+			Elf64_Addr p_paddr;
+			uint64_t   p_filesz;
+			uint64_t   p_memsz;
+			uint64_t   p_align;
+		} Elf64_Phdr;
 
+		The main difference lies in the location of p_flags within the struct.
+		'''
+		assert len(self.segments) == 0 \
+			or self.header.e_phentsize == self.layout.phdr.size
+		if "program header table" in regions:
+			phdrPack = self.layout.phdr.pack
+			regionData = bytearray()
+			for segment in self.segments:
+				if self.bits == 32:
+					regionData += phdrPack(
+						segment.elfN_Phdr.p_type,
+						segment.elfN_Phdr.p_offset,
+						segment.elfN_Phdr.p_vaddr,
+						segment.elfN_Phdr.p_paddr,
+						segment.elfN_Phdr.p_filesz,
+						segment.elfN_Phdr.p_memsz,
+						segment.elfN_Phdr.p_flags,     # <- p_flags
+						segment.elfN_Phdr.p_align,
+					)
+				elif self.bits == 64:
+					regionData += phdrPack(
+						segment.elfN_Phdr.p_type,
+						segment.elfN_Phdr.p_flags,     # <- p_flags
+						segment.elfN_Phdr.p_offset,
+						segment.elfN_Phdr.p_vaddr,
+						segment.elfN_Phdr.p_paddr,
+						segment.elfN_Phdr.p_filesz,
+						segment.elfN_Phdr.p_memsz,
+						segment.elfN_Phdr.p_align,
+					)
+			if regionData:
+				yield ("program header table", self.header.e_phoff,
+					regionData)
 
 		# ------
 
@@ -1749,38 +2643,42 @@ class ElfParser(object):
 		if dynamicSegment is None:
 			raise ValueError("Segment of type PT_DYNAMIC was not found.")
 
-		if self.bits == 32:
-			structFmt = '<II'
-		elif self.bits == 64:
-			structFmt = '<QQ'
+		# write all dynamic segment entries back
+		if "dynamic segment" in regions:
+			dynPack = self.layout.dyn.pack
+			regionData = bytearray()
+			for dynSegmentEntry in self.dynamicSegmentEntries:
+				regionData += dynPack(
+					# ElfN_Sword    d_tag;
+					dynSegmentEntry.d_tag,
 
-		dynSegEntrySize = struct.calcsize(structFmt)
+					# union {
+					#       ElfN_Word d_val;
+					#       ElfN_Addr d_ptr;
+					# } d_un;
+					dynSegmentEntry.d_un,
+				)
 
-		# write all dynamic segment entries back
-		for i in range(len(self.dynamicSegmentEntries)):
-
-			tempOffset = dynamicSegment.elfN_Phdr.p_offset + i*dynSegEntrySize
-			newfile[tempOffset:tempOffset+dynSegEntrySize] = struct.pack(structFmt,
-				# ElfN_Sword    d_tag;
-				self.dynamicSegmentEntries[i].d_tag,
-
-				# union {
-				#       ElfN_Word d_val;
-				#       ElfN_Addr d_ptr;
-				# } d_un;
-				self.dynamicSegmentEntries[i].d_un,
-			)
-			del tempOffset
-
-		# overwrite rest of segment with 0x00 (default padding data)
-		# (NOTE: works in all test cases, but can cause md5 parsing
-		# check to fail!)
-		tmpStart = dynamicSegment.elfN_Phdr.p_offset \
-				+ len(self.dynamicSegmentEntries) * dynSegEntrySize
-		tmpEnd = dynamicSegment.elfN_Phdr.p_offset \
-				+ dynamicSegment.elfN_Phdr.p_filesz
-		if tmpStart < tmpEnd:
-			newfile[tmpStart:tmpEnd] = bytearray(tmpEnd - tmpStart)
+			# overwrite rest of segment with 0x00 (default padding data)
+			# (NOTE: works in all test cases, but can cause md5 parsing
+			# check to fail!)
+			if len(regionData) < dynamicSegment.elfN_Phdr.p_filesz:
+				regionData += bytearray(
+					dynamicSegment.elfN_Phdr.p_filesz - len(regionData))
+			yield ("dynamic segment", dynamicSegment.elfN_Phdr.p_offset,
+				regionData)
+
+		# ------
+
+		# rebuild the hash tables that do not describe the dynamic
+		# symbols anymore
+		if "hash tables" in regions:
+			for hashTableOffset, regionData in self._rebuildHashTables():
+				yield ("hash tables", hashTableOffset, regionData)
+
+		# the remaining regions are located with the dynamic segment entries
+		if "dynamic symbols" not in regions and "relocations" not in regions:
+			return
 
 		# ------
 
@@ -1845,11 +2743,33 @@ class ElfParser(object):
 
 		# write dynamic symbols back to dynamic symbol table
 		# (if the dynamic symbol table could be parsed)
-		for i in range(len(self.dynamicSymbolEntries)):
-			if symbolTableOffset is not None:
-				self._writeDynamicSymbol(newfile,
-						symbolTableOffset + i * symbolEntrySize,
+		if symbolTableOffset is not None and "dynamic symbols" in regions:
+			if self.bits == 32:
+				symbolSize = 16
+			elif self.bits == 64:
+				symbolSize = 24
+
+			# symbols lie directly behind each other
+			# => write all of them as one region
+			if symbolEntrySize == symbolSize:
+				regionData = bytearray(len(self.dynamicSymbolEntries) \
+					* symbolSize)
+				for i in range(len(self.dynamicSymbolEntries)):
+					self._writeDynamicSymbol(regionData, i * symbolSize,
 						self.dynamicSymbolEntries[i].ElfN_Sym)
+				if regionData:
+					yield ("dynamic symbols", symbolTableOffset, regionData)
+
+			else:
+				for i in range(len(self.dynamicSymbolEntries)):
+					regionData = bytearray(symbolSize)
+					self._writeDynamicSymbol(regionData, 0,
+						self.dynamicSymbolEntries[i].ElfN_Sym)
+					yield ("dynamic symbols",
+						symbolTableOffset + i * symbolEntrySize, regionData)
+
+		if "relocations" not in regions:
+			return
 
 		# for fast lookups
 		dynSymSet = set(self.dynamicSymbolEntries)
@@ -1886,52 +2806,134 @@ class ElfParser(object):
 				relocEntrySize = relaEntrySize
 
 			if relocType == D_tag.DT_REL:
-				if self.bits == 32:
-					structFmt = '<II'
-				elif self.bits == 64:
-					structFmt = '<QQ'
+				relocLayout = self.layout.rel
 			elif relocType == D_tag.DT_RELA:
-				if self.bits == 32:
-					structFmt = '<IIi'
-				elif self.bits == 64:
-					structFmt = '<QQq'
+				relocLayout = self.layout.rela
 
-			assert struct.calcsize(structFmt) == relocEntrySize
-
-			for i, relocEntry in enumerate(relocList):
-				tempOffset = relocOffset + (i*relocEntrySize)
+			assert relocLayout.size == relocEntrySize
 
+			regionData = bytearray()
+			for relocEntry in relocList:
 				if relocType == D_tag.DT_REL:
-					newfile[tempOffset:tempOffset+relocEntrySize] = struct.pack(
-							structFmt,
+					regionData += relocLayout.pack(
 							relocEntry.r_offset,
 							relocEntry.r_info,
 					)
 				elif relocType == D_tag.DT_RELA:
-					newfile[tempOffset:tempOffset+relocEntrySize] = struct.pack(
-							structFmt,
+					regionData += relocLayout.pack(
 							relocEntry.r_offset,
 							relocEntry.r_info,
 							relocEntry.r_addend,
 					)
+			if regionData:
+				yield ("relocations", relocOffset, regionData)
 
-				del tempOffset
-
-				# check if dynamic symbol was already written
-				# when writing all dynamic symbol entries back
-				# if not => write dynamic symbol back
+			# check if dynamic symbol was already written
+			# when writing all dynamic symbol entries back
+			# if not => write dynamic symbol back
+			for relocEntry in relocList:
 				dynSym = relocEntry.symbol
 				if (dynSym not in dynSymSet and symbolTableOffset is not None):
-					self._writeDynamicSymbol(newfile, symbolTableOffset \
-							+ relocEntry.r_sym * symbolEntrySize,
-							dynSym.ElfN_Sym)
+					regionData = bytearray(symbolSize)
+					self._writeDynamicSymbol(regionData, 0, dynSym.ElfN_Sym)
+					yield ("dynamic symbols", symbolTableOffset \
+							+ relocEntry.r_sym * symbolEntrySize, regionData)
 
-		# ------
+
+	# this function generates a new ELF file from the attributes of the object
+	# return values: (list) generated ELF file data
+	def generateElf(self):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		# the regions whose records were not changed are already
+		# contained in the data
+		return self._buildElf(onlyModified=True)
+
+
+	# this function writes the re-generated regions into a copy of the
+	# data ("onlyModified=False" re-generates every region, used by the
+	# full verification to check the parsed records against the data)
+	# return values: (bytearray) generated ELF file data
+	def _buildElf(self, onlyModified):
+
+		# copy binary data to new list
+		newfile = bytearray(self._getBufferData())
+
+		# write all re-generated regions into the copy
+		for _, writePosition, regionData in self._generateRegions(
+			onlyModified):
+
+			# fill list with null until writePosition is reached
+			if len(newfile) < writePosition:
+				newfile.extend(bytearray(writePosition - len(newfile)))
+
+			newfile[writePosition:writePosition+len(regionData)] = regionData
 
 		return newfile
 
 
-	# this function writes the generated ELF file back
+	# this function checks if the parsed ELF file can be re-generated
+	# correctly with the given verification mode (default:
+	# VerificationMode.FULL)
+	# return values: (VerificationStats) statistics of the verification
+	def verifyElf(self, mode=None):
+		if mode is None:
+			mode = VerificationMode.FULL
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		stats = VerificationStats(mode)
+
+		# compare only the re-generated regions with the parsed data
+		# (stop at the first region that differs)
+		if mode == VerificationMode.CHEAP:
+			for regionName, offset, regionData in self._generateRegions():
+				if regionName not in stats.regionsChecked:
+					stats.regionsChecked.append(regionName)
+				stats.bytesChecked += len(regionData)
+
+				if (offset + len(regionData) > len(self.data)
+					or self.data[offset:offset+len(regionData)] != regionData):
+					stats.mismatchedRegion = regionName
+					stats.mismatchedOffset = offset
+					break
+
+		# compare the md5 hashes of the parsed and the re-generated file
+		elif mode == VerificationMode.FULL:
+			# generate md5 hash of file that was parsed
+			tempHash = hashlib.md5()
+			tempHash.update(self._getBufferData())
+			oldFileHash = tempHash.digest()
+
+			# generate md5 hash of file that was newly generated
+			# (from every region, not only from the modified ones)
+			tempHash = hashlib.md5()
+			tempHash.update(self._buildElf(onlyModified=False))
+			newFileHash = tempHash.digest()
+
+			stats.regionsChecked.append("file")
+			stats.bytesChecked = len(self.data)
+			if oldFileHash != newFileHash:
+				stats.mismatchedRegion = "file"
+
+		elif mode != VerificationMode.OFF:
+			raise TypeError('"mode" uses an invalid value.')
+
+		self.verificationStats = stats
+		return stats
+
+
+	# this function writes the generated ELF file back (region by region,
+	# without creating a copy of the file in memory) to the given file
+	# name or writable file object (a file name is written to a temporary
+	# file first that replaces the file atomically when it is complete)
 	# return values: None
 	def writeElf(self, filename):
 
@@ -1940,9 +2942,229 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
-		f = open(filename, "w")
-		f.write(self.generateElf())
-		f.close()
+		# write to given file object
+		if hasattr(filename, "write"):
+			self._writeElfToFile(filename)
+			return
+
+		# replace the target of a symbolic link and not the link itself
+		path = os.path.realpath(filename)
+
+		# keep the permissions of a replaced file
+		# (the temporary file is only accessible by its owner)
+		if os.path.exists(path):
+			mode = stat.S_IMODE(os.stat(path).st_mode)
+		else:
+			umask = os.umask(0)
+			os.umask(umask)
+			mode = 0666 & ~umask
+
+		(fd, tempPath) = tempfile.mkstemp(dir=os.path.dirname(path),
+			prefix="." + os.path.basename(path) + ".")
+		try:
+			f = os.fdopen(fd, "wb")
+			try:
+				self._writeElfToFile(f)
+				f.flush()
+				os.fsync(f.fileno())
+			finally:
+				f.close()
+			os.chmod(tempPath, mode)
+
+			# atomic on POSIX systems (a memory mapped original file
+			# stays valid)
+			os.rename(tempPath, path)
+		except:
+			os.remove(tempPath)
+			raise
+
+
+	# this function writes the modifications back into the parsed file
+	# itself (only the modified byte ranges are written, the size of the
+	# file must not have changed, otherwise use writeElf())
+	# return values: (list) tuples (int) start, (int) end of the written
+	# ranges of the data
+	def commitInPlace(self):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		if self.filename is None:
+			raise ValueError("Data was not read from a named file. " \
+				+ "Use writeElf() instead.")
+
+		# modified bytes are only known for the piece table
+		# (self.data was replaced by the user)
+		if not isinstance(self.data, PieceTable):
+			raise ValueError("Data was replaced, modified byte ranges " \
+				+ "are unknown. Use writeElf() instead.")
+
+		if len(self.data) != self._unmodifiedDataLength:
+			raise ValueError("Size of the file changed (%d to %d bytes). " \
+				% (self._unmodifiedDataLength, len(self.data)) \
+				+ "Use writeElf() instead.")
+
+		patches = self._getRegionPatches()
+		if patches and patches[-1][1] > len(self.data):
+			raise ValueError("Re-generated tables do not fit into the " \
+				+ "file. Use writeElf() instead.")
+
+		# byte ranges of the data that were modified
+		dirtyIntervals = IntervalSet()
+		for start, end in self.data.dirtyIntervals:
+			dirtyIntervals.add(start, end)
+
+		# re-generated regions only have to be written where they differ
+		# from the data (compared block by block, only the bytes from the
+		# first to the last differing one of a block are written)
+		blockSize = 4096
+		for (patchStart, patchEnd, regionData, regionOffset) in patches:
+			for blockStart in xrange(patchStart, patchEnd, blockSize):
+				blockEnd = min(blockStart + blockSize, patchEnd)
+				newBlock = regionData[blockStart - regionOffset
+					:blockEnd - regionOffset]
+				oldBlock = bytearray(self.data[blockStart:blockEnd])
+				if newBlock == oldBlock:
+					continue
+
+				first = 0
+				while newBlock[first] == oldBlock[first]:
+					first += 1
+				last = len(newBlock)
+				while newBlock[last - 1] == oldBlock[last - 1]:
+					last -= 1
+				dirtyIntervals.add(blockStart + first, blockStart + last)
+
+		# create the new content of all ranges before the first one is
+		# written (pieces of a memory mapped file would show the new data)
+		patchStarts = [patch[0] for patch in patches]
+		newContents = list()
+		for start, end in dirtyIntervals:
+			content = bytearray(self.data[start:end])
+
+			i = max(0, bisect.bisect_right(patchStarts, start) - 1)
+			while i < len(patches) and patches[i][0] < end:
+				(patchStart, patchEnd, regionData, regionOffset) = patches[i]
+				overlapStart = max(start, patchStart)
+				overlapEnd = min(end, patchEnd)
+				if overlapStart < overlapEnd:
+					content[overlapStart - start:overlapEnd - start] = \
+						regionData[overlapStart - regionOffset
+						:overlapEnd - regionOffset]
+				i += 1
+
+			newContents.append((start, content))
+
+		fd = os.open(self.filename, os.O_WRONLY)
+		try:
+			for start, content in newContents:
+				_writeAt(fd, content, self.startOffset + start)
+			os.fsync(fd)
+		finally:
+			os.close(fd)
+
+		# the data describes the written file
+		for start, content in newContents:
+			self.data[start:start + len(content)] = content
+		self._markUnmodified()
+
+		return list(dirtyIntervals)
+
+
+	# this function writes the generated ELF file to the given file object
+	# (unchanged data is written directly from the parsed data)
+	# return values: None
+	def _writeElfToFile(self, f):
+
+		position = 0
+		for (patchStart, patchEnd, regionData, regionOffset) \
+			in self._getRegionPatches():
+
+			# unchanged data in front of the region
+			if position < patchStart:
+				self._writeDataRange(f, position, patchStart)
+
+			f.write(buffer(regionData, patchStart - regionOffset,
+				patchEnd - patchStart))
+			position = patchEnd
+
+		# unchanged data behind the last region
+		if position < len(self.data):
+			self._writeDataRange(f, position, len(self.data))
+
+
+	# this function writes the given range of the data to the given
+	# file object without copying it (the range behind the end of the
+	# data is filled with null)
+	# return values: None
+	def _writeDataRange(self, f, start, end):
+		dataEnd = min(end, len(self.data))
+
+		if isinstance(self.data, PieceTable):
+			for (pieceBuffer, pieceStart, pieceEnd) \
+				in self.data.iterPieces(start, dataEnd):
+				f.write(_viewData(pieceBuffer, pieceStart, pieceEnd))
+		elif start < dataEnd:
+			f.write(_viewData(self.data, start, dataEnd))
+
+		if end > max(start, dataEnd):
+			f.write(bytearray(end - max(start, dataEnd)))
+
+
+	# this function gets the re-generated regions as non overlapping
+	# patches sorted by their offset (where regions overlap, the region
+	# generated later is used like in generateElf())
+	# return values: (list) tuples (int) start of patch, (int) end of
+	# patch, (bytearray) data of region, (int) offset of region
+	def _getRegionPatches(self):
+
+		regions = [(offset, offset + len(regionData), regionData)
+			for _, offset, regionData
+			in self._generateRegions(onlyModified=True)
+			if regionData]
+
+		# the region covering an interval between two bounds is the last
+		# generated one of all regions containing the interval
+		bounds = sorted(set([region[0] for region in regions]
+			+ [region[1] for region in regions]))
+		regionOrder = sorted(range(len(regions)),
+			key=lambda i: regions[i][0])
+
+		patches = list()
+		activeRegions = list()
+		nextRegion = 0
+		lastIndex = None
+		for intervalStart, intervalEnd in zip(bounds, bounds[1:]):
+
+			# add all regions starting here (heap of the regions
+			# ordered by their generation, last generated first)
+			while (nextRegion < len(regionOrder)
+				and regions[regionOrder[nextRegion]][0] <= intervalStart):
+				heapq.heappush(activeRegions, -regionOrder[nextRegion])
+				nextRegion += 1
+
+			# remove regions that ended
+			while activeRegions \
+				and regions[-activeRegions[0]][1] <= intervalStart:
+				heapq.heappop(activeRegions)
+
+			if not activeRegions:
+				lastIndex = None
+				continue
+
+			index = -activeRegions[0]
+			# extend the patch of the same region
+			if index == lastIndex:
+				patches[-1][1] = intervalEnd
+			else:
+				(regionStart, _, regionData) = regions[index]
+				patches.append([intervalStart, intervalEnd, regionData,
+					regionStart])
+			lastIndex = index
+
+		return patches
 
 
 	# this function appends data to a selected segment number (if it fits)
@@ -1956,6 +3178,12 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
+		# data can be given as bytes, bytearray, memoryview or list of chars
+		data = self._dataToBytearray(data)
+
 		segmentToExtend = self.segments[segmentNumber]
 
 		# find segment that comes directly after the segment
@@ -1976,8 +3204,7 @@ class ElfParser(object):
 				+ segmentToExtend.elfN_Phdr.p_filesz
 
 			# insert data
-			for i in range(len(data)):
-				self.data.insert((newDataOffset + i), data[i])
+			self.data[newDataOffset:newDataOffset] = data
 
 			# adjust offsets of all following section
 			# (for example symbol sections are often behind all segments)
@@ -2059,14 +3286,10 @@ class ElfParser(object):
 			newDataOffset = segmentToExtend.elfN_Phdr.p_offset \
 				+ segmentToExtend.elfN_Phdr.p_filesz
 
-			# insert data
-			for i in range(len(data)):
-				self.data.insert((newDataOffset + i), data[i])
-
-			# fill the rest with 0x00 until the offset addition in the
-			# file is reached
-			for i in range((offsetAddition - len(data))):
-				self.data.insert((newDataOffset + len(data) + i), "\x00")
+			# insert data and fill the rest with 0x00 until the offset
+			# addition in the file is reached
+			self.data[newDataOffset:newDataOffset] = data \
+				+ bytearray(offsetAddition - len(data))
 
 			# extend size of data in file of the modifed segment
 			segmentToExtend.elfN_Phdr.p_filesz += len(data)
@@ -2127,6 +3350,20 @@ class ElfParser(object):
 		return newDataOffset, newDataMemoryAddr
 
 
+	# this function converts data given as bytes, bytearray, memoryview
+	# or list of chars (or ints) into a bytearray
+	# return values: (bytearray) data
+	def _dataToBytearray(self, data):
+		if isinstance(data, bytearray):
+			return data
+		if isinstance(data, memoryview):
+			return bytearray(data.tobytes())
+		if isinstance(data, (list, tuple)):
+			if data and isinstance(data[0], bytes):
+				return bytearray(b"".join(data))
+		return bytearray(data)
+
+
 	# this function generates and adds a new section to the ELF file
 	# return values: None
 	def addNewSection(self, newSectionName, newSectionType, newSectionFlag,
@@ -2138,15 +3375,18 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
+		# name index is updated with the new sections
+		sectionIndex = self._getSectionIndex()
+
 		# check if sections do not exist
 		# => create new section header table
 		if len(self.sections) == 0:
 
 			# restore section header entry size
-			if self.bits == 32:
-				self.header.e_shentsize = struct.calcsize('< 2I 4I 2I 2I')
-			elif self.bits == 64:
-				self.header.e_shentsize = struct.calcsize('< 2I 4Q 2I 2Q')
+			self.header.e_shentsize = self.layout.shdr.size
 
 			# when using gcc, first section is NULL section
 			# => create one and add it
@@ -2156,6 +3396,9 @@ class ElfParser(object):
 			newNullSection = self.generateNewSection("", 0, SH_type.SHT_NULL, 0,
 				0, 0, 0, 0, 0, 0, 0)
 			self.sections.append(newNullSection)
+			sectionIndex.addEntry(newNullSection,
+				self._modificationCounter.sectionNames)
+			self._updateSectionWithinSegments(newNullSection)
 
 			# increase count of sections
 			self.header.e_shnum += 1
@@ -2180,6 +3423,9 @@ class ElfParser(object):
 				newSectionLink, newSectionInfo, newSectionAddrAlign,
 				newSectionEntsize)
 			self.sections.append(newSection)
+			sectionIndex.addEntry(newSection,
+				self._modificationCounter.sectionNames)
+			self._updateSectionWithinSegments(newSection)
 
 			# increase count of sections
 			self.header.e_shnum += 1
@@ -2196,6 +3442,9 @@ class ElfParser(object):
 				1, SH_type.SHT_STRTAB, 0,
 				0, offsetNewShstrtab, lengthNewShstrtab, 0, 0, 1, 0)
 			self.sections.append(newShstrtabsection)
+			sectionIndex.addEntry(newShstrtabsection,
+				self._modificationCounter.sectionNames)
+			self._updateSectionWithinSegments(newShstrtabsection)
 
 			# increase count of sections
 			self.header.e_shnum += 1
@@ -2245,6 +3494,9 @@ class ElfParser(object):
 				self.sections.append(newsection)
 			else:
 				self.sections.insert(positionNewSection, newsection)
+			sectionIndex.addEntry(newsection,
+				self._modificationCounter.sectionNames)
+			self._updateSectionWithinSegments(newsection)
 
 			# section header table lies oft directly behind the string table
 			# check if new section name would overwrite data of
@@ -2263,6 +3515,8 @@ class ElfParser(object):
 			# null-terminated C string
 			self.sections[self.header.e_shstrndx].elfN_shdr.sh_size \
 				+= len(newSectionName) + 1
+			self._updateSectionWithinSegments(
+				self.sections[self.header.e_shstrndx])
 
 			# increase count of sections
 			self.header.e_shnum += 1
@@ -2277,6 +3531,9 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
 		sectionToExtend.elfN_shdr.sh_size += size
 
 
@@ -2400,6 +3657,9 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
 		self.header.e_shoff = 0
 		self.header.e_shnum = 0
 		self.header.e_shentsize = 0
@@ -2416,6 +3676,9 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
 		# get the segment to which the changed data belongs to
 		segmentToManipulate = None
 		for segment in self.segments:
@@ -2442,6 +3705,88 @@ class ElfParser(object):
 		self.data[offset:offset+len(data)] = data
 
 
+
+	# this function overwrites data at several file offsets (or virtual
+	# memory addresses) at once: all patches are checked against the
+	# segments and against each other before the first one is applied
+	# (same checks as writeDataToFileOffset(), patches must not overlap)
+	# return values: (list) segment each patch lies in (in the order of
+	# the given patches, None for patches outside of all segments)
+	def applyPatches(self, patches, memoryAddrs=False, force=False):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
+		segmentIndex = self._getSegmentIndex()
+
+		# resolve the file offset and segment of each patch
+		resolvedPatches = list()
+		for position, data in patches:
+
+			if memoryAddrs is True:
+				memorySegment = segmentIndex.segmentByMemoryAddr(position)
+				if memorySegment is None:
+					raise ValueError("Segment with virtual memory " \
+						+ "address 0x%x not found." % position)
+				offset = self._segmentMemoryAddrToFileOffset(memorySegment,
+					position)
+			else:
+				offset = position
+
+			foundSegment = segmentIndex.segmentByFileOffset(offset)
+
+			if force is False:
+				if foundSegment is None:
+					raise ValueError(('Segment with offset 0x%x not ' \
+						+ 'found (use "force=True" to ignore this ' \
+						+ 'check).') % offset)
+
+				segEnd = foundSegment.elfN_Phdr.p_offset \
+					+ foundSegment.elfN_Phdr.p_filesz
+				if offset + len(data) >= segEnd:
+					raise ValueError(('Size of data to manipulate at ' \
+						+ 'offset 0x%x: %d. Not enough space in segment ' \
+						+ '(Available: %d; use "force=True" to ignore ' \
+						+ 'this check).') \
+						% (offset, len(data), (segEnd - offset)))
+
+			resolvedPatches.append((offset, data, foundSegment))
+
+		# sorted by offset, every patch has to end before the next starts
+		sortedPatches = sorted(resolvedPatches, key=lambda patch: patch[0])
+		for (offset, data, _), (nextOffset, _, _) \
+			in zip(sortedPatches, sortedPatches[1:]):
+			if offset + len(data) > nextOffset:
+				raise ValueError("Patch at offset 0x%x overlaps patch " \
+					% offset + "at offset 0x%x." % nextOffset)
+
+		# change data (from the start to the end of the file)
+		for offset, data, _ in sortedPatches:
+			self.data[offset:offset+len(data)] = data
+
+		return [foundSegment for _, _, foundSegment in resolvedPatches]
+
+
+	# this function gets the interval index over the segments
+	# (rebuilt when the segments or their program headers were changed)
+	# return values: (SegmentIndex) index over the segments
+	def _getSegmentIndex(self):
+		segmentIndex = self._segmentIndex
+		modificationCount = self._modificationCounter.segments
+		if (segmentIndex is None
+			or segmentIndex.modificationCount != modificationCount
+			or segmentIndex.segments is not self._segments
+			or segmentIndex.segmentCount != len(self._segments)):
+			segmentIndex = SegmentIndex(self.segments, modificationCount)
+			self._segmentIndex = segmentIndex
+		return segmentIndex
+
+
 	# this function converts the virtual memory address to the file offset
 	# return value: (int) offset in file (or None if not found)
 	def virtualMemoryAddrToFileOffset(self, memoryAddr):
@@ -2452,20 +3797,48 @@ class ElfParser(object):
 				+ "File was not completely parsed before.")
 
 		# get the segment to which the virtual memory address belongs to
-		foundSegment = None
-		for segment in self.segments:
-			segStart = segment.elfN_Phdr.p_vaddr
-			segEnd = segStart + segment.elfN_Phdr.p_memsz
-			if segStart <= memoryAddr and memoryAddr < segEnd:
-				foundSegment = segment
-				break
+		foundSegment = self._getSegmentIndex().segmentByMemoryAddr(memoryAddr)
 
 		# check if segment was found
 		if foundSegment is None:
 			return None
 
+		return self._segmentMemoryAddrToFileOffset(foundSegment, memoryAddr)
+
+
+	# this function converts the virtual memory addresses to file offsets
+	# return value: (array) offsets in file (notFound for addresses that
+	# do not belong to a segment, default: all bits set)
+	def virtualMemoryAddrsToFileOffsets(self, memoryAddrs, notFound=None):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		if notFound is None:
+			notFound = (1 << self.bits) - 1
+
+		segmentByMemoryAddr = self._getSegmentIndex().segmentByMemoryAddr
+		fileOffsets = array.array(self.layout.addrTypecode)
+		for memoryAddr in memoryAddrs:
+			foundSegment = segmentByMemoryAddr(memoryAddr)
+			if foundSegment is None:
+				fileOffsets.append(notFound)
+			else:
+				fileOffsets.append(self._segmentMemoryAddrToFileOffset(
+					foundSegment, memoryAddr))
+
+		return fileOffsets
+
+
+	# this function converts the virtual memory address to the file offset
+	# inside the given segment
+	# return value: (int) offset in file
+	def _segmentMemoryAddrToFileOffset(self, foundSegment, memoryAddr):
+
 		relOffset = memoryAddr - foundSegment.elfN_Phdr.p_vaddr
-		# relOffset >= 0 due to condition in segment search loop
+		# relOffset >= 0 due to condition in segment search
 
 		# check if file is mapped 1:1 to memory
 		if foundSegment.elfN_Phdr.p_filesz != foundSegment.elfN_Phdr.p_memsz:
@@ -2488,20 +3861,48 @@ class ElfParser(object):
 				+ "File was not completely parsed before.")
 
 		# get the segment to which the file offset belongs to
-		foundSegment = None
-		for segment in self.segments:
-			segStart = segment.elfN_Phdr.p_offset
-			segEnd = segStart + segment.elfN_Phdr.p_filesz
-			if segStart <= offset and offset < segEnd:
-				foundSegment = segment
-				break
+		foundSegment = self._getSegmentIndex().segmentByFileOffset(offset)
 
 		# check if segment was found
 		if foundSegment is None:
 			return None
 
+		return self._segmentFileOffsetToVirtualMemoryAddr(foundSegment, offset)
+
+
+	# this function converts the file offsets to virtual memory addresses
+	# return value: (array) virtual memory addresses (notFound for offsets
+	# that do not belong to a segment, default: all bits set)
+	def fileOffsetsToVirtualMemoryAddrs(self, offsets, notFound=None):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		if notFound is None:
+			notFound = (1 << self.bits) - 1
+
+		segmentByFileOffset = self._getSegmentIndex().segmentByFileOffset
+		memoryAddrs = array.array(self.layout.addrTypecode)
+		for offset in offsets:
+			foundSegment = segmentByFileOffset(offset)
+			if foundSegment is None:
+				memoryAddrs.append(notFound)
+			else:
+				memoryAddrs.append(self._segmentFileOffsetToVirtualMemoryAddr(
+					foundSegment, offset))
+
+		return memoryAddrs
+
+
+	# this function converts the file offset to the virtual memory address
+	# inside the given segment
+	# return value: (int) virtual memory address
+	def _segmentFileOffsetToVirtualMemoryAddr(self, foundSegment, offset):
+
 		relOffset = offset - foundSegment.elfN_Phdr.p_offset
-		# relOffset >= 0 due to condition in segment search loop
+		# relOffset >= 0 due to condition in segment search
 
 		# check if file is mapped 1:1 to memory
 		if foundSegment.elfN_Phdr.p_filesz != foundSegment.elfN_Phdr.p_memsz:
@@ -2523,25 +3924,14 @@ class ElfParser(object):
 				+ "File was not completely parsed before.")
 
 		# search for name in jump relocation entries
-		entryToModify = None
-		for jmpEntry in self.jumpRelocationEntries:
-			if jmpEntry.name == name:
-				entryToModify = jmpEntry
-				break
-		if entryToModify is None:
-			raise ValueError('Jump relocation entry with the name' \
-				+ ' "%s" was not found.' % name)
+		entryToModify = self.getJmpRelEntryByName(name)
 
 		# calculate file offset of got
 		entryOffset = self.virtualMemoryAddrToFileOffset(
 			entryToModify.r_offset)
 
 		# generate list with new memory address for got
-		if self.bits == 32:
-			fmt = '<I'
-		elif self.bits == 64:
-			fmt = '<Q'
-		newGotAddr = struct.pack(fmt, memoryAddr)
+		newGotAddr = self.layout.addr.pack(memoryAddr)
 
 		# overwrite old offset
 		self.writeDataToFileOffset(entryOffset, newGotAddr)
@@ -2558,25 +3948,15 @@ class ElfParser(object):
 				+ "File was not completely parsed before.")
 
 		# search for name in jump relocation entries
-		entryToModify = None
-		for jmpEntry in self.jumpRelocationEntries:
-			if jmpEntry.name == name:
-				entryToModify = jmpEntry
-				break
-		if entryToModify is None:
-			raise ValueError('Jump relocation entry with the name' \
-				+ ' "%s" was not found.' % name)
+		entryToModify = self.getJmpRelEntryByName(name)
 
 		# calculate file offset of got
 		entryOffset = self.virtualMemoryAddrToFileOffset(
 			entryToModify.r_offset)
 
-		if self.bits == 32:
-			fmt = '<I'
-		elif self.bits == 64:
-			fmt = '<Q'
-		fmtSize = struct.calcsize(fmt)
-		return struct.unpack(fmt, self.data[entryOffset:entryOffset+fmtSize])[0]
+		# read only the entry (data may consist of pieces)
+		entryData = self.data[entryOffset:entryOffset+self.layout.addr.size]
+		return self.layout.addr.unpack(bytes(entryData))[0]
 
 
 	# this function gets the memory address of the got
@@ -2590,14 +3970,7 @@ class ElfParser(object):
 				+ "File was not completely parsed before.")
 
 		# search for name in jump relocation entries
-		entryToSearch = None
-		for jmpEntry in self.jumpRelocationEntries:
-			if jmpEntry.name == name:
-				entryToSearch = jmpEntry
-				break
-		if entryToSearch is None:
-			raise ValueError('Jump relocation entry with the name' \
-				+ ' "%s" was not found.' % name)
+		entryToSearch = self.getJmpRelEntryByName(name)
 
 		return entryToSearch.r_offset
 
@@ -2611,19 +3984,23 @@ class ElfParser(object):
 			raise ValueError("Operation not possible. " \
 				+ "File was not completely parsed before.")
 
+		# parse remaining tables before the file is modified
+		self._parseAllTables()
+
 		# search for the first section with the given name
-		found = False
-		for sectionNo in range(len(self.sections)):
-			if self.sections[sectionNo].sectionName == name:
-				found = True
-				break
+		sectionIndex = self._getSectionIndex()
+		removedSection = sectionIndex.first(name)
 
 		# check if the section was found
-		if not found:
+		if removedSection is None:
 			return
 
 		# remove the found section
+		sectionNo = self.sections.index(removedSection)
 		self.sections.pop(sectionNo)
+		sectionIndex.removeEntry(removedSection,
+			self._modificationCounter.sectionNames)
+		self._updateSectionWithinSegments(removedSection)
 
 		# modify ELF header
 		# => change section string table index and number of sections
@@ -2644,11 +4021,7 @@ class ElfParser(object):
 				+ "File was not completely parsed before.")
 
 		# search for the first jump relocation entry with the given name
-		foundEntry = None
-		for jmpRelEntry in self.jumpRelocationEntries:
-			if jmpRelEntry.symbol.symbolName == name:
-				foundEntry = jmpRelEntry
-				break
+		foundEntry = self._getJumpRelocationIndex().first(name)
 
 		# check if jump relocation entry was found
 		if foundEntry is None:
@@ -2656,3 +4029,330 @@ class ElfParser(object):
 				+ ' "%s" was not found.' % name)
 
 		return foundEntry
+
+
+	# this function searches for the first section given by name
+	# return values: (Section) section
+	def getSectionByName(self, name):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		# search for the first section with the given name
+		foundSection = self._getSectionIndex().first(name)
+
+		# check if section was found
+		if foundSection is None:
+			raise ValueError('Section with the name' \
+				+ ' "%s" was not found.' % name)
+
+		return foundSection
+
+
+	# this function gets the hash table of the dynamic symbols of the
+	# given type (DT_GNU_HASH or DT_HASH, default: DT_GNU_HASH is
+	# preferred over DT_HASH)
+	# return values: (GnuHashTable or SysvHashTable) hash table (None if
+	# the file has no readable hash table)
+	def getDynamicSymbolHashTable(self, tag=None):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		gnuHashAddr = None
+		sysvHashAddr = None
+		for dynEntry in self.dynamicSegmentEntries:
+			if dynEntry.d_tag == D_tag.DT_GNU_HASH:
+				gnuHashAddr = dynEntry.d_un
+			elif dynEntry.d_tag == D_tag.DT_HASH:
+				sysvHashAddr = dynEntry.d_un
+
+		for (hashAddr, hashTableClass, hashTag) in (
+			(gnuHashAddr, GnuHashTable, D_tag.DT_GNU_HASH),
+			(sysvHashAddr, SysvHashTable, D_tag.DT_HASH)):
+			if hashAddr is None or tag not in (None, hashTag):
+				continue
+			hashOffset = self.virtualMemoryAddrToFileOffset(hashAddr)
+			if hashOffset is None:
+				continue
+			try:
+				return hashTableClass(self._getFlatData(), hashOffset,
+					self.bits)
+			except struct.error:
+				continue
+
+		return None
+
+
+	# this function rebuilds the hash tables of the dynamic symbols that
+	# do not describe the names of the symbols anymore (a table is rebuilt
+	# in the space of the old one, the statistics of the rebuilt tables
+	# are stored in hashTableStats)
+	# return values: (list) tuples (int) offset in file, (bytearray) data
+	# of the rebuilt table
+	def _rebuildHashTables(self):
+		self.hashTableStats = list()
+
+		hashTables = list()
+		for tag in (D_tag.DT_GNU_HASH, D_tag.DT_HASH):
+			hashTable = self.getDynamicSymbolHashTable(tag)
+			if hashTable is not None:
+				hashTables.append(hashTable)
+		if not hashTables:
+			return list()
+
+		try:
+			names = self._getDynamicSymbolNamesInData()
+		except ValueError:
+			# symbol or string table can not be located
+			return list()
+		defined = [dynamicSymbol.ElfN_Sym.st_shndx != 0
+			for dynamicSymbol in self.dynamicSymbolEntries]
+
+		rebuiltTables = list()
+		for hashTable in hashTables:
+			try:
+				if hashTable.describes(names, defined):
+					continue
+				maxSize = min(hashTable.getSize(),
+					len(self.data) - hashTable.offset)
+			except struct.error:
+				print 'WARNING: Hash table at offset 0x%x can not be ' \
+					% hashTable.offset + 'read. Not rebuilding it.'
+				continue
+
+			if isinstance(hashTable, GnuHashTable):
+				(regionData, stats) = buildGnuHashTable(names,
+					min(hashTable.symbolOffset, len(names)), self.bits,
+					maxSize, hashTable)
+			else:
+				(regionData, stats) = buildSysvHashTable(names, maxSize,
+					hashTable)
+
+			if regionData is None:
+				print 'WARNING: Not enough space to rebuild the hash ' \
+					+ 'table at offset 0x%x (%d bytes). Not rebuilding it.' \
+					% (hashTable.offset, maxSize)
+				continue
+
+			# overwrite the rest of the old table with 0x00
+			regionData += bytearray(maxSize - len(regionData))
+			rebuiltTables.append((hashTable.offset, regionData))
+			self.hashTableStats.append(stats)
+
+		return rebuiltTables
+
+
+	# this function reads the names of the dynamic symbols from the
+	# string table (the names the dynamic loader sees, symbolName is not
+	# written back to the string table)
+	# return values: (list) names of the dynamic symbols
+	def _getDynamicSymbolNamesInData(self):
+		stringTable = self._getDynamicStringTable()
+		return [stringTable.getName(dynamicSymbol.ElfN_Sym.st_name)
+			for dynamicSymbol in self.dynamicSymbolEntries]
+
+
+	# this function looks up a defined dynamic symbol by name like the
+	# dynamic loader does: only the symbols in the hash chain of the name
+	# are decoded, the dynamic symbol table is not parsed
+	# (when the dynamic symbols were already parsed or the file has no
+	# hash table, the parsed symbols are searched)
+	# return values: (int) index in the dynamic symbol table,
+	# (DynamicSymbol) dynamic symbol (a new object if the dynamic symbols
+	# were not parsed)
+	def lookupDynamicSymbol(self, name):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		hashTable = None
+		if self._dynamicSymbolEntries is None:
+			hashTable = self.getDynamicSymbolHashTable()
+
+		if hashTable is not None:
+			(symbolTableOffset, symbolEntrySize, _, _) = \
+				self._getDynamicSymbolTableLocation()
+			stringTable = self._getDynamicStringTable()
+
+			for index in hashTable.iterCandidates(name):
+				dynamicSymbol = self._parseDynamicSymbol(
+					symbolTableOffset + (index*symbolEntrySize), stringTable)
+				if (dynamicSymbol.symbolName == name
+					and dynamicSymbol.ElfN_Sym.st_shndx != 0):
+					return (index, dynamicSymbol)
+
+		else:
+			nameIndex = self._getDynamicSymbolIndex()
+			for dynamicSymbol in nameIndex.entriesByName.get(name, ()):
+				if dynamicSymbol.ElfN_Sym.st_shndx != 0:
+					return (nameIndex.position(dynamicSymbol), dynamicSymbol)
+
+		raise ValueError('Dynamic symbol with the name' \
+			+ ' "%s" was not found.' % name)
+
+
+	# this function resolves the virtual memory address to the defined
+	# function or object symbol that contains it (of nested symbols the
+	# innermost one that contains the address, see SymbolIndex, the
+	# index is built on first use; staticSymbols selects the static
+	# symbol table .symtab instead of the dynamic symbols)
+	# return values: (tuple) (DynamicSymbol) symbol, (int) offset of the
+	# address in the symbol (None if the address belongs to no symbol)
+	def symbolizeAddr(self, memoryAddr, staticSymbols=False):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		return self._getSymbolIndex(staticSymbols).lookup(memoryAddr)
+
+
+	# this function resolves the virtual memory addresses to the defined
+	# function and object symbols that contain them (like symbolizeAddr(),
+	# resolved in one batch, with NumPy when it is installed; for very large batches
+	# getSymbolIndex().lookupIndices() avoids creating a tuple per address;
+	# staticSymbols selects the static symbol table .symtab instead of the
+	# dynamic symbols)
+	# return values: (list) tuples (DynamicSymbol) symbol, (int) offset
+	# of the address in the symbol (None for addresses that belong to no
+	# symbol)
+	def symbolize(self, memoryAddrs, staticSymbols=False):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		symbolIndex = self._getSymbolIndex(staticSymbols)
+		(indices, offsets) = symbolIndex.lookupIndices(memoryAddrs)
+
+		# symbols of a static symbol table are created on access
+		# => create each resolved symbol once
+		entries = symbolIndex.entries
+		symbols = dict()
+		result = list()
+		for i, offset in zip(indices.tolist(), offsets.tolist()):
+			if i < 0:
+				result.append(None)
+				continue
+			symbol = symbols.get(i)
+			if symbol is None:
+				symbol = symbols[i] = entries[i]
+			result.append((symbol, offset))
+		return result
+
+
+	# this function gets the address index of the defined function and
+	# object symbols (built on first use, rebuilt when the dynamic
+	# symbols, or for the static symbol table .symtab the sections or the
+	# data, were changed)
+	# return values: (SymbolIndex) index over the dynamic symbols or over
+	# the static symbol table
+	def getSymbolIndex(self, staticSymbols=False):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		return self._getSymbolIndex(staticSymbols)
+
+
+	# this function searches for the first dynamic symbol given by name
+	# return values: (DynamicSymbol) dynamic symbol
+	def getDynamicSymbolByName(self, name):
+
+		# check if the file was completely parsed before
+		if self.fileParsed is False:
+			raise ValueError("Operation not possible. " \
+				+ "File was not completely parsed before.")
+
+		# search for the first dynamic symbol with the given name
+		foundSymbol = self._getDynamicSymbolIndex().first(name)
+
+		# check if dynamic symbol was found
+		if foundSymbol is None:
+			raise ValueError('Dynamic symbol with the name' \
+				+ ' "%s" was not found.' % name)
+
+		return foundSymbol
+
+
+	# this function gets the name index of the sections
+	# (rebuilt when the sections or their names were changed)
+	# return values: (NameIndex) index over the sections
+	def _getSectionIndex(self):
+		sections = self.sections
+		modificationCount = self._modificationCounter.sectionNames
+		if (self._sectionIndex is None
+			or self._sectionIndex.isOutdated(sections, modificationCount)):
+			self._sectionIndex = NameIndex(sections,
+				attrgetter("sectionName"), modificationCount)
+		return self._sectionIndex
+
+
+	# this function gets the name index of the dynamic symbols
+	# (rebuilt when the dynamic symbols or their names were changed)
+	# return values: (NameIndex) index over the dynamic symbols
+	def _getDynamicSymbolIndex(self):
+		dynamicSymbolEntries = self.dynamicSymbolEntries
+		modificationCount = self._modificationCounter.symbolNames
+		if (self._dynamicSymbolIndex is None
+			or self._dynamicSymbolIndex.isOutdated(dynamicSymbolEntries,
+			modificationCount)):
+			self._dynamicSymbolIndex = NameIndex(dynamicSymbolEntries,
+				attrgetter("symbolName"), modificationCount)
+		return self._dynamicSymbolIndex
+
+
+	# this function gets the name index of the jump relocation entries
+	# (rebuilt when the entries, their symbols or the symbol names
+	# were changed)
+	# return values: (NameIndex) index over the jump relocation entries
+	def _getJumpRelocationIndex(self):
+		jumpRelocationEntries = self.jumpRelocationEntries
+		modificationCount = (self._modificationCounter.symbolNames,
+			self._modificationCounter.relocationSymbols)
+		if (self._jumpRelocationIndex is None
+			or self._jumpRelocationIndex.isOutdated(jumpRelocationEntries,
+			modificationCount)):
+			self._jumpRelocationIndex = NameIndex(jumpRelocationEntries,
+				attrgetter("symbol.symbolName"), modificationCount)
+		return self._jumpRelocationIndex
+
+
+	# this function gets the address index of the dynamic symbols
+	# (rebuilt when the dynamic symbols or their fields were changed) or
+	# of the static symbol table (rebuilt when the sections or the data
+	# were changed)
+	# return values: (SymbolIndex) index over the symbols
+	def _getSymbolIndex(self, staticSymbols=False):
+		if staticSymbols is True:
+			modificationCount = (self._modificationCounter.sections,
+				len(self.sections), self._getModificationCounts()["data"])
+			if (self._staticSymbolIndex is None
+				or self._staticSymbolIndex.modificationCount
+				!= modificationCount):
+				staticSymbolTable = self._getStaticSymbolTable(False)
+				if staticSymbolTable is None:
+					raise ValueError("File has no static symbol table.")
+				self._staticSymbolIndex = SymbolIndex(staticSymbolTable,
+					self.layout.addrTypecode, modificationCount)
+			return self._staticSymbolIndex
+
+		dynamicSymbolEntries = self.dynamicSymbolEntries
+		modificationCount = self._modificationCounter.dynamicSymbolEntries
+		if (self._symbolIndex is None
+			or self._symbolIndex.isOutdated(dynamicSymbolEntries,
+			modificationCount)):
+			self._symbolIndex = SymbolIndex(dynamicSymbolEntries,
+				self.layout.addrTypecode, modificationCount)
+		return self._symbolIndex
@@ -0,0 +1,166 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import os
+from ElfLayout import layouts, iterUnpackFrom
+from Elf import ElfN_Ehdr, Elf32_Phdr, P_type, D_tag, ElfN_Dyn, \
+	parsedRecordFactory
+
+
+# functions that create the records (not counted as modification of the
+# tables of a parsed file)
+_createPhdr = parsedRecordFactory(Elf32_Phdr, ("p_type", "p_offset",
+	"p_vaddr", "p_paddr", "p_filesz", "p_memsz", "p_flags", "p_align"))
+_createDyn = parsedRecordFactory(ElfN_Dyn, ("d_tag", "d_un"))
+
+
+class ElfTriage(object):
+	'''
+	Quick classification of a file that reads only the bytes it needs
+	instead of the whole file (for example to check a large number of
+	files for x86-64 shared objects).
+
+	Only e_ident and the ELF header are read by default. On request the
+	program header table, the PT_INTERP string and the PT_DYNAMIC
+	entries are read (the latter two include the program header table).
+	Each of these parts is read with at most maxSize bytes (entries
+	behind the limit are ignored), so the I/O per file stays at a few KB.
+	bytesRead holds the number of read bytes.
+
+	A file without the ELF magic only sets isElf to False. The header of
+	files with an unknown ELF class or data encoding is not decoded
+	(only header.e_ident is set).
+	'''
+	def __init__(self, filename, startOffset=0, readSegments=False,
+		readInterpreter=False, readDynamic=False, maxSize=4096):
+		self.filename = filename
+		self.startOffset = startOffset
+		self.isElf = False
+		self.bits = 0
+		self.header = None
+		self.segments = None
+		self.interpreter = None
+		self.dynamicSegmentEntries = None
+		self.bytesRead = 0
+
+		fd = os.open(filename, os.O_RDONLY)
+		try:
+			self._triage(fd, readSegments or readInterpreter or readDynamic,
+				readInterpreter, readDynamic, maxSize)
+		finally:
+			os.close(fd)
+
+
+	# this function reads and decodes the requested parts of the file
+	# return values: None
+	def _triage(self, fd, readSegments, readInterpreter, readDynamic,
+		maxSize):
+
+		# e_ident and the largest ELF header are read at once
+		data = self._readAt(fd, 0, 16 + layouts[64].ehdr.size)
+		if len(data) < 16 or data[0:4] != b'\x7fELF':
+			return
+		self.isElf = True
+
+		self.header = ElfN_Ehdr()
+		self.header.e_ident = data[0:16]
+
+		if self.header.e_ident[4] == ElfN_Ehdr.EI_CLASS.ELFCLASS32:
+			bits = 32
+		elif self.header.e_ident[4] == ElfN_Ehdr.EI_CLASS.ELFCLASS64:
+			bits = 64
+		else:
+			return
+		if self.header.e_ident[5] != ElfN_Ehdr.EI_DATA.ELFDATA2LSB:
+			return
+		self.bits = bits
+		layout = layouts[bits]
+
+		if len(data) < 16 + layout.ehdr.size:
+			raise ValueError("File is too small to contain an ELF header.")
+		(self.header.e_type, self.header.e_machine, self.header.e_version,
+			self.header.e_entry, self.header.e_phoff, self.header.e_shoff,
+			self.header.e_flags, self.header.e_ehsize,
+			self.header.e_phentsize, self.header.e_phnum,
+			self.header.e_shentsize, self.header.e_shnum,
+			self.header.e_shstrndx) = layout.ehdr.unpack_from(data, 16)
+
+		if readSegments is False:
+			return
+
+		###############################################
+		# program header table
+
+		phentsize = self.header.e_phentsize
+		if self.header.e_phnum > 0 and phentsize < layout.phdr.size:
+			raise ValueError("Program header table entries are too small.")
+
+		data = self._readAt(fd, self.header.e_phoff,
+			min(self.header.e_phnum * phentsize, maxSize))
+		self.segments = list()
+		for unpackedSegment in iterUnpackFrom(layout.phdr, data, 0,
+			len(data) // phentsize if phentsize else 0, phentsize):
+			if bits == 64:
+				# order elements as in Elf32_Phdr
+				unpackedSegment = unpackedSegment[0:1] \
+					+ unpackedSegment[2:7] + unpackedSegment[1:2] \
+					+ unpackedSegment[7:8]
+			self.segments.append(_createPhdr(unpackedSegment))
+
+		###############################################
+		# interpreter (PT_INTERP)
+
+		if readInterpreter is True:
+			for segment in self.segments:
+				if segment.p_type == P_type.PT_INTERP:
+					data = self._readAt(fd, segment.p_offset,
+						min(segment.p_filesz, maxSize))
+					nEnd = data.find(b'\x00')
+					if nEnd == -1:
+						nEnd = len(data)
+					self.interpreter = bytes(data[:nEnd])
+					break
+
+		###############################################
+		# dynamic segment entries (PT_DYNAMIC, until DT_NULL)
+
+		if readDynamic is True:
+			for segment in self.segments:
+				if segment.p_type == P_type.PT_DYNAMIC:
+					data = self._readAt(fd, segment.p_offset,
+						min(segment.p_filesz, maxSize))
+					self.dynamicSegmentEntries = list()
+					for unpackedEntry in iterUnpackFrom(layout.dyn, data, 0,
+						len(data) // layout.dyn.size):
+						dynSegmentEntry = _createDyn(unpackedEntry)
+						self.dynamicSegmentEntries.append(dynSegmentEntry)
+						if dynSegmentEntry.d_tag == D_tag.DT_NULL:
+							break
+					break
+
+
+	# this function reads the given number of bytes at the given offset
+	# (relative to the start offset) without moving the file position
+	# (os.pread() is not available in every python version => seek and
+	# read)
+	# return values: (bytearray) read data (shorter at the end of the file)
+	def _readAt(self, fd, offset, size):
+		data = bytearray()
+		offset += self.startOffset
+		while len(data) < size:
+			if hasattr(os, "pread"):
+				chunk = os.pread(fd, size - len(data), offset + len(data))
+			else:
+				os.lseek(fd, offset + len(data), os.SEEK_SET)
+				chunk = os.read(fd, size - len(data))
+			if not chunk:
+				break
+			data += chunk
+		self.bytesRead += len(data)
+		return data
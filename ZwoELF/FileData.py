@@ -0,0 +1,124 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import os
+
+
+class FileData(object):
+	'''
+	Read-only view of the data of a seekable file object that reads it on
+	demand (for example a member of an archive or a file on a network
+	share that can not be mapped into memory).
+
+	The data is read in blocks of blockSize bytes when a byte in them is
+	accessed for the first time. Read blocks are kept, so every byte is
+	read at most once. Supported are the read operations of a bytearray
+	that are used on the file data: len(), indexing (returns an int),
+	slicing with step 1 (returns a str) and find(). bytesRead holds the
+	number of bytes read from the file object.
+	'''
+	def __init__(self, fileObject, startOffset=0, blockSize=64 * 1024):
+		self.fileObject = fileObject
+		self.startOffset = startOffset
+		self.blockSize = blockSize
+		self.bytesRead = 0
+
+		# read blocks by their index
+		self._blocks = dict()
+
+		fileObject.seek(0, os.SEEK_END)
+		self._length = max(0, fileObject.tell() - startOffset)
+
+
+	def __len__(self):
+		return self._length
+
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			if key.step not in (None, 1):
+				raise ValueError("FileData only supports slices with step 1.")
+			start, stop, _ = key.indices(self._length)
+			return self._read(start, stop)
+
+		index = key
+		if index < 0:
+			index += self._length
+		if index < 0 or index >= self._length:
+			raise IndexError("FileData index out of range")
+		block = self._getBlock(index // self.blockSize)
+		return ord(block[index % self.blockSize])
+
+
+	# this function searches for the given data in the given range (block
+	# by block, the range is not read at once)
+	# return values: (int) position of the data (-1 if not found)
+	def find(self, sub, start=None, end=None):
+		if start is not None and start > self._length:
+			return -1
+		start, end, _ = slice(start, end).indices(self._length)
+		sub = bytes(sub)
+		if start > end or len(sub) > end - start:
+			return -1
+		if not sub:
+			return start
+
+		# the blocks overlap by the size of the searched data minus one
+		# => matches that span two blocks are found
+		position = start
+		while position < end:
+			chunkEnd = min(end, position + self.blockSize + len(sub) - 1)
+			found = self._read(position, chunkEnd).find(sub)
+			if found != -1:
+				return position + found
+			if chunkEnd == end:
+				break
+			position += self.blockSize
+		return -1
+
+
+	# this function gets the data of the given range
+	# return values: (str) data (shorter at the end of the data)
+	def _read(self, start, stop):
+		if start >= stop:
+			return b''
+		firstBlock = start // self.blockSize
+		lastBlock = (stop - 1) // self.blockSize
+		if firstBlock == lastBlock:
+			offset = firstBlock * self.blockSize
+			return self._getBlock(firstBlock)[start - offset:stop - offset]
+
+		chunks = list()
+		for blockIndex in range(firstBlock, lastBlock + 1):
+			chunks.append(self._getBlock(blockIndex))
+		offset = firstBlock * self.blockSize
+		return b''.join(chunks)[start - offset:stop - offset]
+
+
+	# this function gets the block with the given index (read from the
+	# file object on first access)
+	# return values: (str) data of the block
+	def _getBlock(self, blockIndex):
+		block = self._blocks.get(blockIndex)
+		if block is None:
+			self.fileObject.seek(self.startOffset
+				+ blockIndex * self.blockSize, os.SEEK_SET)
+			size = min(self.blockSize,
+				self._length - blockIndex * self.blockSize)
+			chunks = list()
+			while size > 0:
+				chunk = self.fileObject.read(size)
+				if not chunk:
+					break
+				chunks.append(chunk)
+				size -= len(chunk)
+			block = b''.join(chunks)
+			self.bytesRead += len(block)
+			self._blocks[blockIndex] = block
+		return block
@@ -0,0 +1,506 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import struct
+from ElfLayout import layouts, iterUnpackFrom
+from Elf import D_tag
+
+# bucket counts the linker chooses from (primes, see compute_bucket_count()
+# of binutils)
+_bucketCounts = (1, 3, 17, 37, 67, 97, 131, 197, 263, 521, 1031, 2053,
+	4099, 8209, 16411, 32771, 65537, 131101, 262147)
+
+
+# this function calculates the hash of a symbol name used by DT_GNU_HASH
+# return values: (int) 32 bit hash
+def gnuHash(name):
+	h = 5381
+	for c in bytearray(name):
+		h = (h * 33 + c) & 0xffffffff
+	return h
+
+
+# this function calculates the hash of a symbol name used by DT_HASH
+# return values: (int) 32 bit hash
+def sysvHash(name):
+	h = 0
+	for c in bytearray(name):
+		h = (h << 4) + c
+		g = h & 0xf0000000
+		if g:
+			h ^= g >> 24
+		h &= ~g & 0xffffffff
+	return h
+
+
+class HashTableStats(object):
+
+	def __init__(self, tag):
+		# DT_GNU_HASH or DT_HASH
+		self.tag = tag
+		self.bucketCount = 0
+		# symbols in the table
+		self.symbolCount = 0
+		self.emptyBuckets = 0
+		# number of chain entries that are visited when the chain of a
+		# bucket is walked completely (over the non-empty buckets)
+		self.averageChainLength = 0.0
+		self.maximumChainLength = 0
+		# number of ElfN_Addr words of the Bloom filter (DT_GNU_HASH)
+		self.bloomSize = 0
+
+
+	# this function creates the statistics of the given chain lengths
+	# return values: (HashTableStats) statistics
+	@classmethod
+	def fromChainLengths(cls, tag, chainLengths, symbolCount, bloomSize=0):
+		stats = cls(tag)
+		stats.bucketCount = len(chainLengths)
+		stats.symbolCount = symbolCount
+		stats.bloomSize = bloomSize
+		usedLengths = [length for length in chainLengths if length > 0]
+		stats.emptyBuckets = len(chainLengths) - len(usedLengths)
+		if usedLengths:
+			stats.averageChainLength = \
+				float(sum(usedLengths)) / len(usedLengths)
+			stats.maximumChainLength = max(usedLengths)
+		return stats
+
+
+class GnuHashTable(object):
+	'''
+	DT_GNU_HASH table of the dynamic symbols read directly from the data:
+
+	uint32_t	nbuckets
+	uint32_t	symoffset	(index of the first symbol in the table)
+	uint32_t	bloom_size	(number of ElfN_Addr words)
+	uint32_t	bloom_shift
+	ElfN_Addr	bloom[bloom_size]
+	uint32_t	buckets[nbuckets]
+	uint32_t	chain[]		(hash of every symbol from symoffset on,
+							lowest bit set at the end of a chain)
+
+	Only the header is read when the table is created. A lookup reads one
+	Bloom filter word, one bucket and the chain of the name (like the
+	dynamic loader), so it does not depend on the size of the table.
+	Symbols in front of symoffset (for example undefined symbols) are not
+	in the table.
+	'''
+	def __init__(self, data, offset, bits):
+		self.data = data
+		self.offset = offset
+		self.bits = bits
+		self._addr = layouts[bits].addr
+
+		(self.bucketCount, self.symbolOffset, self.bloomSize,
+			self.bloomShift) = _unpackWords(data, offset, 4)
+
+		self._bloomOffset = offset + 16
+		self._bucketOffset = self._bloomOffset \
+			+ (self.bloomSize*self._addr.size)
+		self._chainOffset = self._bucketOffset + (self.bucketCount*4)
+
+
+	# this function gets the indices of the symbols that have the same
+	# hash as the given name (their names still have to be compared)
+	# return values: (generator) indices in the dynamic symbol table
+	def iterCandidates(self, name):
+		if self.bucketCount == 0:
+			return
+		h = gnuHash(name)
+
+		# Bloom filter: both bits of the hash are set in the word if the
+		# name can be in the table
+		if self.bloomSize > 0:
+			wordBits = self._addr.size * 8
+			word = next(iterUnpackFrom(self._addr, self.data,
+				self._bloomOffset + ((h // wordBits) % self.bloomSize)
+				* self._addr.size, 1))[0]
+			mask = (1 << (h % wordBits)) \
+				| (1 << ((h >> self.bloomShift) % wordBits))
+			if word & mask != mask:
+				return
+
+		index = _unpackWords(self.data,
+			self._bucketOffset + ((h % self.bucketCount)*4), 1)[0]
+		if index < self.symbolOffset:
+			return
+
+		# the chain stores the hashes without the lowest bit
+		while True:
+			chainHash = _unpackWords(self.data,
+				self._chainOffset + ((index - self.symbolOffset)*4), 1)[0]
+			if (chainHash | 1) == (h | 1):
+				yield index
+			if chainHash & 1:
+				return
+			index += 1
+
+
+	# this function gets the exact number of symbols of the dynamic symbol
+	# table (the end of the chain that starts at the largest bucket)
+	# return values: (int) number of symbols (None if the table is empty,
+	# the symbols in front of symoffset do not have to end there)
+	def getSymbolCount(self):
+		maxIndex = 0
+		if self.bucketCount > 0:
+			maxIndex = max(_unpackWords(self.data, self._bucketOffset,
+				self.bucketCount))
+		if maxIndex < self.symbolOffset:
+			return None
+
+		index = maxIndex
+		while not _unpackWords(self.data,
+			self._chainOffset + ((index - self.symbolOffset)*4), 1)[0] & 1:
+			index += 1
+		return index + 1
+
+
+	# this function gets the size of the table in the data
+	# return values: (int) size in bytes
+	def getSize(self):
+		symbolCount = self.getSymbolCount()
+		if symbolCount is None:
+			symbolCount = self.symbolOffset
+		return self._chainOffset - self.offset \
+			+ ((symbolCount - self.symbolOffset)*4)
+
+
+	# this function checks if the table describes the given names of the
+	# dynamic symbols (the structure of the table only depends on the
+	# hashes of the symbols from symoffset on, undefined symbols are never
+	# looked up and do not have to be in the table)
+	# return values: (bool) True if the table is up to date
+	def describes(self, names, defined):
+		symbolCount = self.getSymbolCount()
+		if symbolCount is None:
+			return not any(defined[self.symbolOffset:])
+		if symbolCount != len(names):
+			return False
+
+		chain = _unpackWords(self.data, self._chainOffset,
+			symbolCount - self.symbolOffset)
+		for i in range(self.symbolOffset, symbolCount):
+			if (defined[i] and (chain[i - self.symbolOffset] | 1)
+				!= (gnuHash(names[i]) | 1)):
+				return False
+		return True
+
+
+	# this function gets the statistics of the chains of the table
+	# return values: (HashTableStats) statistics
+	def getStats(self):
+		symbolCount = self.getSymbolCount()
+		if symbolCount is None:
+			symbolCount = self.symbolOffset
+		buckets = _unpackWords(self.data, self._bucketOffset,
+			self.bucketCount)
+		chain = _unpackWords(self.data, self._chainOffset,
+			symbolCount - self.symbolOffset)
+
+		chainLengths = list()
+		for index in buckets:
+			length = 0
+			if index >= self.symbolOffset:
+				while True:
+					length += 1
+					if chain[index - self.symbolOffset] & 1:
+						break
+					index += 1
+			chainLengths.append(length)
+
+		return HashTableStats.fromChainLengths(D_tag.DT_GNU_HASH,
+			chainLengths, symbolCount - self.symbolOffset, self.bloomSize)
+
+
+class SysvHashTable(object):
+	'''
+	DT_HASH table of the dynamic symbols read directly from the data:
+
+	uint32_t	nbucket
+	uint32_t	nchain		(number of symbols)
+	uint32_t	bucket[nbucket]
+	uint32_t	chain[nchain]	(next symbol with the same bucket,
+								0 at the end of a chain)
+
+	Only the header is read when the table is created. A lookup reads one
+	bucket and the chain of the name. The chain does not store the hashes,
+	so the names of all symbols in it have to be compared.
+	'''
+	def __init__(self, data, offset, bits):
+		self.data = data
+		self.offset = offset
+		self.bits = bits
+
+		(self.bucketCount, self.chainCount) = _unpackWords(data, offset, 2)
+
+		self._bucketOffset = offset + 8
+		self._chainOffset = self._bucketOffset + (self.bucketCount*4)
+
+
+	# this function gets the indices of the symbols in the chain of the
+	# given name (their names still have to be compared)
+	# return values: (generator) indices in the dynamic symbol table
+	def iterCandidates(self, name):
+		if self.bucketCount == 0:
+			return
+		h = sysvHash(name)
+
+		index = _unpackWords(self.data,
+			self._bucketOffset + ((h % self.bucketCount)*4), 1)[0]
+
+		# a chain can not be longer than the table (stops loops of
+		# malformed tables)
+		chainLength = 0
+		while 0 < index < self.chainCount and chainLength < self.chainCount:
+			yield index
+			chainLength += 1
+			index = _unpackWords(self.data, self._chainOffset + (index*4),
+				1)[0]
+
+
+	# this function gets the exact number of symbols of the dynamic symbol
+	# table (nchain)
+	# return values: (int) number of symbols
+	def getSymbolCount(self):
+		return self.chainCount
+
+
+	# this function gets the size of the table in the data
+	# return values: (int) size in bytes
+	def getSize(self):
+		return 8 + ((self.bucketCount + self.chainCount)*4)
+
+
+	# this function checks if the table describes the given names of the
+	# dynamic symbols (every symbol is in the chain of its hash, also the
+	# undefined ones)
+	# return values: (bool) True if the table is up to date
+	def describes(self, names, defined):
+		if self.chainCount != len(names):
+			return False
+
+		bucketOfSymbol = self._getBucketOfSymbols()
+		for i in range(1, self.chainCount):
+			if bucketOfSymbol[i] != sysvHash(names[i]) % self.bucketCount:
+				return False
+		return True
+
+
+	# this function gets the statistics of the chains of the table
+	# return values: (HashTableStats) statistics
+	def getStats(self):
+		chainLengths = [0] * self.bucketCount
+		for bucket in self._getBucketOfSymbols():
+			if bucket is not None:
+				chainLengths[bucket] += 1
+
+		return HashTableStats.fromChainLengths(D_tag.DT_HASH, chainLengths,
+			sum(chainLengths))
+
+
+	# this function walks all chains of the table
+	# return values: (list) bucket of every symbol (None if the symbol is
+	# in no chain)
+	def _getBucketOfSymbols(self):
+		bucketOfSymbol = [None] * self.chainCount
+		buckets = _unpackWords(self.data, self._bucketOffset,
+			self.bucketCount)
+		chain = _unpackWords(self.data, self._chainOffset, self.chainCount)
+		for bucket in range(self.bucketCount):
+			index = buckets[bucket]
+			while (0 < index < self.chainCount
+				and bucketOfSymbol[index] is None):
+				bucketOfSymbol[index] = bucket
+				index = chain[index]
+		return bucketOfSymbol
+
+
+# this function builds a DT_GNU_HASH table for the given names of the
+# dynamic symbols that fits into the given size (the order of the
+# symbols is kept, so the chains of buckets whose symbols are not
+# grouped are merged; the bucket count with the shortest chains is
+# chosen and the remaining space is used for the Bloom filter; the
+# symbols of a table of the linker are grouped by its bucket count, so
+# the bucket count of the previous table is tried as well)
+# return values: (bytearray) table (None if it does not fit),
+# (HashTableStats) statistics of the table
+def buildGnuHashTable(names, symbolOffset, bits, maxSize,
+	previousTable=None):
+	addr = layouts[bits].addr
+	wordBits = addr.size * 8
+	hashes = [gnuHash(name) for name in names[symbolOffset:]]
+	symbolCount = len(hashes)
+
+	# Bloom filter size chosen by the linker (at least one word)
+	maskBitsLog2 = _ceilLog2(symbolCount) + 1
+	if maskBitsLog2 < 3:
+		maskBitsLog2 = 5
+	elif (1 << (maskBitsLog2 - 2)) & symbolCount:
+		maskBitsLog2 += 3
+	else:
+		maskBitsLog2 += 2
+	wordBitsLog2 = _ceilLog2(wordBits)
+	linkerBloomSize = 1 << max(0, maskBitsLog2 - wordBitsLog2)
+
+	# at least one Bloom filter word and one bucket
+	fixedSize = 16 + (symbolCount*4)
+	if fixedSize + addr.size + 4 > maxSize:
+		return (None, None)
+
+	# bucket count with the least visited chain entries per lookup
+	best = None
+	for bucketCount in _candidateBucketCounts(symbolCount,
+		(maxSize - fixedSize - addr.size) // 4, previousTable):
+		(buckets, chain, cost) = _gnuChains(hashes, bucketCount,
+			symbolOffset)
+		if best is None or cost < best[0]:
+			best = (cost, buckets, chain)
+	(_, buckets, chain) = best
+
+	# largest Bloom filter that fits in the remaining space (at most four
+	# times the size of the linker, a larger filter hardly reduces false
+	# positives)
+	bloomSize = 1
+	while (bloomSize < linkerBloomSize * 4
+		and fixedSize + (bloomSize*2*addr.size) + (len(buckets)*4)
+		<= maxSize):
+		bloomSize *= 2
+	bloomShift = _ceilLog2(bloomSize * wordBits)
+
+	bloom = [0] * bloomSize
+	for h in hashes:
+		bloom[(h // wordBits) % bloomSize] |= (1 << (h % wordBits)) \
+			| (1 << ((h >> bloomShift) % wordBits))
+
+	table = bytearray(struct.pack('<4I', len(buckets), symbolOffset,
+		bloomSize, bloomShift))
+	for word in bloom:
+		table += addr.pack(word)
+	table += struct.pack('<%dI' % len(buckets), *buckets)
+	table += struct.pack('<%dI' % len(chain), *chain)
+
+	chainLengths = list()
+	for index in buckets:
+		length = 0
+		if index >= symbolOffset:
+			while True:
+				length += 1
+				if chain[index - symbolOffset] & 1:
+					break
+				index += 1
+		chainLengths.append(length)
+	return (table, HashTableStats.fromChainLengths(D_tag.DT_GNU_HASH,
+		chainLengths, symbolCount, bloomSize))
+
+
+# this function builds a DT_HASH table for the given names of the dynamic
+# symbols that fits into the given size (the bucket count with the
+# shortest chains is chosen, the bucket count of the previous table is
+# tried as well)
+# return values: (bytearray) table (None if it does not fit),
+# (HashTableStats) statistics of the table
+def buildSysvHashTable(names, maxSize, previousTable=None):
+	# at least one bucket
+	symbolCount = len(names)
+	if 8 + 4 + (symbolCount*4) > maxSize:
+		return (None, None)
+	hashes = [sysvHash(name) for name in names]
+
+	# bucket count with the least compared names per lookup
+	best = None
+	for bucketCount in _candidateBucketCounts(symbolCount,
+		(maxSize - 8 - (symbolCount*4)) // 4, previousTable):
+		chainLengths = [0] * bucketCount
+		for h in hashes[1:]:
+			chainLengths[h % bucketCount] += 1
+		cost = sum(length * (length + 1) for length in chainLengths)
+		if best is None or cost < best[0]:
+			best = (cost, bucketCount, chainLengths)
+	(_, bucketCount, chainLengths) = best
+
+	# symbol 0 (STN_UNDEF) ends every chain
+	buckets = [0] * bucketCount
+	chain = [0] * symbolCount
+	for i in range(1, symbolCount):
+		bucket = hashes[i] % bucketCount
+		chain[i] = buckets[bucket]
+		buckets[bucket] = i
+
+	table = bytearray(struct.pack('<2I', bucketCount, symbolCount))
+	table += struct.pack('<%dI' % bucketCount, *buckets)
+	table += struct.pack('<%dI' % symbolCount, *chain)
+	return (table, HashTableStats.fromChainLengths(D_tag.DT_HASH,
+		chainLengths, max(0, symbolCount - 1)))
+
+
+# this function gets the bucket counts up to the given maximum that are
+# tried for the given number of symbols (the counts of the linker from
+# 1/16 of the symbols up to the number of symbols, the count of the
+# previous table and the largest count that fits)
+# return values: (list) bucket counts
+def _candidateBucketCounts(symbolCount, maxBucketCount, previousTable=None):
+	candidates = set(bucketCount for bucketCount in _bucketCounts
+		if symbolCount // 16 <= bucketCount <= symbolCount)
+	candidates.add(1)
+	candidates.add(min(symbolCount, maxBucketCount))
+	if previousTable is not None:
+		candidates.add(previousTable.bucketCount)
+	return sorted(bucketCount for bucketCount in candidates
+		if 1 <= bucketCount <= maxBucketCount)
+
+
+# this function creates the buckets and the chain of a DT_GNU_HASH table
+# without changing the order of the symbols (the chain of a bucket
+# continues until all symbols of the buckets that start in it are
+# reached)
+# return values: (list) buckets, (list) chain, (int) number of chain
+# entries visited to find every symbol once
+def _gnuChains(hashes, bucketCount, symbolOffset):
+	bucketOfSymbol = [h % bucketCount for h in hashes]
+	first = [-1] * bucketCount
+	last = [-1] * bucketCount
+	for i, bucket in enumerate(bucketOfSymbol):
+		if first[bucket] == -1:
+			first[bucket] = i
+		last[bucket] = i
+
+	chain = [h & ~1 for h in hashes]
+	cost = 0
+	chainEnd = -1
+	for i, bucket in enumerate(bucketOfSymbol):
+		chainEnd = max(chainEnd, last[bucket])
+		if i == chainEnd:
+			chain[i] |= 1
+		cost += i - first[bucket] + 1
+
+	buckets = [index + symbolOffset if index != -1 else 0
+		for index in first]
+	return (buckets, chain, cost)
+
+
+# this function gets the base 2 logarithm rounded up
+# return values: (int) logarithm
+def _ceilLog2(value):
+	result = 0
+	value -= 1
+	while value > 0:
+		result += 1
+		value >>= 1
+	return result
+
+
+# this function unpacks the given number of 32 bit words at the given
+# offset
+# return values: (tuple) unpacked words
+def _unpackWords(data, offset, count):
+	if count <= 0:
+		return ()
+	return next(iterUnpackFrom(struct.Struct('<%dI' % count), data, offset,
+		1))
@@ -0,0 +1,51 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import bisect
+
+
+class IntervalSet(object):
+	'''
+	Sorted list of non overlapping intervals [start, end) (for example
+	the modified byte ranges of a file).
+
+	An added interval is merged with all intervals it overlaps or
+	touches, so the list always holds as few intervals as possible.
+	Adding an interval costs O(log n) plus the number of merged
+	intervals.
+	'''
+	def __init__(self):
+		self.starts = list()
+		self.ends = list()
+
+
+	def __len__(self):
+		return len(self.starts)
+
+
+	def __iter__(self):
+		return iter(zip(self.starts, self.ends))
+
+
+	# this function adds the interval [start, end)
+	# return values: None
+	def add(self, start, end):
+		if start >= end:
+			return
+
+		# intervals ending at or after the start and starting at or
+		# before the end overlap or touch the new interval
+		first = bisect.bisect_left(self.ends, start)
+		last = bisect.bisect_right(self.starts, end)
+		if first < last:
+			start = min(start, self.starts[first])
+			end = max(end, self.ends[last - 1])
+
+		self.starts[first:last] = [start]
+		self.ends[first:last] = [end]
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+
+class NameIndex(object):
+	'''
+	Maps the names of the entries of a table (for example the sections)
+	to the entries with this name (in the order of the table) and the
+	entries to their position in the table.
+
+	The index remembers the table it was built from, its length and a
+	modification counter of the names, so the user can check with
+	isOutdated() if it has to be rebuilt. Entries added to or removed
+	from the table can be applied with addEntry() and removeEntry()
+	instead of rebuilding the index.
+	'''
+	def __init__(self, entries, getName, modificationCount):
+		self.entries = entries
+		self.entryCount = len(entries)
+		self.modificationCount = modificationCount
+		self.getName = getName
+
+		self.entriesByName = dict()
+		self._positions = dict()
+		for position, entry in enumerate(entries):
+			# an entry that is several times in the table has the
+			# position of its first occurrence (like list.index())
+			self._positions.setdefault(entry, position)
+			name = getName(entry)
+			entriesWithName = self.entriesByName.get(name)
+			if entriesWithName is None:
+				self.entriesByName[name] = [entry]
+			else:
+				entriesWithName.append(entry)
+
+
+	# this function checks if the index does not describe the given
+	# table anymore
+	# return values: (bool) True if the index has to be rebuilt
+	def isOutdated(self, entries, modificationCount):
+		return (self.entries is not entries
+			or self.entryCount != len(entries)
+			or self.modificationCount != modificationCount)
+
+
+	# this function gets the first entry with the given name
+	# return values: entry (or None if not found)
+	def first(self, name):
+		entriesWithName = self.entriesByName.get(name)
+		if entriesWithName:
+			return entriesWithName[0]
+		return None
+
+
+	# this function gets the position of the given entry in the table
+	# return values: (int) position (ValueError if the entry is not in
+	# the table)
+	def position(self, entry):
+		position = self._positions.get(entry)
+
+		# entries were moved within the table (not detected by the
+		# modification counter) => get the positions again
+		if (position is None or position >= len(self.entries)
+			or self.entries[position] is not entry):
+			self._updatePositions()
+			position = self._positions.get(entry)
+			if position is None:
+				raise ValueError("Entry is not in the table.")
+		return position
+
+
+	# this function gets the positions of the entries in the table again
+	# (after an entry was inserted or removed in front of the end of the
+	# table)
+	# return values: None
+	def _updatePositions(self):
+		self._positions = dict()
+		for position, entry in enumerate(self.entries):
+			self._positions.setdefault(entry, position)
+
+
+	# this function adds an entry that was inserted into the table
+	# return values: None
+	def addEntry(self, entry, modificationCount):
+		name = self.getName(entry)
+		entriesWithName = self.entriesByName.get(name)
+		if entriesWithName is None:
+			self.entriesByName[name] = [entry]
+		else:
+			entriesWithName.append(entry)
+			# keep the order of the table
+			entriesWithName.sort(key=self.entries.index)
+
+		# entry appended => the positions of the other entries are kept
+		if self.entries and self.entries[-1] is entry:
+			self._positions.setdefault(entry, len(self.entries) - 1)
+		else:
+			self._updatePositions()
+
+		self.entryCount = len(self.entries)
+		self.modificationCount = modificationCount
+
+
+	# this function removes an entry that was removed from the table
+	# return values: None
+	def removeEntry(self, entry, modificationCount):
+		name = self.getName(entry)
+		entriesWithName = self.entriesByName[name]
+		entriesWithName.remove(entry)
+		if not entriesWithName:
+			del self.entriesByName[name]
+
+		# last entry removed => the positions of the other entries are kept
+		if self._positions.get(entry) == len(self.entries):
+			del self._positions[entry]
+		else:
+			self._updatePositions()
+
+		self.entryCount = len(self.entries)
+		self.modificationCount = modificationCount
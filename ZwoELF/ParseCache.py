@@ -0,0 +1,226 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import hashlib
+import marshal
+import os
+import sqlite3
+import time
+from ElfParserLib import VerificationMode
+
+
+# changed whenever the format of the stored parse results changes
+# (results of other versions are never used)
+_formatVersion = 2
+
+# verification modes ordered by how thoroughly they check the file
+_verificationRanks = {
+	VerificationMode.OFF: 0,
+	VerificationMode.CHEAP: 1,
+	VerificationMode.FULL: 2,
+}
+
+
+class ParseCacheStats(object):
+
+	def __init__(self):
+		# results found by size, modification time and inode of the file
+		self.hits = 0
+		# results found by the hash of the content (file was copied,
+		# touched or replaced by an identical file)
+		self.hashHits = 0
+		self.misses = 0
+		self.stores = 0
+		self.evictions = 0
+
+
+class ParseCache(object):
+	'''
+	Persistent cache of parse results in a local SQLite database (used by
+	ElfParser(..., parseCache=cache)).
+
+	A parse result holds the header and the values of all records of the
+	parsed tables (stored with marshal). A file is found by its path,
+	size, modification time and inode without reading it. If one of them
+	changed (or the data was not read from a named file, see
+	ElfParser.fromBuffer()), the result is searched by the SHA-1 hash of
+	the content.
+	On a hit the parser only reads the data and creates the records, the
+	data is neither parsed nor verified. A result is stored with the
+	verification mode of the parser that stored it and is only used by
+	parsers that ask for the same or a less thorough mode (ElfParser()
+	asks for VerificationMode.FULL by default, the batch module asks for
+	VerificationMode.CHEAP).
+
+	When the stored results grow larger than maxSize bytes, the least
+	recently used results are removed. The connection is opened on first
+	use in each process, so the cache can be passed to worker processes.
+	'''
+	def __init__(self, path, maxSize=256 * 1024 * 1024):
+		self.path = path
+		self.maxSize = maxSize
+		self.stats = ParseCacheStats()
+		self._connection = None
+		self._connectionPid = None
+
+		# key of the last missed result (the following store() does not
+		# have to hash the content again)
+		self._missedResultKey = None
+
+
+	# this function loads the parse result of the file of the given
+	# parser into it (only results verified at least with the given
+	# verification mode are used)
+	# return values: (bool) True if a result was found and loaded
+	def load(self, elfParser, requiredMode=VerificationMode.OFF):
+		connection = self._getConnection()
+		fileKey = self._getFileKey(elfParser)
+
+		row = None
+		if fileKey is not None:
+			row = connection.execute("SELECT resultKey FROM files WHERE "
+				+ "path = ? AND startOffset = ? AND forceDynSymParsing = ? "
+				+ "AND fileSize = ? AND mtime = ? AND inode = ?",
+				fileKey).fetchone()
+		if row is not None:
+			resultKey = row[0]
+			byHash = False
+		else:
+			resultKey = self._getResultKey(elfParser)
+			byHash = True
+
+		row = connection.execute("SELECT result, verificationMode "
+			+ "FROM results WHERE resultKey = ?", (resultKey,)).fetchone()
+		if (row is None
+			or _verificationRanks[row[1]]
+			< _verificationRanks[requiredMode]):
+			self.stats.misses += 1
+			self._missedResultKey = (id(elfParser), resultKey)
+			return False
+
+		elfParser._setParseResult(marshal.loads(bytes(row[0])))
+
+		with connection:
+			connection.execute("UPDATE results SET lastUsed = ? "
+				+ "WHERE resultKey = ?", (time.time(), resultKey))
+			if byHash and fileKey is not None:
+				connection.execute("INSERT OR REPLACE INTO files "
+					+ "VALUES (?, ?, ?, ?, ?, ?, ?)",
+					fileKey + (resultKey,))
+
+		if byHash:
+			self.stats.hashHits += 1
+		else:
+			self.stats.hits += 1
+		return True
+
+
+	# this function stores the parse result of the given parser (all
+	# tables are parsed before)
+	# return values: None
+	def store(self, elfParser, verificationMode=VerificationMode.OFF):
+		connection = self._getConnection()
+
+		result = marshal.dumps(elfParser._getParseResult())
+		if (self._missedResultKey is not None
+			and self._missedResultKey[0] == id(elfParser)):
+			resultKey = self._missedResultKey[1]
+		else:
+			resultKey = self._getResultKey(elfParser)
+		self._missedResultKey = None
+		fileKey = self._getFileKey(elfParser)
+
+		with connection:
+			connection.execute("INSERT OR REPLACE INTO results "
+				+ "VALUES (?, ?, ?, ?, ?)", (resultKey, buffer(result),
+				len(result), verificationMode, time.time()))
+			if fileKey is not None:
+				connection.execute("INSERT OR REPLACE INTO files "
+					+ "VALUES (?, ?, ?, ?, ?, ?, ?)", fileKey + (resultKey,))
+			self._evict(connection)
+
+		self.stats.stores += 1
+
+
+	# this function removes all stored results
+	# return values: None
+	def clear(self):
+		connection = self._getConnection()
+		with connection:
+			connection.execute("DELETE FROM files")
+			connection.execute("DELETE FROM results")
+
+
+	# this function removes the least recently used results until the
+	# stored results fit into the maximum size
+	# return values: None
+	def _evict(self, connection):
+		totalSize = connection.execute(
+			"SELECT TOTAL(size) FROM results").fetchone()[0]
+		if totalSize <= self.maxSize:
+			return
+
+		evictedKeys = list()
+		for resultKey, size in connection.execute("SELECT resultKey, size "
+			+ "FROM results ORDER BY lastUsed").fetchall():
+			if totalSize <= self.maxSize:
+				break
+			evictedKeys.append((resultKey,))
+			totalSize -= size
+
+		connection.executemany("DELETE FROM results WHERE resultKey = ?",
+			evictedKeys)
+		connection.executemany("DELETE FROM files WHERE resultKey = ?",
+			evictedKeys)
+		self.stats.evictions += len(evictedKeys)
+
+
+	# this function gets the connection to the database of this process
+	# (a connection must not be used after a fork)
+	# return values: (sqlite3.Connection) connection
+	def _getConnection(self):
+		if self._connection is None or self._connectionPid != os.getpid():
+			connection = sqlite3.connect(self.path, timeout=60)
+			connection.text_factory = bytes
+			with connection:
+				connection.execute("CREATE TABLE IF NOT EXISTS results ("
+					+ "resultKey TEXT PRIMARY KEY, result BLOB, "
+					+ "size INTEGER, verificationMode TEXT, lastUsed REAL)")
+				connection.execute("CREATE TABLE IF NOT EXISTS files ("
+					+ "path TEXT, startOffset INTEGER, "
+					+ "forceDynSymParsing INTEGER, fileSize INTEGER, "
+					+ "mtime REAL, inode INTEGER, resultKey TEXT, "
+					+ "PRIMARY KEY (path, startOffset, forceDynSymParsing))")
+			self._connection = connection
+			self._connectionPid = os.getpid()
+		return self._connection
+
+
+	# this function gets the values that identify the file of the parser
+	# without reading it
+	# return values: (tuple) path, start offset, forceDynSymParsing,
+	# size, modification time, inode (None if the data was not read from
+	# a named file)
+	def _getFileKey(self, elfParser):
+		if elfParser.filename is None:
+			return None
+		path = os.path.realpath(elfParser.filename)
+		fileStat = os.stat(path)
+		return (path, elfParser.startOffset, elfParser.forceDynSymParsing,
+			fileStat.st_size, fileStat.st_mtime, fileStat.st_ino)
+
+
+	# this function gets the key of the parse result from the content of
+	# the file
+	# return values: (str) key of the parse result
+	def _getResultKey(self, elfParser):
+		contentHash = hashlib.sha1()
+		contentHash.update(elfParser._getBufferData())
+		return "%s-%d-%d" % (contentHash.hexdigest(),
+			elfParser.forceDynSymParsing, _formatVersion)
@@ -0,0 +1,377 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import random
+from IntervalSet import IntervalSet
+
+
+class PieceTable(object):
+	'''
+	Editable view of the data of a file (a piece table).
+
+	The data is described by a sequence of pieces. Each piece references a
+	range of either the original data (a bytearray or a read-only mmap,
+	never modified) or of an append-only buffer that holds all inserted
+	data. The pieces are kept in a balanced tree (a treap ordered by the
+	position in the file, every node knows the size of its subtree), so
+	inserts, overwrites, deletes and reads of small ranges cost
+	O(log pieces) instead of moving the rest of the file.
+
+	The supported operations are the ones of a bytearray that are used on
+	the file data: len(), indexing, slicing (step 1 only), slice
+	assignment and deletion, insert() and find(). flatten() creates the
+	complete data once and continues with it as original data. All
+	modified byte ranges (and the ranges moved by changes of the size)
+	are collected in dirtyIntervals.
+	'''
+	def __init__(self, data):
+		# own random generator => the random state of the user is
+		# not changed by the priorities of the tree
+		self._random = random.Random(0)
+
+		self._addBuffer = bytearray()
+		self._root = None
+
+		# counts the modifications of the data
+		self.modificationCount = 0
+
+		# byte ranges that differ from the original data (or were moved)
+		self.dirtyIntervals = IntervalSet()
+
+		if len(data) > 0:
+			self._root = self._newPiece(data, 0, len(data))
+
+
+	def __len__(self):
+		if self._root is None:
+			return 0
+		return self._root.total
+
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			start, stop = self._sliceRange(key)
+			pieces = list()
+			_readRange(self._root, start, stop, pieces)
+			return bytearray().join(pieces)
+
+		index = self._index(key)
+		node = self._root
+		while True:
+			leftTotal = _total(node.left)
+			if index < leftTotal:
+				node = node.left
+			elif index < leftTotal + node.length:
+				value = node.buffer[node.start + index - leftTotal]
+				# read-only mmap returns a string
+				if isinstance(value, bytes):
+					value = ord(value)
+				return value
+			else:
+				index -= leftTotal + node.length
+				node = node.right
+
+
+	def __setitem__(self, key, value):
+		if isinstance(key, slice):
+			start, stop = self._sliceRange(key)
+			self._replace(start, stop, _toBytearray(value))
+		else:
+			index = self._index(key)
+			self._replace(index, index + 1, bytearray([value]))
+
+
+	def __delitem__(self, key):
+		if isinstance(key, slice):
+			start, stop = self._sliceRange(key)
+		else:
+			start = self._index(key)
+			stop = start + 1
+		self._replace(start, stop, bytearray())
+
+
+	# this function inserts one byte (int or char) at the given position
+	# (same behavior as bytearray.insert())
+	# return values: None
+	def insert(self, index, value):
+		length = len(self)
+		if index < 0:
+			index = max(0, index + length)
+		index = min(index, length)
+		if isinstance(value, bytes):
+			value = bytearray(value)
+		else:
+			value = bytearray([value])
+		self._replace(index, index, value)
+
+
+	# this function searches for the given data in the given range
+	# return values: (int) position of the data (-1 if not found)
+	def find(self, sub, start=None, end=None):
+		length = len(self)
+		if start is not None and start > length:
+			return -1
+		start, end, _ = slice(start, end).indices(length)
+		if start > end:
+			return -1
+		position = self[start:end].find(sub)
+		if position == -1:
+			return -1
+		return start + position
+
+
+	# this function creates the complete data and uses it as new original
+	# data (all pieces are replaced by one)
+	# return values: (bytearray or original data) complete data
+	# (must not be modified)
+	def flatten(self):
+		root = self._root
+		if root is None:
+			return bytearray()
+
+		# only one piece that covers its whole buffer => nothing to do
+		if (root.left is None and root.right is None
+			and root.start == 0 and root.length == len(root.buffer)):
+			return root.buffer
+
+		pieces = list()
+		_readRange(root, 0, root.total, pieces)
+		flatData = bytearray().join(pieces)
+
+		self._addBuffer = bytearray()
+		self._root = self._newPiece(flatData, 0, len(flatData))
+		return flatData
+
+
+	# this function gets the pieces of the given range in order without
+	# copying their data
+	# return values: (generator) tuples (buffer) buffer of the piece,
+	# (int) start in the buffer, (int) end in the buffer
+	def iterPieces(self, start=0, stop=None):
+		if stop is None:
+			stop = len(self)
+		if start >= stop:
+			return
+
+		stack = list()
+		node = self._root
+		# position of the first byte of the subtree of node
+		offset = 0
+		while stack or node is not None:
+
+			# descend to the left as long as the range starts in the
+			# left subtree
+			while node is not None:
+				stack.append((node, offset))
+				if start < offset + _total(node.left):
+					node = node.left
+				else:
+					node = None
+
+			(node, offset) = stack.pop()
+			pieceStart = offset + _total(node.left)
+			pieceEnd = pieceStart + node.length
+			if pieceStart >= stop:
+				return
+			if pieceEnd > start:
+				yield (node.buffer,
+					node.start + max(start, pieceStart) - pieceStart,
+					node.start + min(stop, pieceEnd) - pieceStart)
+
+			node = node.right
+			offset = pieceEnd
+
+
+	# this function gets the number of pieces the data consists of
+	# return values: (int) number of pieces
+	def pieceCount(self):
+		count = 0
+		nodes = [self._root]
+		while nodes:
+			node = nodes.pop()
+			if node is not None:
+				count += 1
+				nodes.append(node.left)
+				nodes.append(node.right)
+		return count
+
+
+	# this function replaces the data in the given range with new data
+	# (start == stop => insert, empty new data => delete)
+	# return values: None
+	def _replace(self, start, stop, data):
+		self.modificationCount += 1
+
+		# size of data changes => all following bytes are moved
+		length = len(self)
+		if len(data) == stop - start:
+			self.dirtyIntervals.add(start, stop)
+		else:
+			self.dirtyIntervals.add(start,
+				max(length, length - (stop - start) + len(data)))
+
+		left, rest = _split(self._root, start)
+		_, right = _split(rest, stop - start)
+
+		if data:
+			addStart = len(self._addBuffer)
+			self._addBuffer += data
+
+			# data is inserted directly behind the last inserted data
+			# => extend the existing piece instead of adding a new one
+			lastNode = left
+			while lastNode is not None and lastNode.right is not None:
+				lastNode = lastNode.right
+			if (lastNode is not None
+				and lastNode.buffer is self._addBuffer
+				and lastNode.start + lastNode.length == addStart):
+				_extendLast(left, len(data))
+			else:
+				left = _merge(left,
+					self._newPiece(self._addBuffer, addStart, len(data)))
+
+		self._root = _merge(left, right)
+
+
+	def _newPiece(self, buffer, start, length):
+		return _Piece(buffer, start, length, self._random.random())
+
+
+	def _index(self, index):
+		length = len(self)
+		if index < 0:
+			index += length
+		if index < 0 or index >= length:
+			raise IndexError("PieceTable index out of range")
+		return index
+
+
+	def _sliceRange(self, key):
+		if key.step not in (None, 1):
+			raise ValueError("PieceTable only supports slices with step 1.")
+		start, stop, _ = key.indices(len(self))
+		return start, max(start, stop)
+
+
+class _Piece(object):
+	'''
+	Node of the treap: a range of a buffer.
+	'''
+	__slots__ = ("buffer", "start", "length", "total", "priority", "left",
+		"right")
+
+	def __init__(self, buffer, start, length, priority):
+		self.buffer = buffer
+		self.start = start
+		self.length = length
+		self.total = length
+		self.priority = priority
+		self.left = None
+		self.right = None
+
+
+def _total(node):
+	if node is None:
+		return 0
+	return node.total
+
+
+def _updateTotal(node):
+	node.total = _total(node.left) + node.length + _total(node.right)
+
+
+# this function splits the tree after the given number of bytes
+# return values: (_Piece) tree with the first bytes,
+# (_Piece) tree with the remaining bytes
+def _split(node, position):
+	if node is None:
+		return None, None
+
+	leftTotal = _total(node.left)
+	if position <= leftTotal:
+		left, node.left = _split(node.left, position)
+		_updateTotal(node)
+		return left, node
+
+	pieceEnd = leftTotal + node.length
+	if position >= pieceEnd:
+		node.right, right = _split(node.right, position - pieceEnd)
+		_updateTotal(node)
+		return node, right
+
+	# position lies within the piece of this node => split the piece
+	offset = position - leftTotal
+	rightPiece = _Piece(node.buffer, node.start + offset,
+		node.length - offset, node.priority)
+	right = _merge(rightPiece, node.right)
+	node.length = offset
+	node.right = None
+	_updateTotal(node)
+	return node, right
+
+
+# this function merges two trees (all bytes of the first one come
+# before the bytes of the second one)
+# return values: (_Piece) merged tree
+def _merge(left, right):
+	if left is None:
+		return right
+	if right is None:
+		return left
+
+	if left.priority > right.priority:
+		left.right = _merge(left.right, right)
+		_updateTotal(left)
+		return left
+
+	right.left = _merge(left, right.left)
+	_updateTotal(right)
+	return right
+
+
+# this function extends the last piece of the tree by the given size
+# return values: None
+def _extendLast(node, size):
+	while node is not None:
+		node.total += size
+		if node.right is None:
+			node.length += size
+			return
+		node = node.right
+
+
+# this function collects the data of the given range of the tree
+# return values: None
+def _readRange(node, start, stop, pieces):
+	while node is not None and start < stop:
+		leftTotal = _total(node.left)
+		if start < leftTotal:
+			_readRange(node.left, start, min(stop, leftTotal), pieces)
+
+		pieceEnd = leftTotal + node.length
+		if start < pieceEnd and stop > leftTotal:
+			pieceStart = node.start + max(start, leftTotal) - leftTotal
+			pieceStop = node.start + min(stop, pieceEnd) - leftTotal
+			pieces.append(node.buffer[pieceStart:pieceStop])
+
+		# continue with the right subtree (without recursion)
+		start = max(start, pieceEnd) - pieceEnd
+		stop -= pieceEnd
+		node = node.right
+
+
+# this function converts data given as bytes, bytearray, memoryview or
+# list of ints into a bytearray
+# return values: (bytearray) data
+def _toBytearray(data):
+	if isinstance(data, bytearray):
+		return data
+	if isinstance(data, memoryview):
+		return bytearray(data.tobytes())
+	return bytearray(data)
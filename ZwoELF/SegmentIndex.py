@@ -0,0 +1,106 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import bisect
+
+
+class SegmentIndex(object):
+	'''
+	Interval index over the segments (in memory and in the file).
+
+	The ranges of all segments are split at every segment start and end
+	into disjoint intervals. Every interval stores the first segment (in
+	the order of the program header table) that contains it, so a lookup
+	with bisect gives the same result as a linear search for the first
+	matching segment.
+
+	The index remembers the list of segments it was built from, their
+	number and the modification counter of the program headers, so the
+	user can detect when it has to be rebuilt.
+	'''
+	def __init__(self, segments, modificationCount):
+		self.segments = segments
+		self.segmentCount = len(segments)
+		self.modificationCount = modificationCount
+
+		(self.memoryBounds, self.memorySegments) = _buildIntervals(
+			[(segment.elfN_Phdr.p_vaddr, segment.elfN_Phdr.p_memsz)
+			for segment in segments], segments)
+		(self.fileBounds, self.fileSegments) = _buildIntervals(
+			[(segment.elfN_Phdr.p_offset, segment.elfN_Phdr.p_filesz)
+			for segment in segments], segments)
+
+
+	# this function gets the first segment that contains the given
+	# virtual memory address
+	# return values: (Segment) segment (or None if not found)
+	def segmentByMemoryAddr(self, memoryAddr):
+		i = bisect.bisect_right(self.memoryBounds, memoryAddr) - 1
+		if 0 <= i < len(self.memorySegments):
+			return self.memorySegments[i]
+		return None
+
+
+	# this function gets the first segment that contains the given
+	# file offset
+	# return values: (Segment) segment (or None if not found)
+	def segmentByFileOffset(self, offset):
+		i = bisect.bisect_right(self.fileBounds, offset) - 1
+		if 0 <= i < len(self.fileSegments):
+			return self.fileSegments[i]
+		return None
+
+
+# this function splits the given ranges into disjoint intervals and gets
+# the first segment containing each interval
+# return values: (list) sorted interval bounds, (list) segment (or None)
+# for the interval starting at each bound (except the last one)
+def _buildIntervals(ranges, segments):
+
+	bounds = set()
+	for start, size in ranges:
+		# empty segments never contain an address or offset
+		if size > 0:
+			bounds.add(start)
+			bounds.add(start + size)
+	bounds = sorted(bounds)
+
+	intervalSegments = list()
+	for intervalStart in bounds[:-1]:
+		foundSegment = None
+		for (start, size), segment in zip(ranges, segments):
+			if start <= intervalStart and intervalStart < start + size:
+				foundSegment = segment
+				break
+		intervalSegments.append(foundSegment)
+
+	return bounds, intervalSegments
+
+
+# this function gets for every outer range all inner ranges lying
+# completely within it (the inner ranges are sorted by their start, so
+# only the inner ranges starting within the outer range are checked)
+# return values: (list) for every outer range a sorted list of the
+# indices of the inner ranges within it
+def rangesWithin(outerRanges, innerRanges):
+
+	innerOrder = sorted(range(len(innerRanges)),
+		key=lambda i: innerRanges[i][0])
+	innerStarts = [innerRanges[i][0] for i in innerOrder]
+
+	rangesWithinOuter = list()
+	for outerStart, outerEnd in outerRanges:
+		first = bisect.bisect_left(innerStarts, outerStart)
+		last = bisect.bisect_right(innerStarts, outerEnd)
+		innerIndices = [innerOrder[j] for j in range(first, last)
+			if innerRanges[innerOrder[j]][1] <= outerEnd]
+		innerIndices.sort()
+		rangesWithinOuter.append(innerIndices)
+
+	return rangesWithinOuter
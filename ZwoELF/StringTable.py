@@ -0,0 +1,55 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+from ElfLayout import findData
+
+
+class StringTable(object):
+	'''
+	String table (for example .dynstr, .strtab or .shstrtab) of the given
+	range of the file data that resolves offsets to names on request.
+
+	The data is not copied (it must not be changed while the table is
+	used). A name is decoded when its offset is requested for the first
+	time and cached by its offset, so names that are never requested are
+	never decoded and names that are requested repeatedly (for example
+	by relocations) are decoded once. Names are interned, so equal names
+	of different offsets or of different tables share one string object.
+
+	Like the parser, an offset outside of the table or a name that is not
+	terminated in the table gives an empty name.
+	'''
+	def __init__(self, data, offset=0, size=None):
+		self.data = data
+		self.offset = min(offset, len(data))
+		if size is None:
+			self.end = len(data)
+		else:
+			self.end = max(self.offset, min(offset + size, len(data)))
+
+		# decoded names by their offset in the table
+		self._names = dict()
+
+
+	def __len__(self):
+		return self.end - self.offset
+
+
+	# this function gets the name at the given offset in the table
+	# return values: (str) name
+	def getName(self, nameOffset):
+		name = self._names.get(nameOffset)
+		if name is None:
+			nStart = self.offset + nameOffset
+			nEnd = findData(self.data, b"\x00", nStart, self.end)
+			# use empty string if string is not terminated (nEnd == -1)
+			nEnd = max(nStart, nEnd)
+			name = intern(bytes(self.data[nStart:nEnd]))
+			self._names[nameOffset] = name
+		return name
@@ -0,0 +1,230 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import array
+import bisect
+from Elf import Shstrndx
+from SymbolTable import SymbolTable
+
+# NumPy is optional
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+# symbol types (lower four bits of st_info) that are indexed:
+# STT_OBJECT, STT_FUNC and STT_GNU_IFUNC
+_symbolTypes = (1, 2, 10)
+
+
+# this function gets for each symbol of the sorted index the position of
+# the nearest symbol in front of it that ends behind its end (the
+# innermost symbol that encloses it and continues after it)
+# return values: (list) position of the enclosing symbol (-1 if none)
+def _enclosingIndices(ends):
+	enclosing = list()
+	stack = list()
+	for i in range(len(ends)):
+		while stack and ends[stack[-1]] <= ends[i]:
+			stack.pop()
+		enclosing.append(stack[-1] if stack else -1)
+		stack.append(i)
+	return enclosing
+
+
+class SymbolIndex(object):
+	'''
+	Index of the defined function and object symbols sorted by their
+	address, resolves addresses to (symbol, offset in the symbol).
+
+	The entries are either a list of DynamicSymbol objects or a columnar
+	SymbolTable (then the index is built from its columns and a symbol
+	object is only created for a resolved address). The start and end
+	addresses of the symbols are stored in arrays (st_value, st_value +
+	st_size) together with the position of each symbol in the entries.
+	Of the symbols at the same address only the largest one is kept (the
+	first one in the order of the table if they have the same size). An
+	address belongs to the symbol with the nearest start in front of it
+	if it lies within the size of the symbol, a symbol with size 0 only
+	contains its start address. If it lies behind the end of that symbol,
+	the symbols that enclose it are checked (for each symbol the index
+	stores the nearest symbol in front of it that ends behind its end),
+	so an address in a function behind a smaller symbol inside of the
+	function still belongs to the function. lookup() needs one bisection
+	per address, lookupIndices() resolves a batch of addresses at once
+	(with numpy.searchsorted() when NumPy is installed) without creating
+	objects per address.
+
+	The index remembers the table it was built from, its length and the
+	modification counter of the symbol table entries, so the user can
+	check with isOutdated() if it has to be rebuilt.
+	'''
+	def __init__(self, entries, addrTypecode, modificationCount):
+		self.entries = entries
+		self.entryCount = len(entries)
+		self.modificationCount = modificationCount
+
+		if isinstance(entries, SymbolTable):
+			columns = (entries.st_value, entries.st_size, entries.st_info,
+				entries.st_shndx)
+		else:
+			elfSymbols = [symbol.ElfN_Sym for symbol in entries]
+			columns = ([elfSymbol.st_value for elfSymbol in elfSymbols],
+				[elfSymbol.st_size for elfSymbol in elfSymbols],
+				[elfSymbol.st_info for elfSymbol in elfSymbols],
+				[elfSymbol.st_shndx for elfSymbol in elfSymbols])
+
+		if numpy is not None:
+			self._numpyBuild(*columns)
+			self.starts = array.array(addrTypecode, self._numpyStarts.tolist())
+			self.ends = array.array(addrTypecode, self._numpyEnds.tolist())
+			self.entryIndices = array.array("l",
+				self._numpyEntryIndices.tolist())
+			self._numpyEnclosing = numpy.array(
+				_enclosingIndices(self.ends), dtype=numpy.intp)
+			self.enclosing = array.array("l",
+				self._numpyEnclosing.tolist())
+		else:
+			self._arrayBuild(addrTypecode, *columns)
+			self.enclosing = array.array("l", _enclosingIndices(self.ends))
+
+
+	# this function builds the sorted address arrays with python objects
+	# return values: None
+	def _arrayBuild(self, addrTypecode, values, sizes, infos,
+		sectionIndices):
+
+		positions = [i for i in range(len(values))
+			if sectionIndices[i] != Shstrndx.SHN_UNDEF
+			and (infos[i] & 0xf) in _symbolTypes]
+		positions.sort(key=lambda i: (values[i], -sizes[i]))
+
+		self.starts = array.array(addrTypecode)
+		self.ends = array.array(addrTypecode)
+		self.entryIndices = array.array("l")
+		for i in positions:
+			start = values[i]
+			if self.starts and self.starts[-1] == start:
+				continue
+			self.entryIndices.append(i)
+			self.starts.append(start)
+			self.ends.append(start + max(1, sizes[i]))
+
+
+	# this function builds the sorted address arrays with NumPy
+	# return values: None
+	def _numpyBuild(self, values, sizes, infos, sectionIndices):
+		values = numpy.asarray(values, dtype=numpy.uint64)
+		sizes = numpy.asarray(sizes, dtype=numpy.uint64)
+		infos = numpy.asarray(infos, dtype=numpy.uint8)
+		sectionIndices = numpy.asarray(sectionIndices, dtype=numpy.uint16)
+
+		positions = numpy.flatnonzero(
+			(sectionIndices != Shstrndx.SHN_UNDEF)
+			& numpy.in1d(infos & 0xf, _symbolTypes))
+		# sort by address, larger symbols first (stable => order of the
+		# table for symbols of the same size)
+		order = numpy.lexsort((~sizes[positions], values[positions]))
+		positions = positions[order]
+
+		starts = values[positions]
+		firstAtAddress = numpy.ones(len(starts), dtype=bool)
+		firstAtAddress[1:] = starts[1:] != starts[:-1]
+		positions = positions[firstAtAddress]
+
+		self._numpyEntryIndices = positions.astype(numpy.intp)
+		self._numpyStarts = values[positions]
+		self._numpyEnds = self._numpyStarts \
+			+ numpy.maximum(sizes[positions], 1)
+
+
+	def __len__(self):
+		return len(self.entryIndices)
+
+
+	# this function checks if the index does not describe the given
+	# table anymore
+	# return values: (bool) True if the index has to be rebuilt
+	def isOutdated(self, entries, modificationCount):
+		return (self.entries is not entries
+			or self.entryCount != len(entries)
+			or self.modificationCount != modificationCount)
+
+
+	# this function resolves the given address
+	# return values: (tuple) (DynamicSymbol) symbol, (int) offset of the
+	# address in the symbol (None if the address belongs to no symbol)
+	def lookup(self, memoryAddr):
+		i = bisect.bisect_right(self.starts, memoryAddr) - 1
+		while i >= 0 and memoryAddr >= self.ends[i]:
+			i = self.enclosing[i]
+		if i >= 0:
+			return (self.entries[self.entryIndices[i]],
+				memoryAddr - self.starts[i])
+		return None
+
+
+	# this function resolves all given addresses
+	# return values: (numpy.ndarray or array.array) position of the
+	# symbol in the entries for each address (-1 if the address belongs
+	# to no symbol), (numpy.ndarray or array.array) offset of each address
+	# in its symbol (0 if the address belongs to no symbol)
+	def lookupIndices(self, memoryAddrs):
+		if numpy is not None:
+			return self._numpyLookupIndices(memoryAddrs)
+
+		starts = self.starts
+		ends = self.ends
+		entryIndices = self.entryIndices
+		enclosing = self.enclosing
+		bisectRight = bisect.bisect_right
+		indices = array.array("l")
+		offsets = array.array(starts.typecode)
+		for memoryAddr in memoryAddrs:
+			i = bisectRight(starts, memoryAddr) - 1
+			while i >= 0 and memoryAddr >= ends[i]:
+				i = enclosing[i]
+			if i >= 0:
+				indices.append(entryIndices[i])
+				offsets.append(memoryAddr - starts[i])
+			else:
+				indices.append(-1)
+				offsets.append(0)
+		return (indices, offsets)
+
+
+	# this function resolves all given addresses with one vectorized
+	# bisection
+	# return values: (numpy.ndarray) position of the symbol in the entries
+	# for each address, (numpy.ndarray) offset of each address in its
+	# symbol
+	def _numpyLookupIndices(self, memoryAddrs):
+		memoryAddrs = numpy.asarray(memoryAddrs, dtype=numpy.uint64)
+		if len(self._numpyStarts) == 0:
+			return (numpy.full(len(memoryAddrs), -1, dtype=numpy.intp),
+				numpy.zeros(len(memoryAddrs), dtype=numpy.uint64))
+
+		i = numpy.searchsorted(self._numpyStarts, memoryAddrs,
+			side="right") - 1
+		# step out to the enclosing symbols until the address lies within
+		# the symbol (one step per nesting level)
+		while True:
+			clipped = numpy.maximum(i, 0)
+			outside = (i >= 0) & (memoryAddrs >= self._numpyEnds[clipped])
+			if not outside.any():
+				break
+			i[outside] = self._numpyEnclosing[i[outside]]
+		clipped = numpy.maximum(i, 0)
+		found = i >= 0
+
+		indices = self._numpyEntryIndices[clipped]
+		offsets = memoryAddrs - self._numpyStarts[clipped]
+		indices[~found] = -1
+		offsets[~found] = 0
+		return (indices, offsets)
@@ -0,0 +1,184 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import array
+import struct
+from ElfLayout import layouts, iterUnpackFrom, typecodeForSize
+from StringTable import StringTable
+from Elf import DynamicSymbol, ElfN_Sym, parsedRecordFactory
+
+# NumPy is optional
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+# creates the symbol table entry of an indexed symbol
+_createSym = parsedRecordFactory(ElfN_Sym, ("st_name", "st_value", "st_size",
+	"st_info", "st_other", "st_shndx"))
+
+
+class SymbolTable(object):
+	'''
+	Columnar view of a symbol table. The fields of all symbols are stored
+	in parallel columns (array.array or, when requested, NumPy arrays):
+
+	st_name, st_value, st_size, st_info, st_other, st_shndx
+
+	No object is created per symbol while building the table. A
+	DynamicSymbol object is only created when the table is indexed, and a
+	symbol name is only decoded when it is requested. The string table is
+	either a StringTable (shared with other users of the names, the data
+	is not copied) or its data (copied unless it is a buffer).
+	'''
+
+	columnNames = ("st_name", "st_value", "st_size", "st_info", "st_other",
+		"st_shndx")
+
+	# position of the columns in an unpacked symbol table entry
+	_entryPositions = {
+		32: (0, 1, 2, 3, 4, 5),
+		64: (0, 4, 5, 1, 2, 3),
+	}
+
+	# offset of the columns in a symbol table entry
+	_entryOffsets = {
+		32: (0, 4, 8, 12, 13, 14),
+		64: (0, 8, 16, 4, 5, 6),
+	}
+
+	# number of entries unpacked with one struct call
+	_chunkSize = 4096
+
+	def __init__(self, data, offset, count, entrySize, bits, stringTable,
+		useNumpy=False):
+
+		if useNumpy and numpy is None:
+			raise ValueError("NumPy is not installed.")
+
+		self.bits = bits
+		self.useNumpy = useNumpy
+
+		# names are decoded on request
+		if not isinstance(stringTable, StringTable):
+			if not isinstance(stringTable, buffer):
+				stringTable = bytes(stringTable)
+			stringTable = StringTable(stringTable)
+		self.stringTable = stringTable
+
+		count = max(0, count)
+		if useNumpy:
+			columns = self._numpyColumns(data, offset, count, entrySize)
+		else:
+			columns = self._arrayColumns(data, offset, count, entrySize)
+
+		(
+			self.st_name,
+			self.st_value,
+			self.st_size,
+			self.st_info,
+			self.st_other,
+			self.st_shndx,
+		) = columns
+
+
+	# this function builds the columns as array.array objects
+	# return values: (list) columns in the order of columnNames
+	def _arrayColumns(self, data, offset, count, entrySize):
+
+		symLayout = layouts[self.bits].sym
+		addrSize = 4 if self.bits == 32 else 8
+		columns = [array.array(typecodeForSize(size))
+			for size in (4, addrSize, addrSize, 1, 1, 2)]
+		positions = self._entryPositions[self.bits]
+
+		# entries lie directly behind each other
+		# => unpack a whole chunk of entries with one struct call and
+		# take every column out of the flat result with one slice
+		if entrySize == symLayout.size:
+			fieldCount = len(positions)
+			chunkStruct = None
+			chunkStart = 0
+			while chunkStart < count:
+				chunkCount = min(self._chunkSize, count - chunkStart)
+				if chunkStruct is None or chunkCount != self._chunkSize:
+					chunkStruct = struct.Struct("<"
+						+ symLayout.format.lstrip("<") * chunkCount)
+				values = chunkStruct.unpack_from(data,
+					offset + chunkStart*entrySize)
+				for column, position in zip(columns, positions):
+					column.extend(values[position::fieldCount])
+				chunkStart += chunkCount
+
+		# entries have padding => unpack each entry
+		else:
+			appends = [(column.append, position)
+				for column, position in zip(columns, positions)]
+			for symbolEntry in iterUnpackFrom(symLayout, data, offset,
+				count, entrySize):
+				for append, position in appends:
+					append(symbolEntry[position])
+
+		return columns
+
+
+	# this function builds the columns as NumPy arrays
+	# return values: (list) columns in the order of columnNames
+	def _numpyColumns(self, data, offset, count, entrySize):
+
+		addrFormat = "<u4" if self.bits == 32 else "<u8"
+		entryType = numpy.dtype({
+			"names": list(self.columnNames),
+			"formats": ["<u4", addrFormat, addrFormat, "u1", "u1", "<u2"],
+			"offsets": list(self._entryOffsets[self.bits]),
+			"itemsize": entrySize,
+		})
+
+		if count == 0:
+			entries = numpy.zeros(0, dtype=entryType)
+		else:
+			entries = numpy.frombuffer(data, dtype=entryType, count=count,
+				offset=offset)
+
+		# copy the columns => they do not reference the file data
+		return [numpy.array(entries[name]) for name in self.columnNames]
+
+
+	def __len__(self):
+		return len(self.st_name)
+
+
+	# this function creates the symbol object of the given index
+	# return values: (DynamicSymbol) symbol
+	def __getitem__(self, index):
+		if index < 0:
+			index += len(self)
+
+		# values of the parsed data => not counted as modification
+		elfSymbol = _createSym((
+			int(self.st_name[index]),
+			int(self.st_value[index]),
+			int(self.st_size[index]),
+			int(self.st_info[index]),
+			int(self.st_other[index]),
+			int(self.st_shndx[index]),
+		))
+		return DynamicSymbol(elfSymbol.st_name, elfSymbol, self.stringTable)
+
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+
+	# this function decodes the name of the symbol with the given index
+	# return values: (str) name of the symbol
+	def symbolName(self, index):
+		return self.stringTable.getName(int(self.st_name[index]))
+
@@ -8,7 +8,15 @@
 # Licensed under the GNU Public License, version 2.
 
 import Compatibility
-from ElfParserLib import ElfParser, Section, Segment
+from ElfParserLib import ElfParser, VerificationMode, VerificationStats, \
+	Section, Segment
+from SymbolTable import SymbolTable
+from StringTable import StringTable
+from FileData import FileData
+from HashTable import GnuHashTable, SysvHashTable, HashTableStats
+from SymbolIndex import SymbolIndex
+from ParseCache import ParseCache, ParseCacheStats
+from ElfTriage import ElfTriage
 from Elf import ElfN_Ehdr, Shstrndx, ElfN_Shdr, SH_flags, SH_type, \
 	Elf32_Phdr, P_type, P_flags, D_tag, ElfN_Dyn, \
 	ElfN_Rel, ElfN_Rela, ElfN_Sym, R_type, \
@@ -0,0 +1,191 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from ElfParserLib import ElfParser, VerificationMode
+from ParseCache import ParseCache
+
+
+# symbol bindings (upper four bits of st_info)
+_STB_GLOBAL = 1
+_STB_WEAK = 2
+
+# section index of undefined symbols
+_SHN_UNDEF = 0
+
+# parse cache of the worker process (None if not used)
+_parseCache = None
+
+
+# this function gets all regular files of the given paths (directories
+# are walked recursively)
+# return values: (generator) paths of the files
+def iterFiles(paths, followLinks=False):
+	for path in paths:
+		if os.path.isdir(path):
+			for dirPath, dirNames, fileNames in os.walk(path,
+				followlinks=followLinks):
+				dirNames.sort()
+				for fileName in sorted(fileNames):
+					filePath = os.path.join(dirPath, fileName)
+					if followLinks is False and os.path.islink(filePath):
+						continue
+					if os.path.isfile(filePath):
+						yield filePath
+		elif os.path.isfile(path):
+			yield path
+
+
+# this function parses the given file and creates a compact summary of
+# it that can be pickled (errors are stored in the summary instead of
+# being raised, the file is verified with VerificationMode.CHEAP)
+# return values: (dict) summary of the file (None if it is no ELF file)
+def summarizeFile(path, parseCache=None):
+
+	# skip files that are no ELF files without parsing them
+	try:
+		f = open(path, "rb")
+		try:
+			magic = f.read(4)
+			size = os.fstat(f.fileno()).st_size
+		finally:
+			f.close()
+	except (IOError, OSError) as e:
+		return {"path": path, "error": "%s: %s" % (type(e).__name__, e)}
+	if magic != "\x7fELF":
+		return None
+
+	summary = {"path": path, "size": size, "error": None}
+	try:
+		# files that can not be re-generated correctly are summarized
+		# without the check ("verified" is False)
+		try:
+			elfFile = ElfParser(path, useMmap=True,
+				verificationMode=VerificationMode.CHEAP, parseCache=parseCache)
+			summary["verified"] = True
+		except NotImplementedError:
+			elfFile = ElfParser(path, force=True, useMmap=True,
+				parseCache=parseCache)
+			summary["verified"] = False
+		if elfFile.fileParsed is False:
+			raise ValueError("File could not be parsed.")
+
+		header = elfFile.header
+		summary["bits"] = elfFile.bits
+		summary["header"] = {
+			"e_type": header.e_type,
+			"e_machine": header.e_machine,
+			"e_version": header.e_version,
+			"e_entry": header.e_entry,
+			"e_flags": header.e_flags,
+			"e_phnum": header.e_phnum,
+			"e_shnum": header.e_shnum,
+		}
+
+		# (p_type, p_flags, p_offset, p_vaddr, p_filesz, p_memsz)
+		summary["segments"] = [(segment.elfN_Phdr.p_type,
+			segment.elfN_Phdr.p_flags, segment.elfN_Phdr.p_offset,
+			segment.elfN_Phdr.p_vaddr, segment.elfN_Phdr.p_filesz,
+			segment.elfN_Phdr.p_memsz) for segment in elfFile.segments]
+
+		summary["neededLibraries"] = elfFile.getNeededLibraries()
+
+		imports = list()
+		exports = list()
+		for dynamicSymbol in elfFile.dynamicSymbolEntries:
+			symbol = dynamicSymbol.ElfN_Sym
+			if not dynamicSymbol.symbolName:
+				continue
+			if symbol.st_shndx == _SHN_UNDEF:
+				imports.append(dynamicSymbol.symbolName)
+			elif (symbol.st_info >> 4) in (_STB_GLOBAL, _STB_WEAK):
+				exports.append(dynamicSymbol.symbolName)
+		summary["imports"] = imports
+		summary["exports"] = exports
+
+		summary["jumpRelocationCount"] = len(elfFile.jumpRelocationEntries)
+		summary["relocationCount"] = len(elfFile.relocationEntries)
+
+	except Exception as e:
+		summary["error"] = "%s: %s" % (type(e).__name__, e)
+
+	return summary
+
+
+# this function sets up a worker process of the pool
+# return values: None
+def _initWorker(cachePath):
+	global _parseCache
+
+	# the parser prints notes and warnings => keep them out of the output
+	sys.stdout = open(os.devnull, "w")
+
+	if cachePath is not None:
+		_parseCache = ParseCache(cachePath)
+
+
+# this function summarizes the given file in a worker process
+# return values: (dict) summary of the file (see summarizeFile())
+def _summarizeInWorker(path):
+	return summarizeFile(path, _parseCache)
+
+
+# this function summarizes all ELF files of the given paths in a pool of
+# worker processes (the summaries are returned in the order the workers
+# finish them, parse results are stored in the parse cache at the
+# given path if one is given)
+# return values: (generator) summaries of the files (see summarizeFile())
+def analyzePaths(paths, workers=None, chunkSize=16, followLinks=False,
+	cachePath=None):
+	pool = multiprocessing.Pool(workers, _initWorker, (cachePath,))
+	try:
+		for summary in pool.imap_unordered(_summarizeInWorker,
+			iterFiles(paths, followLinks), chunkSize):
+			if summary is not None:
+				yield summary
+		pool.close()
+	finally:
+		pool.terminate()
+		pool.join()
+
+
+# this function analyzes the given paths and writes one summary per line
+# as JSON to stdout
+# return values: (int) exit code (1 if a file could not be parsed)
+def main(argv=None):
+	argParser = argparse.ArgumentParser(description="Summarize all ELF " \
+		+ "files of the given files and directories in parallel.")
+	argParser.add_argument("paths", nargs="+", metavar="path")
+	argParser.add_argument("-j", "--workers", type=int, default=None,
+		help="number of worker processes (default: number of CPUs)")
+	argParser.add_argument("-c", "--chunk-size", type=int, default=16,
+		help="number of files sent to a worker at once (default: 16)")
+	argParser.add_argument("-L", "--follow-links", action="store_true",
+		help="follow symbolic links")
+	argParser.add_argument("--cache", default=None, metavar="DATABASE",
+		help="SQLite database used as parse cache")
+	args = argParser.parse_args(argv)
+
+	exitCode = 0
+	for summary in analyzePaths(args.paths, args.workers, args.chunk_size,
+		args.follow_links, args.cache):
+		if summary["error"] is not None:
+			exitCode = 1
+		# names are byte strings of any encoding
+		sys.stdout.write(json.dumps(summary, encoding="latin-1") + "\n")
+
+	return exitCode
+
+
+if __name__ == "__main__":
+	sys.exit(main())
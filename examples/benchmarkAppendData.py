@@ -0,0 +1,58 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import sys
+import time
+from ZwoELF import ElfParser, VerificationMode, P_type
+
+
+try:
+	inputFile = sys.argv[1]
+except:
+	print('usage: {} <input file> [<max payload size>]'.format(sys.argv[0]))
+	sys.exit(1)
+
+try:
+	maxSize = int(sys.argv[2])
+except:
+	maxSize = 16 * 1024 * 1024
+
+print "Payload (bytes)\tTime (s)\tTime per KB (us)"
+
+size = 1024
+while size <= maxSize:
+	elfFile = ElfParser(inputFile, verificationMode=VerificationMode.OFF)
+
+	# use the last loadable segment in memory
+	# => no segment follows and any payload size fits
+	segmentNumber = None
+	for i in range(len(elfFile.segments)):
+		if elfFile.segments[i].elfN_Phdr.p_type != P_type.PT_LOAD:
+			continue
+		if (segmentNumber is None
+			or elfFile.segments[i].elfN_Phdr.p_vaddr
+			> elfFile.segments[segmentNumber].elfN_Phdr.p_vaddr):
+			segmentNumber = i
+
+	# tables are parsed on first access => parse them before measuring
+	len(elfFile.relocationEntries)
+
+	payload = bytearray("\x90" * size)
+
+	startTime = time.time()
+	elfFile.appendDataToSegment(payload, segmentNumber, addNewSection=True,
+		newSectionName=".payload")
+	duration = time.time() - startTime
+
+	# the data is inserted into the piece table without copying the file
+	# => time per KB decreases for growing payloads
+	print "%d\t\t%.3f\t\t%.2f" \
+		% (size, duration, (duration * 1000000) / (size / 1024))
+
+	size *= 2
@@ -0,0 +1,108 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import os
+import struct
+import sys
+import tempfile
+import time
+from ZwoELF import ElfParser, VerificationMode, D_tag, P_type, P_flags, \
+	SH_type
+
+
+# this function generates a minimal x86_64 shared object that holds
+# the given number of dynamic symbols and one relocation per symbol
+# return values: (str) ELF file data
+def generateElfWithRelocations(count):
+
+	# layout: header, program header table, dynamic segment,
+	# symbol table, string table, relocations, section string table,
+	# section header table
+	phOffset = 64
+	dynOffset = phOffset + 2*56
+	dynEntries = 8
+	symOffset = dynOffset + dynEntries*16
+	strOffset = symOffset + (count+1)*24
+	stringTable = "\x00" + "".join(["sym%d\x00" % i for i in range(count)])
+	relaOffset = strOffset + len(stringTable)
+	shstrOffset = relaOffset + count*24
+	shstrTable = "\x00.dynsym\x00.shstrtab\x00"
+	shOffset = shstrOffset + len(shstrTable)
+	fileSize = shOffset + 3*64
+
+	data = bytearray(fileSize)
+
+	data[0:16] = "\x7fELF\x02\x01\x01" + "\x00"*9
+	data[16:64] = struct.pack('< 2H I 3Q I 6H', 3, 0x3E, 1, 0, phOffset,
+		shOffset, 0, 64, 56, 2, 64, 3, 2)
+
+	# PT_LOAD segment maps the whole file, PT_DYNAMIC lies within
+	data[phOffset:phOffset+112] = struct.pack('< I I 5Q Q',
+		P_type.PT_LOAD, P_flags.PF_R | P_flags.PF_W, 0, 0, 0, fileSize,
+		fileSize, 0x1000) \
+		+ struct.pack('< I I 5Q Q', P_type.PT_DYNAMIC,
+		P_flags.PF_R | P_flags.PF_W, dynOffset, dynOffset, dynOffset,
+		dynEntries*16, dynEntries*16, 8)
+
+	dynamic = [(D_tag.DT_SYMTAB, symOffset), (D_tag.DT_SYMENT, 24),
+		(D_tag.DT_STRTAB, strOffset), (D_tag.DT_STRSZ, len(stringTable)),
+		(D_tag.DT_RELA, relaOffset), (D_tag.DT_RELASZ, count*24),
+		(D_tag.DT_RELAENT, 24), (D_tag.DT_NULL, 0)]
+	for i in range(len(dynamic)):
+		data[dynOffset+i*16:dynOffset+(i+1)*16] = struct.pack('<QQ',
+			*dynamic[i])
+
+	nameOffset = 1
+	for i in range(count):
+		tempOffset = symOffset + (i+1)*24
+		data[tempOffset:tempOffset+24] = struct.pack('<I BBH QQ',
+			nameOffset, 0x12, 0, 0, 0, 0)
+		nameOffset += len("sym%d" % i) + 1
+	data[strOffset:strOffset+len(stringTable)] = stringTable
+
+	# R_X86_64_GLOB_DAT (6) for every symbol
+	for i in range(count):
+		tempOffset = relaOffset + i*24
+		data[tempOffset:tempOffset+24] = struct.pack('<QQq',
+			relaOffset + i*8, ((i+1) << 32) | 6, 0)
+
+	data[shstrOffset:shstrOffset+len(shstrTable)] = shstrTable
+	data[shOffset+64:shOffset+128] = struct.pack('< 2I 4Q 2I 2Q', 1,
+		SH_type.SHT_DYNSYM, 0, symOffset, symOffset, (count+1)*24, 0, 1,
+		8, 24)
+	data[shOffset+128:shOffset+192] = struct.pack('< 2I 4Q 2I 2Q', 9,
+		SH_type.SHT_STRTAB, 0, 0, shstrOffset, len(shstrTable), 0, 0, 1, 0)
+
+	return bytes(data)
+
+
+try:
+	maxCount = int(sys.argv[1])
+except:
+	maxCount = 128000
+
+print "Relocations\tTime (s)\tTime per relocation (us)"
+
+count = 1000
+while count <= maxCount:
+	fd, fileName = tempfile.mkstemp()
+	os.write(fd, generateElfWithRelocations(count))
+	os.close(fd)
+
+	elfFile = ElfParser(fileName, verificationMode=VerificationMode.OFF)
+	startTime = time.time()
+	relocationCount = len(elfFile.relocationEntries)
+	duration = time.time() - startTime
+	os.remove(fileName)
+
+	# linear scaling => time per relocation stays the same
+	print "%d\t\t%.3f\t\t%.2f" \
+		% (relocationCount, duration, (duration * 1000000) / relocationCount)
+
+	count *= 2
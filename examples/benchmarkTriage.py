@@ -0,0 +1,69 @@
+#!/usr/bin/python
+
+# written by sqall
+# twitter: https://twitter.com/sqall01
+# blog: http://blog.h4des.org
+# github: https://github.com/sqall01
+#
+# Licensed under the GNU Public License, version 2.
+
+import os
+import sys
+import time
+from ZwoELF import ElfParser, ElfTriage, ElfN_Ehdr
+
+
+try:
+	inputDir = sys.argv[1]
+except:
+	print('usage: {} <input directory>'.format(sys.argv[0]))
+	sys.exit(1)
+
+files = list()
+for dirPath, dirNames, fileNames in os.walk(inputDir):
+	for fileName in fileNames:
+		filePath = os.path.join(dirPath, fileName)
+		if os.path.isfile(filePath) and not os.path.islink(filePath):
+			files.append(filePath)
+
+# the parser prints notes and warnings for some files
+stdout = sys.stdout
+sys.stdout = open(os.devnull, "w")
+
+# triage: header, program header table, interpreter and dynamic entries
+startTime = time.time()
+triageBytes = 0
+sharedObjects = 0
+for filePath in files:
+	try:
+		triage = ElfTriage(filePath, readInterpreter=True, readDynamic=True)
+	except (IOError, OSError, ValueError):
+		continue
+	triageBytes += triage.bytesRead
+	if (triage.bits == 64
+		and triage.header.e_machine == ElfN_Ehdr.E_machine.EM_X86_64
+		and triage.header.e_type == ElfN_Ehdr.E_type.ET_DYN):
+		sharedObjects += 1
+triageDuration = time.time() - startTime
+
+# full parsing of all tables (files are read completely)
+startTime = time.time()
+parseBytes = 0
+for filePath in files:
+	try:
+		elfFile = ElfParser(filePath, force=True)
+		# tables are parsed on first access
+		len(elfFile.relocationEntries)
+	except Exception:
+		pass
+	parseBytes += os.path.getsize(filePath)
+parseDuration = time.time() - startTime
+
+sys.stdout = stdout
+
+print "Files: %d (x86-64 ET_DYN: %d)" % (len(files), sharedObjects)
+print "Method\t\tTime (s)\tRead (KB)\tRead per file (bytes)"
+print "triage\t\t%.3f\t\t%d\t\t%d" % (triageDuration, triageBytes / 1024,
+	triageBytes / max(1, len(files)))
+print "full parse\t%.3f\t\t%d\t\t%d" % (parseDuration, parseBytes / 1024,
+	parseBytes / max(1, len(files)))
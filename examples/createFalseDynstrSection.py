@@ -160,19 +160,20 @@ for symbolTuple in symbolsToReplace:
 	dynStrSectionData = replaceSymbolString(dynStrSectionData,
 	symbolTuple[0], symbolTuple[1])
 
-# first insert the random prefix data
-for i in range(randomPrefixData):
-	parsedFile.data.insert((newDynStrOffset + i), chr(random.randint(0, 255)))
+# first the random prefix data
+insertData = bytearray(random.randint(0, 255)
+	for i in range(randomPrefixData))
 
-# second insert dynamic string table data
-for i in range(len(dynStrSectionData)):
-	parsedFile.data.insert((newDynStrOffset + randomPrefixData + i),
-		dynStrSectionData[i])
+# second the dynamic string table data
+insertData += dynStrSectionData
 
 # third fill gab to next segment with random data
-for i in range(offsetAddition - len(dynStrSectionData) - randomPrefixData):
-	parsedFile.data.insert((newDynStrOffset + randomPrefixData
-		+ len(dynStrSectionData) + i), chr(random.randint(0, 255)))
+insertData += bytearray(random.randint(0, 255)
+	for i in range(offsetAddition - len(dynStrSectionData) - randomPrefixData))
+
+# insert all data at once (instead of moving the rest of the file
+# for every single byte)
+parsedFile.data[newDynStrOffset:newDynStrOffset] = insertData
 
 print "Offset of new dynamic string table: 0x%x" \
 	% (newDynStrOffset + randomPrefixData)
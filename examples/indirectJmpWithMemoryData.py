@@ -88,9 +88,6 @@ testData.append((chr((jumpTarget >> 8) & 0xff)))
 testData.append((chr((jumpTarget >> 16) & 0xff)))
 testData.append((chr((jumpTarget >> 24) & 0xff)))
 
-# overwrite dummy data
-test.writeDataToFileOffset(newDataOffset, testData)
-
 
 hookData = list()
 
@@ -110,7 +107,8 @@ hookData.append("\xE1")
 hookData += ["\x90"] * (copiedBytesFromEntry - len(hookData))
 
 
-test.writeDataToFileOffset(entryPointOffset, hookData)
+# overwrite dummy data and entry point at once
+test.applyPatches([(newDataOffset, testData), (entryPointOffset, hookData)])
 
 #test.removeSectionHeaderTable()
 